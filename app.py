@@ -1,30 +1,66 @@
 # app.py
+import time
+# Referencia para medir el arranque (importaciones y primera ventana)
+_INICIO = time.perf_counter()
 import tkinter as tk
 import sys
 import os
 # Agregar el directorio actual al path para imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from controlador.controller import Controlador
-from modelo.modelo import MonteCarloCalculator     
-from vista.vista import VistaMonteCarlo    
+from modelo.modelo import MonteCarloCalculator
+from vista.vista import VistaMonteCarlo
+_FIN_IMPORTACIONES = time.perf_counter()
+
+# Módulos pesados cuya carga durante el arranque informa --tiempos
+MODULOS_ARRANQUE = ("sympy", "mpl_toolkits.mplot3d")
+
+# Opciones de línea de comandos para seguir el tiempo de arranque:
+#   --tiempos  muestra en stderr lo que tardan las importaciones y la primera ventana
+#   --salir    junto con --tiempos, cierra la aplicación tras medir (para scripts)
+OPCION_TIEMPOS = "--tiempos"
+OPCION_SALIR = "--salir"
 
 class MonteCarloApp:
-    def __init__(self):
+    def __init__(self, medir_arranque=None):
         self.root = tk.Tk()
         self.root.title("Simulación Monte Carlo")
         self.root.geometry("800x600")
-        
+
         # Inicializar MVC
         self.modelo = MonteCarloCalculator()
         self.vista = VistaMonteCarlo(self.root)
         self.controlador = Controlador(self.modelo, self.vista)
         # Conectar el controlador a la vista
         self.vista.establecer_controlador(self.controlador)
-        
+
+        if medir_arranque is None:
+            medir_arranque = OPCION_TIEMPOS in sys.argv
+        if medir_arranque:
+            self._fin_interfaz = time.perf_counter()
+            self._id_mapa = self.root.bind("<Map>", self._ventana_mostrada, add="+")
+
+    def _ventana_mostrada(self, evento):
+        """Al mostrarse la ventana, espera a que se termine de dibujar para medir"""
+        if evento.widget is self.root:
+            self.root.unbind("<Map>", self._id_mapa)
+            self.root.after_idle(self._informar_arranque)
+
+    def _informar_arranque(self):
+        """Escribe en stderr los tiempos de arranque, en segundos desde el inicio"""
+        ahora = time.perf_counter()
+        cargados = [modulo for modulo in MODULOS_ARRANQUE if modulo in sys.modules]
+        print(f"arranque: importaciones={_FIN_IMPORTACIONES - _INICIO:.3f} s "
+              f"interfaz={self._fin_interfaz - _INICIO:.3f} s "
+              f"primera_ventana={ahora - _INICIO:.3f} s "
+              f"cargados={','.join(cargados) or '-'}", file=sys.stderr)
+        if OPCION_SALIR in sys.argv:
+            self.root.destroy()
+
     def ejecutar(self):
         self.controlador.ejecutar()
         self.root.mainloop()
 
 if __name__ == "__main__":
     app = MonteCarloApp()
-    app.ejecutar()
\ No newline at end of file
+    app.ejecutar()
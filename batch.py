@@ -0,0 +1,321 @@
+# batch.py
+"""Cálculo por lotes sin interfaz gráfica.
+
+Lee trabajos de un archivo JSON, JSONL o CSV y escribe un resultado JSONL por trabajo, con el
+mismo motor que la aplicación (solo importa `modelo`, no Tk ni matplotlib).
+
+Campos de cada trabajo (solo `funcion`, los límites y `n` son obligatorios):
+    id           identificador devuelto con el resultado (por defecto, su posición)
+    funcion      expresión en Python, p. ej. "x**2*math.sin(x)"
+    limites      [[a, b], ...] o, para 1D/2D, los campos a, b, c, d
+    variables    nombres de las variables (por defecto x, y, z / x1..xd)
+    n            número de muestras (N máximo si se pide tolerancia)
+    semilla      semilla del generador (resultados reproducibles)
+    metodo       "estandar" (por defecto) o "miser"
+    muestreador  "pseudo", "sobol", "halton" o "reticula"
+    reduccion    "ninguna", "antiteticas" o "estratificado" (con `estratos`)
+    motor        "numpy" (por defecto) o "jit" (Numba, si está instalado; si no, NumPy)
+    tolerancia_abs / tolerancia_rel, nivel_confianza
+
+En CSV, `limites` y `variables` pueden escribirse como JSON dentro de la celda.
+
+Uso:
+    python batch.py trabajos.jsonl --salida resultados.jsonl --trabajadores 4
+"""
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import Optional
+import multiprocessing
+# Agregar el directorio actual al path para imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from modelo.modelo import MonteCarloCalculator
+from modelo.reduccion import Antiteticas, Estratificado
+
+# Campos numéricos de un trabajo y su tipo (en CSV todo llega como texto)
+CAMPOS_ENTEROS = ("n", "semilla", "estratos")
+CAMPOS_REALES = ("a", "b", "c", "d", "tolerancia_abs", "tolerancia_rel", "nivel_confianza")
+
+
+class RegistroIlegible:
+    """Línea de un JSONL que no se pudo interpretar; su error se informa como el de un trabajo"""
+
+    def __init__(self, error: Exception):
+        self.error = error
+
+
+def leer_trabajos(ruta: str) -> list:
+    """Lee los trabajos del archivo ('-' para la entrada estándar); el formato se deduce de la extensión"""
+    if ruta == "-":
+        texto = sys.stdin.read()
+        formato = _deducir_formato(texto)
+    else:
+        with open(ruta, encoding="utf-8", newline="") as archivo:
+            texto = archivo.read()
+        extension = os.path.splitext(ruta)[1].lower()
+        formato = {".json": "json", ".jsonl": "jsonl", ".ndjson": "jsonl", ".csv": "csv"}.get(
+            extension, _deducir_formato(texto))
+
+    if formato == "csv":
+        filas = csv.DictReader(io.StringIO(texto))
+        trabajos = [{k.strip(): v.strip() for k, v in fila.items() if k and v is not None and v.strip()}
+                    for fila in filas]
+    elif formato == "jsonl":
+        trabajos = [_leer_linea(linea) for linea in texto.splitlines() if linea.strip()]
+    else:
+        datos = json.loads(texto)
+        trabajos = datos.get("trabajos", [datos]) if isinstance(datos, dict) else datos
+        if not isinstance(trabajos, list):
+            trabajos = [trabajos]
+
+    # Los registros que no son objetos se conservan: su error se informa en su posición
+    for posicion, trabajo in enumerate(trabajos):
+        if isinstance(trabajo, dict):
+            trabajo.setdefault("id", posicion)
+    return trabajos
+
+
+def _leer_linea(linea: str):
+    """Un registro JSONL; una línea mal formada no detiene el lote, queda como RegistroIlegible"""
+    try:
+        return json.loads(linea)
+    except json.JSONDecodeError as e:
+        return RegistroIlegible(e)
+
+
+def _deducir_formato(texto: str) -> str:
+    """Formato de un texto sin extensión conocida"""
+    inicio = texto.lstrip()[:1]
+    if inicio == "[":
+        return "json"
+    if inicio == "{":
+        # Un único objeto JSON o un objeto por línea
+        try:
+            json.loads(texto)
+            return "json"
+        except json.JSONDecodeError:
+            return "jsonl"
+    return "csv"
+
+
+def normalizar_trabajo(trabajo: dict) -> dict:
+    """Convierte los campos de texto (CSV) a su tipo y reúne los límites en una lista de pares"""
+    if isinstance(trabajo, RegistroIlegible):
+        raise trabajo.error
+    if not isinstance(trabajo, dict):
+        raise ValueError(f"El trabajo debe ser un objeto JSON, no {type(trabajo).__name__}")
+    trabajo = dict(trabajo)
+    for campo in ("limites", "variables"):
+        if isinstance(trabajo.get(campo), str):
+            trabajo[campo] = json.loads(trabajo[campo])
+    for campo in CAMPOS_ENTEROS:
+        if campo in trabajo:
+            trabajo[campo] = _entero(campo, trabajo[campo])
+    for campo in CAMPOS_REALES:
+        if campo in trabajo:
+            trabajo[campo] = float(trabajo[campo])
+
+    if "limites" not in trabajo:
+        if "a" not in trabajo or "b" not in trabajo:
+            raise ValueError("Faltan los límites: indique 'limites' o 'a' y 'b'")
+        trabajo["limites"] = [(trabajo["a"], trabajo["b"])]
+        if "c" in trabajo and "d" in trabajo:
+            trabajo["limites"].append((trabajo["c"], trabajo["d"]))
+    for campo in ("funcion", "n"):
+        if campo not in trabajo:
+            raise ValueError(f"Falta el campo '{campo}'")
+    if trabajo["n"] < 1:
+        raise ValueError("N debe ser al menos 1")
+    return trabajo
+
+
+def _entero(campo: str, valor) -> int:
+    """Entero exacto: sin pasar por float salvo para textos o reales que ya son enteros ("1e5", 1e5)"""
+    if isinstance(valor, bool):
+        raise ValueError(f"'{campo}' debe ser un entero, no {valor!r}")
+    if isinstance(valor, int):
+        return valor
+    if isinstance(valor, str):
+        try:
+            return int(valor)
+        except ValueError:
+            pass
+    try:
+        real = float(valor)
+    except (TypeError, ValueError):
+        real = None
+    if real is None or not real.is_integer():
+        raise ValueError(f"'{campo}' debe ser un entero, no {valor!r}")
+    return int(real)
+
+
+def ejecutar_trabajo(trabajo: dict) -> dict:
+    """Calcula un trabajo y devuelve su resultado serializable; los errores se devuelven, no se lanzan"""
+    inicio = time.perf_counter()
+    identificador = trabajo.get("id") if isinstance(trabajo, dict) else None
+    try:
+        trabajo = normalizar_trabajo(trabajo)
+        resultado = _calcular(trabajo)
+    except Exception as e:
+        return {"id": identificador, "error": f"{type(e).__name__}: {e}"}
+
+    inferior, superior = resultado.intervalo_confianza
+    salida = {
+        "id": identificador,
+        "funcion": resultado.func,
+        "limites": [list(lim) for lim in resultado.limites],
+        "variables": list(resultado.variables),
+        "n": resultado.n,
+        "integral": resultado.integral,
+        "error_estandar": resultado.error_estandar,
+        "nivel_confianza": resultado.nivel_confianza,
+        "intervalo_confianza": [inferior, superior],
+        "metodo": trabajo.get("metodo", "estandar"),
+        "muestreador": resultado.muestreador,
+        "reduccion": resultado.reduccion,
+        "motor": resultado.motor,
+        "tiempo": time.perf_counter() - inicio,
+    }
+    if resultado.tolerancia_alcanzada is not None:
+        salida["tolerancia_alcanzada"] = resultado.tolerancia_alcanzada
+    if resultado.factor_reduccion is not None:
+        salida["factor_reduccion"] = resultado.factor_reduccion
+    return salida
+
+
+def _calcular(trabajo: dict):
+    """Elige el método del motor según las opciones del trabajo"""
+    comunes = {
+        "variables": trabajo.get("variables"),
+        "semilla": trabajo.get("semilla"),
+        "nivel_confianza": trabajo.get("nivel_confianza", 0.95),
+    }
+    metodo = trabajo.get("metodo", "estandar")
+    if metodo == "miser":
+        return MonteCarloCalculator.calcular_integral_adaptativa_nd(trabajo["funcion"], trabajo["limites"],
+                                                                    trabajo["n"], **comunes)
+    if metodo != "estandar":
+        raise ValueError(f"Método desconocido: {metodo}")
+
+    comunes["muestreador"] = trabajo.get("muestreador", "pseudo")
+    comunes["reduccion"] = _reduccion(trabajo)
+    if "tolerancia_abs" in trabajo or "tolerancia_rel" in trabajo:
+        return MonteCarloCalculator.calcular_integral_nd_tolerancia(
+            trabajo["funcion"], trabajo["limites"], n_max=trabajo["n"],
+            tolerancia_abs=trabajo.get("tolerancia_abs"), tolerancia_rel=trabajo.get("tolerancia_rel"),
+            **comunes)
+    return MonteCarloCalculator.calcular_integral_nd(trabajo["funcion"], trabajo["limites"], trabajo["n"],
+                                                     motor=trabajo.get("motor", "numpy"), **comunes)
+
+
+def _reduccion(trabajo: dict):
+    """Técnica de reducción de varianza del trabajo (las que no necesitan más expresiones)"""
+    nombre = trabajo.get("reduccion", "ninguna")
+    if nombre == "ninguna":
+        return None
+    if nombre == "antiteticas":
+        return Antiteticas()
+    if nombre == "estratificado":
+        return Estratificado(trabajo.get("estratos", 10))
+    raise ValueError(f"Reducción de varianza no disponible por lotes: {nombre}")
+
+
+def fijar_tamano_bloque(tamano: int):
+    """Cambia las muestras evaluadas por bloque (también se usa como inicializador de los procesos)"""
+    MonteCarloCalculator.TAMANO_BLOQUE = tamano
+    MonteCarloCalculator.TAMANO_BLOQUE_INICIAL = min(MonteCarloCalculator.TAMANO_BLOQUE_INICIAL, tamano)
+
+
+@contextmanager
+def tamano_bloque_temporal(tamano: Optional[int]):
+    """Fija el tamaño de bloque durante el bloque `with` y restaura después el del motor"""
+    if tamano is None:
+        yield
+        return
+    anteriores = MonteCarloCalculator.TAMANO_BLOQUE, MonteCarloCalculator.TAMANO_BLOQUE_INICIAL
+    fijar_tamano_bloque(tamano)
+    try:
+        yield
+    finally:
+        MonteCarloCalculator.TAMANO_BLOQUE, MonteCarloCalculator.TAMANO_BLOQUE_INICIAL = anteriores
+
+
+def ejecutar_lote(trabajos: list, salida, trabajadores: int = 1, lote: int = 1,
+                  tamano_bloque: Optional[int] = None) -> int:
+    """Ejecuta los trabajos y escribe cada resultado como una línea JSON en cuanto está listo.
+
+    Con varios trabajadores, los trabajos se reparten en grupos de `lote` entre procesos;
+    el orden de salida es siempre el de entrada. Devuelve el número de trabajos con error.
+    """
+    fallidos = 0
+
+    def escribir(posicion, trabajo, resultado):
+        nonlocal fallidos
+        if not isinstance(trabajo, dict):
+            # Un registro que no es un objeto no tiene id: se identifica por su posición
+            resultado["id"] = posicion
+        fallidos += "error" in resultado
+        salida.write(json.dumps(resultado, ensure_ascii=False) + "\n")
+        salida.flush()
+
+    if trabajadores <= 1:
+        # Se calcula en este proceso: el tamaño de bloque no debe sobrevivir al lote
+        with tamano_bloque_temporal(tamano_bloque):
+            for posicion, trabajo in enumerate(trabajos):
+                escribir(posicion, trabajo, ejecutar_trabajo(trabajo))
+        return fallidos
+
+    # Los procesos del lote se crean y terminan con él: basta con fijarlo al iniciarlos
+    contexto = multiprocessing.get_context("spawn")
+    inicializador = (fijar_tamano_bloque, (tamano_bloque,)) if tamano_bloque is not None else (None, ())
+    with ProcessPoolExecutor(max_workers=trabajadores, mp_context=contexto, initializer=inicializador[0],
+                             initargs=inicializador[1]) as ejecutor:
+        resultados = ejecutor.map(ejecutar_trabajo, trabajos, chunksize=lote)
+        for posicion, (trabajo, resultado) in enumerate(zip(trabajos, resultados)):
+            escribir(posicion, trabajo, resultado)
+    return fallidos
+
+
+def main(argumentos=None) -> int:
+    parser = argparse.ArgumentParser(description="Integrales de Monte Carlo por lotes, sin interfaz gráfica")
+    parser.add_argument("trabajos", help="archivo de trabajos (.json, .jsonl o .csv; '-' para stdin)")
+    parser.add_argument("-o", "--salida", default="-", help="archivo JSONL de resultados (por defecto, stdout)")
+    parser.add_argument("-t", "--trabajadores", type=int, default=1,
+                        help="procesos que calculan trabajos a la vez (por defecto 1)")
+    parser.add_argument("-l", "--lote", type=int, default=1,
+                        help="trabajos enviados juntos a cada proceso (por defecto 1)")
+    parser.add_argument("--tamano-bloque", type=int, default=None,
+                        help="muestras evaluadas por bloque dentro de cada integral")
+    opciones = parser.parse_args(argumentos)
+    if opciones.trabajadores < 1 or opciones.lote < 1:
+        parser.error("--trabajadores y --lote deben ser al menos 1")
+    if opciones.tamano_bloque is not None and opciones.tamano_bloque < 1:
+        parser.error("--tamano-bloque debe ser al menos 1")
+
+    try:
+        trabajos = leer_trabajos(opciones.trabajos)
+    except (OSError, ValueError) as e:
+        print(f"No se pudieron leer los trabajos: {e}", file=sys.stderr)
+        return 2
+
+    if opciones.salida == "-":
+        fallidos = ejecutar_lote(trabajos, sys.stdout, opciones.trabajadores, opciones.lote,
+                                 opciones.tamano_bloque)
+    else:
+        with open(opciones.salida, "w", encoding="utf-8") as salida:
+            fallidos = ejecutar_lote(trabajos, salida, opciones.trabajadores, opciones.lote,
+                                     opciones.tamano_bloque)
+
+    if fallidos:
+        print(f"{fallidos} de {len(trabajos)} trabajos fallaron", file=sys.stderr)
+    return 1 if fallidos else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,15 @@
+import math
+import queue
+import re
+import threading
+import time
+import numpy as np
 from modelo.modelo import MonteCarloCalculator
+from modelo.importancia import MuestreoImportancia, crear_propuesta
+from modelo.instrumentacion import Instrumentacion
+from modelo.reduccion import Antiteticas, Estratificado, VariableControl
+from modelo.resultado import semiancho_confianza
+from modelo.seguimiento import CalculoCancelado, Seguimiento
 from vista.vista import VistaMonteCarlo
 from vista.vista_1d import Vista1D
 from vista.vista_2d import Vista2D
@@ -6,6 +17,13 @@ from vista.vista_2d import Vista2D
 class ControladorMonteCarlo:
     """Controlador - Coordina Modelo y Vista"""
     
+    # Cada cuánto se revisa la cola de mensajes del hilo de cálculo
+    INTERVALO_SONDEO_MS = 100
+    # Mínimo tiempo entre redibujados del gráfico de convergencia
+    INTERVALO_CONVERGENCIA_S = 0.5
+    # Máximo de filas de la tabla de resultados de un barrido
+    MAXIMO_FILAS_BARRIDO = 50
+    
     def __init__(self, modelo=None, vista=None):
         # Inicializar Modelo y Vista si no se pasan
         self.modelo = modelo if modelo else MonteCarloCalculator()
@@ -21,9 +39,15 @@ class ControladorMonteCarlo:
         
         self.vista_2d = Vista2D(self.vista.frame_2d, self, crear_botones_funciones=self.vista._crear_botones_funciones)
         self.vista_2d._crear_interfaz_2d()
+        
+        # Cálculo en segundo plano: hilo en curso y evento para cancelarlo
+        self._hilo = None
+        self._cancelar = None
     
     def calcular_1d(self):
         """Maneja el cálculo de integral 1D"""
+        if self._calculo_en_curso():
+            return
         try:
             # Obtener valores de la vista
             valores = self.vista_1d.obtener_valores_1d()
@@ -32,26 +56,66 @@ class ControladorMonteCarlo:
             b = float(valores['b'])
             n = int(valores['n'])
             
+            nivel, tolerancias = self._leer_precision(valores)
+            trabajadores = self._leer_trabajadores(valores)
+            muestreo = valores['muestreo']
+            reduccion = self._leer_reduccion(valores)
+            barrido = self._leer_barrido(valores['barrido'])
+            instrumentacion = self._leer_instrumentacion(valores)
+            
             # Validar
             if a >= b:
                 self.vista.mostrar_error("El límite 'a' debe ser menor que 'b'")
                 return
             
-            # Mostrar progreso
-            self.vista.mostrar_progreso(f"🔄 Calculando...\n\nGenerando {n:,} puntos aleatorios...\n")
-            
-            # Calcular usando el modelo
-            resultado, puntos = self.modelo.calcular_integral_1d(func, a, b, n)
-            
-            # Actualizar vista
-            self.vista_1d.actualizar_grafico_1d(func, a, b, puntos)
-            self.mostrar_resultados_1d(resultado, puntos, func, a, b, n)
+            # Preparar el cálculo usando el modelo
+            if barrido:
+                self._validar_barrido(valores, tolerancias, trabajadores, reduccion)
+                mensaje = f"Barrido de {self._combinaciones(barrido):,} combinaciones con {n:,} puntos comunes..."
+                calcular = lambda seguimiento: self.modelo.calcular_barrido_1d(
+                    func, a, b, barrido, n, nivel_confianza=nivel, muestreador=muestreo, seguimiento=seguimiento)
+            elif valores['integrador'] == 'miser':
+                self._validar_adaptativo(valores, tolerancias, trabajadores, reduccion)
+                mensaje = f"Integración adaptativa con {n:,} evaluaciones..."
+                calcular = lambda seguimiento: self.modelo.calcular_integral_adaptativa_1d(
+                    func, a, b, n, nivel_confianza=nivel, seguimiento=seguimiento)
+            elif tolerancias:
+                mensaje = f"Muestreando hasta alcanzar la tolerancia (máximo {n:,} puntos)..."
+                calcular = lambda seguimiento: self.modelo.calcular_integral_1d_tolerancia(
+                    func, a, b, n_max=n, nivel_confianza=nivel, muestreador=muestreo, reduccion=reduccion,
+                    seguimiento=seguimiento, **tolerancias)
+            else:
+                mensaje = f"Generando {n:,} puntos aleatorios..."
+                calcular = lambda seguimiento: self.modelo.calcular_integral_1d(
+                    func, a, b, n, nivel_confianza=nivel, trabajadores=trabajadores, muestreador=muestreo,
+                    reduccion=reduccion, seguimiento=seguimiento, motor=valores['motor'])
             
         except Exception as e:
             self.vista.mostrar_error(f"Error en cálculo 1D: {str(e)}")
+            return
+        
+        if barrido:
+            self._lanzar_barrido(self.vista_1d, mensaje, calcular, "Error en cálculo 1D", nivel, instrumentacion)
+            return
+        
+        def mostrar(resultado, referencia, instrumentacion, aviso=""):
+            # Actualizar vista (el dibujo pendiente se completa dentro de la etapa medida)
+            with instrumentacion.medir("gráfico"):
+                self.vista_1d.actualizar_grafico_1d(func, a, b, resultado)
+                self.vista.root.update_idletasks()
+            self.mostrar_resultados_1d(resultado, func, a, b, resultado.n, referencia=referencia, aviso=aviso,
+                                       instrumentacion=instrumentacion)
+        
+        # El valor de referencia (SymPy en otro proceso o cuadratura) también se calcula fuera del hilo de la interfaz
+        self._lanzar_calculo(self.vista_1d, mensaje, calcular, mostrar, "Error en cálculo 1D",
+                             referencia=lambda cancelar: self.modelo.calcular_valor_referencia_1d(
+                                 func, a, b, cancelar=cancelar),
+                             convergencia=valores['convergencia'], nivel=nivel, instrumentacion=instrumentacion)
     
     def calcular_2d(self):
         """Maneja el cálculo de integral 2D"""
+        if self._calculo_en_curso():
+            return
         try:
             # Obtener valores de la vista
             valores = self.vista_2d.obtener_valores_2d()
@@ -62,52 +126,428 @@ class ControladorMonteCarlo:
             dy = float(valores['dy'])
             n = int(valores['n'])
             
+            nivel, tolerancias = self._leer_precision(valores)
+            trabajadores = self._leer_trabajadores(valores)
+            muestreo = valores['muestreo']
+            reduccion = self._leer_reduccion(valores)
+            barrido = self._leer_barrido(valores['barrido'])
+            instrumentacion = self._leer_instrumentacion(valores)
+            
             # Validar
             if ax >= bx or cy >= dy:
                 self.vista.mostrar_error("Los límites inferiores deben ser menores que los superiores")
                 return
             
-            # Mostrar progreso
-            self.vista.mostrar_progreso(f"🔄 Calculando...\n\nGenerando {n:,} puntos aleatorios en 2D...\n")
-            
-            # Calcular usando el modelo
-            resultado, puntos = self.modelo.calcular_integral_2d(func, ax, bx, cy, dy, n)
-            
-            # Actualizar vista
-            self.vista_2d.actualizar_grafico_2d(func, ax, bx, cy, dy, puntos)
-            self.mostrar_resultados_2d(resultado, puntos, func, ax, bx, cy, dy, n)
+            # Preparar el cálculo usando el modelo
+            if barrido:
+                self._validar_barrido(valores, tolerancias, trabajadores, reduccion)
+                mensaje = f"Barrido en 2D de {self._combinaciones(barrido):,} combinaciones con {n:,} puntos comunes..."
+                calcular = lambda seguimiento: self.modelo.calcular_barrido_2d(
+                    func, ax, bx, cy, dy, barrido, n, nivel_confianza=nivel, muestreador=muestreo,
+                    seguimiento=seguimiento)
+            elif valores['integrador'] == 'miser':
+                self._validar_adaptativo(valores, tolerancias, trabajadores, reduccion)
+                mensaje = f"Integración adaptativa en 2D con {n:,} evaluaciones..."
+                calcular = lambda seguimiento: self.modelo.calcular_integral_adaptativa_2d(
+                    func, ax, bx, cy, dy, n, nivel_confianza=nivel, seguimiento=seguimiento)
+            elif tolerancias:
+                mensaje = f"Muestreando en 2D hasta alcanzar la tolerancia (máximo {n:,} puntos)..."
+                calcular = lambda seguimiento: self.modelo.calcular_integral_2d_tolerancia(
+                    func, ax, bx, cy, dy, n_max=n, nivel_confianza=nivel, muestreador=muestreo,
+                    reduccion=reduccion, seguimiento=seguimiento, **tolerancias)
+            else:
+                mensaje = f"Generando {n:,} puntos aleatorios en 2D..."
+                calcular = lambda seguimiento: self.modelo.calcular_integral_2d(
+                    func, ax, bx, cy, dy, n, nivel_confianza=nivel, trabajadores=trabajadores,
+                    muestreador=muestreo, reduccion=reduccion, seguimiento=seguimiento, motor=valores['motor'])
             
         except Exception as e:
             self.vista.mostrar_error(f"Error en cálculo 2D: {str(e)}")
+            return
+        
+        if barrido:
+            self._lanzar_barrido(self.vista_2d, mensaje, calcular, "Error en cálculo 2D", nivel, instrumentacion)
+            return
+        
+        def mostrar(resultado, referencia, instrumentacion, aviso=""):
+            # Actualizar vista (el dibujo pendiente se completa dentro de la etapa medida)
+            with instrumentacion.medir("gráfico"):
+                self.vista_2d.actualizar_grafico_2d(func, ax, bx, cy, dy, resultado)
+                self.vista.root.update_idletasks()
+            self.mostrar_resultados_2d(resultado, func, ax, bx, cy, dy, resultado.n, referencia=referencia,
+                                       aviso=aviso, instrumentacion=instrumentacion)
+        
+        self._lanzar_calculo(self.vista_2d, mensaje, calcular, mostrar, "Error en cálculo 2D",
+                             referencia=lambda cancelar: self.modelo.calcular_valor_referencia_2d(
+                                 func, ax, bx, cy, dy, cancelar=cancelar),
+                             convergencia=valores['convergencia'], nivel=nivel, instrumentacion=instrumentacion)
+    
+    def cancelar_calculo(self):
+        """Pide al cálculo en curso que se detenga tras el bloque actual"""
+        if self._cancelar is not None:
+            self._cancelar.set()
+    
+    def _calculo_en_curso(self):
+        """Indica si ya hay un cálculo ejecutándose en segundo plano"""
+        if self._hilo is not None and self._hilo.is_alive():
+            self.vista.mostrar_error("Ya hay un cálculo en curso; espere a que termine o cancélelo")
+            return True
+        return False
+    
+    def _lanzar_calculo(self, sub_vista, mensaje, calcular, mostrar, titulo_error, referencia=None,
+                        convergencia=False, nivel=0.95, instrumentacion=None):
+        """Ejecuta el cálculo en un hilo de fondo; el avance llega por una cola que revisa root.after.
+        
+        `referencia` recibe el evento de cancelación y devuelve el ValorReferencia con el que comparar.
+        `mostrar(resultado, referencia, instrumentacion, aviso="")` presenta el resultado; la
+        instrumentación mide las etapas del cálculo y se entrega para completar el desglose.
+        """
+        if instrumentacion is None:
+            instrumentacion = Instrumentacion()
+        self._cancelar = threading.Event()
+        cola = queue.Queue()
+        # En modo convergencia se recibe una instantánea tras cada bloque
+        intervalo = 0 if convergencia else 0.1
+        seguimiento = Seguimiento(lambda progreso: cola.put(("progreso", progreso)), self._cancelar, intervalo,
+                                  instrumentacion)
+        
+        def trabajo():
+            try:
+                # cProfile solo sigue al hilo en el que se activa: el de cálculo
+                with instrumentacion.perfilar():
+                    with instrumentacion.medir("cálculo Monte Carlo"):
+                        resultado = calcular(seguimiento)
+                    valor_referencia = None
+                    if referencia:
+                        with instrumentacion.medir("valor de referencia"):
+                            valor_referencia = referencia(seguimiento.cancelar)
+                cola.put(("resultado", resultado, valor_referencia))
+            except CalculoCancelado as cancelado:
+                cola.put(("cancelado", cancelado.resultado))
+            except Exception as e:
+                cola.put(("error", e))
+        
+        sub_vista.mostrar_resultados(f"🔄 Calculando...\n\n{mensaje}\n")
+        sub_vista.establecer_calculando(True)
+        if convergencia:
+            sub_vista.preparar_convergencia()
+        estado = {
+            'cola': cola, 'sub_vista': sub_vista, 'mensaje': mensaje, 'mostrar': mostrar,
+            'titulo_error': titulo_error, 'convergencia': convergencia, 'nivel': nivel,
+            'instrumentacion': instrumentacion,
+            'historial': [], 'ultimo_dibujo': 0.0,
+        }
+        self._hilo = threading.Thread(target=trabajo, daemon=True)
+        self._hilo.start()
+        self.vista.root.after(self.INTERVALO_SONDEO_MS, self._revisar_cola, estado)
+    
+    def _lanzar_barrido(self, sub_vista, mensaje, calcular, titulo_error, nivel, instrumentacion=None):
+        """Lanza un barrido de parámetros: sin valor de referencia ni gráfico de convergencia"""
+        def mostrar(resultado, referencia, instrumentacion, aviso=""):
+            with instrumentacion.medir("gráfico"):
+                sub_vista.mostrar_barrido(resultado)
+                self.vista.root.update_idletasks()
+            self.mostrar_resultados_barrido(sub_vista, resultado, aviso=aviso, instrumentacion=instrumentacion)
+        
+        self._lanzar_calculo(sub_vista, mensaje, calcular, mostrar, titulo_error, nivel=nivel,
+                             instrumentacion=instrumentacion)
+    
+    def _revisar_cola(self, estado):
+        """Procesa los mensajes del hilo de cálculo sin bloquear la interfaz"""
+        sub_vista = estado['sub_vista']
+        progreso = None
+        final = None
+        while True:
+            try:
+                mensaje_cola = estado['cola'].get_nowait()
+            except queue.Empty:
+                break
+            if mensaje_cola[0] == "progreso":
+                progreso = mensaje_cola[1]
+                estado['historial'].append((progreso.hechos, progreso.estimacion, progreso.error_estandar))
+            else:
+                final = mensaje_cola
+        
+        if final is None:
+            # Solo se muestra el avance más reciente
+            if progreso is not None:
+                sub_vista.mostrar_resultados(self._texto_progreso(estado['mensaje'], progreso, estado['nivel']))
+                sub_vista.actualizar_progreso(progreso.fraccion)
+                # El gráfico de convergencia se redibuja con menos frecuencia que el texto
+                ahora = time.perf_counter()
+                if estado['convergencia'] and ahora - estado['ultimo_dibujo'] >= self.INTERVALO_CONVERGENCIA_S:
+                    estado['ultimo_dibujo'] = ahora
+                    sub_vista.mostrar_convergencia(estado['historial'], estado['nivel'])
+            self.vista.root.after(self.INTERVALO_SONDEO_MS, self._revisar_cola, estado)
+            return
+        
+        sub_vista.establecer_calculando(False)
+        self._cancelar = None
+        try:
+            if final[0] == "resultado":
+                resultado, referencia = final[1], final[2]
+                estado['mostrar'](resultado, referencia, estado['instrumentacion'])
+            elif final[0] == "cancelado":
+                resultado, referencia = final[1], None
+                if resultado is not None and resultado.n > 0:
+                    estado['mostrar'](resultado, None, estado['instrumentacion'], aviso="⚠️ CÁLCULO CANCELADO: resultado parcial con las muestras ya evaluadas\n\n")
+                else:
+                    sub_vista.mostrar_resultados("⚠️ Cálculo cancelado\n")
+            else:
+                raise final[1]
+            
+            if estado['convergencia'] and resultado is not None:
+                if not estado['historial'] or estado['historial'][-1][0] != resultado.n:
+                    estado['historial'].append((resultado.n, resultado.integral, resultado.error_estandar))
+                sub_vista.mostrar_convergencia(estado['historial'], estado['nivel'],
+                                               referencia.valor if referencia is not None else None)
+        except Exception as e:
+            self.vista.mostrar_error(f"{estado['titulo_error']}: {str(e)}")
+    
+    def _texto_progreso(self, mensaje, progreso, nivel):
+        """Formatea el avance del cálculo: muestras, estimación actual, error y tiempo restante"""
+        texto = f"🔄 Calculando...\n\n{mensaje}\n\n"
+        texto += f"   Muestras evaluadas: {progreso.hechos:,} de {progreso.total:,} ({progreso.fraccion*100:.1f}%)\n"
+        if progreso.estimacion is not None:
+            texto += f"   Estimación actual: {progreso.estimacion:.8f}\n"
+        if progreso.error_estandar is not None and math.isfinite(progreso.error_estandar):
+            semiancho = semiancho_confianza(progreso.error_estandar, nivel)
+            texto += f"   Error estándar: {progreso.error_estandar:.8f} (IC {nivel*100:g}%: ± {semiancho:.8f})\n"
+        texto += f"   Tiempo transcurrido: {progreso.transcurrido:.1f} s\n"
+        if progreso.eta is not None:
+            texto += f"   Tiempo restante estimado: {progreso.eta:.1f} s\n"
+        return texto
+    
+    def _leer_precision(self, valores):
+        """Obtiene el nivel de confianza y, si se eligió, la tolerancia pedida"""
+        nivel = float(valores['confianza']) / 100
+        if not 0 < nivel < 1:
+            raise ValueError("El nivel de confianza debe estar entre 0 y 100")
+        
+        if valores['criterio'] == 'n_fijo':
+            return nivel, {}
+        
+        tolerancia = float(valores['tolerancia'])
+        if tolerancia <= 0:
+            raise ValueError("La tolerancia debe ser positiva")
+        if valores['criterio'] == 'absoluta':
+            return nivel, {'tolerancia_abs': tolerancia}
+        return nivel, {'tolerancia_rel': tolerancia}
+    
+    def _leer_trabajadores(self, valores):
+        """Obtiene el número de procesos para el cálculo"""
+        trabajadores = int(valores['trabajadores'])
+        if trabajadores < 1:
+            raise ValueError("El número de procesos debe ser al menos 1")
+        return trabajadores
+    
+    def _leer_reduccion(self, valores):
+        """Construye la técnica de reducción de varianza elegida (o None)"""
+        if valores['reduccion'] == 'antiteticas':
+            return Antiteticas()
+        if valores['reduccion'] == 'estratificado':
+            return Estratificado(int(valores['estratos']))
+        if valores['reduccion'] == 'control':
+            if not valores['integral_control'].strip():
+                raise ValueError("Indique la integral exacta de la función de control")
+            return VariableControl(valores['func_control'], float(valores['integral_control']))
+        if valores['reduccion'] == 'importancia':
+            return MuestreoImportancia([self._leer_propuesta(eje, *valores['propuestas'][eje])
+                                        for eje in valores['propuestas']])
+        return None
+    
+    def _leer_instrumentacion(self, valores):
+        """Crea la instrumentación del cálculo según las opciones de memoria, perfil y registro"""
+        return Instrumentacion(memoria=valores['medir_memoria'], perfil=valores['perfil'],
+                               registro=valores['registro'].strip() or None)
+    
+    def _leer_barrido(self, texto):
+        """Obtiene los valores de cada parámetro del barrido.
+        
+        Formato: 'k = 0.1 : 10 : 100 ; c = 1, 2, 5' (inicio : fin : cantidad, o una lista de valores).
+        Devuelve un diccionario vacío si no se pidió barrido.
+        """
+        parametros = {}
+        for parte in texto.split(';'):
+            if not parte.strip():
+                continue
+            nombre, signo, valores = parte.partition('=')
+            nombre = nombre.strip()
+            if not signo or not re.fullmatch(r"[A-Za-z_]\w*", nombre):
+                raise ValueError(f"Parámetro de barrido mal escrito: '{parte.strip()}' (use nombre = valores)")
+            if nombre in parametros:
+                raise ValueError(f"El parámetro '{nombre}' aparece dos veces en el barrido")
+            if ':' in valores:
+                rango = [p.strip() for p in valores.split(':')]
+                if len(rango) != 3:
+                    raise ValueError(f"El rango de '{nombre}' debe tener la forma inicio : fin : cantidad")
+                cantidad = int(rango[2])
+                if cantidad < 1:
+                    raise ValueError(f"La cantidad de valores de '{nombre}' debe ser al menos 1")
+                parametros[nombre] = np.linspace(float(rango[0]), float(rango[1]), cantidad)
+            else:
+                parametros[nombre] = np.array([float(v) for v in valores.split(',') if v.strip()])
+        return parametros
+    
+    def _combinaciones(self, parametros):
+        """Número de combinaciones de valores de un barrido"""
+        return math.prod(len(valores) for valores in parametros.values())
+    
+    def _validar_barrido(self, valores, tolerancias, trabajadores, reduccion):
+        """Comprueba que las opciones elegidas son compatibles con el barrido de parámetros"""
+        if valores['integrador'] == 'miser':
+            raise ValueError("El barrido de parámetros usa el integrador Monte Carlo estándar")
+        if tolerancias:
+            raise ValueError("El barrido de parámetros solo admite el criterio de N fijo")
+        if reduccion is not None:
+            raise ValueError("El barrido de parámetros no admite técnicas de reducción de varianza")
+        if trabajadores > 1:
+            raise ValueError("El barrido de parámetros se ejecuta en un único proceso")
+    
+    def _validar_adaptativo(self, valores, tolerancias, trabajadores, reduccion):
+        """Comprueba que las opciones elegidas son compatibles con el integrador adaptativo"""
+        if tolerancias:
+            raise ValueError("El integrador adaptativo solo admite el criterio de N fijo")
+        if reduccion is not None or valores['muestreo'] != 'pseudo':
+            raise ValueError("El integrador adaptativo usa su propio muestreo: elija muestreo "
+                             "pseudoaleatorio y ninguna reducción de varianza")
+        if trabajadores > 1:
+            raise ValueError("El integrador adaptativo se ejecuta en un único proceso")
+    
+    def _leer_propuesta(self, eje, familia, parametros):
+        """Construye la densidad de propuesta de un eje a partir del texto de parámetros"""
+        if familia == 'personalizada':
+            # Formato: densidad ; inversa de la CDF en u
+            partes = [p.strip() for p in parametros.split(';')]
+            if len(partes) != 2:
+                raise ValueError(f"La propuesta personalizada en {eje} debe tener la forma 'p({eje}) ; F⁻¹(u)'")
+            return crear_propuesta(familia, partes[0], partes[1], eje)
+        numeros = [float(p) for p in parametros.split(',') if p.strip()]
+        return crear_propuesta(familia, *numeros)
+    
+    def _texto_muestreo(self, resultado):
+        """Describe el tipo de muestreo usado"""
+        if resultado.muestreador == "pseudo":
+            if getattr(resultado, "motor", "numpy") == "jit":
+                return f"   Muestreo: pseudoaleatorio, en un núcleo compilado con Numba (JIT)\n"
+            return f"   Muestreo: pseudoaleatorio\n"
+        nombre = {"sobol": "Sobol", "halton": "Halton", "reticula": "retícula de rango 1"}[resultado.muestreador]
+        return f"   Muestreo: cuasi-Monte Carlo ({nombre}) con réplicas aleatorizadas\n"
+    
+    def _texto_reduccion(self, resultado):
+        """Indica la técnica de reducción de varianza y el factor logrado"""
+        if resultado.reduccion == "ninguna":
+            return ""
+        texto = f"   Reducción de varianza: {resultado.reduccion}"
+        if resultado.factor_reduccion is not None:
+            texto += f" (varianza reducida ×{resultado.factor_reduccion:.2f})"
+        if resultado.reduccion == "antitéticas":
+            texto += "\n   Se evalúan pares u, 1−u: un N impar se redondea al par inferior"
+        return texto + "\n"
+    
+    def _texto_precision(self, resultado):
+        """Formatea la sección de precisión estadística del resultado"""
+        inferior, superior = resultado.intervalo_confianza
+        
+        texto = f"📏 PRECISIÓN ESTADÍSTICA:\n"
+        texto += f"   Varianza muestral: {resultado.varianza:.8f}\n"
+        texto += f"   Error estándar: {resultado.error_estandar:.8f}\n"
+        texto += f"   IC {resultado.nivel_confianza*100:g}%: [{inferior:.8f}, {superior:.8f}] (± {resultado.semiancho:.8f})\n"
+        if resultado.tolerancia_alcanzada is not None:
+            estado = "sí" if resultado.tolerancia_alcanzada else "no (se alcanzó el N máximo)"
+            texto += f"   Tolerancia alcanzada: {estado} con N = {resultado.n:,}\n"
+        texto += "\n"
+        return texto
     
-    def mostrar_resultados_1d(self, resultado, puntos, func, a, b, n):
+    def _texto_comparacion(self, integral, referencia):
+        """Compara la estimación con el valor exacto o, si no lo hay, con el de cuadratura"""
+        if referencia is None:
+            return ""
+        error = abs(integral - referencia.valor)
+        if referencia.exacto:
+            texto = f"📐 COMPARACIÓN CON VALOR EXACTO:\n"
+            texto += f"   Valor exacto: {referencia.valor:.8f}\n"
+        else:
+            texto = f"📐 COMPARACIÓN CON VALOR DE REFERENCIA:\n"
+            texto += f"   Valor por cuadratura adaptativa: {referencia.valor:.8f} (error estimado {referencia.error:.1e})\n"
+        texto += f"   Error absoluto: {error:.8f}\n"
+        if referencia.valor != 0:
+            texto += f"   Error relativo: {(error/abs(referencia.valor)*100):.4f}%\n"
+        return texto + "\n"
+    
+    def _texto_tiempos(self, instrumentacion, total):
+        """Filas del desglose de tiempos: una por etapa, sangradas según su anidamiento"""
+        texto = ""
+        for etapa in instrumentacion.etapas.values():
+            texto += self._linea_tiempo(etapa, total, instrumentacion.memoria)
+        return texto
+    
+    def _linea_tiempo(self, etapa, total, memoria):
+        """Una etapa: tiempo, fracción del total, muestras por segundo y memoria pico si se midió"""
+        nombre = "  " * etapa.nivel + etapa.nombre
+        texto = f"   {nombre:<28}{etapa.tiempo*1000:>10.1f} ms"
+        texto += f"{etapa.tiempo/total*100:>7.1f}%" if total > 0 else " " * 8
+        if etapa.muestras_por_segundo is not None:
+            texto += f"   {etapa.muestras_por_segundo:.3g} muestras/s"
+        if memoria and etapa.memoria_pico is not None:
+            texto += f"   pico {etapa.memoria_pico / 2**20:.1f} MB"
+        return texto + "\n"
+    
+    def _publicar(self, sub_vista, texto, resultado, instrumentacion=None):
+        """Muestra el texto de resultados seguido del desglose de tiempos.
+        
+        La inserción del texto es la última etapa: se mide al mostrarlo y su fila se añade después,
+        junto con el perfil de cProfile y el aviso del registro de métricas si se pidieron.
+        """
+        if instrumentacion is None:
+            sub_vista.mostrar_resultados(texto)
+            return
+        total = instrumentacion.total
+        texto += f"\n⏱️ DESGLOSE DE TIEMPOS (total {total*1000:.1f} ms):\n"
+        texto += self._texto_tiempos(instrumentacion, total)
+        with instrumentacion.medir("texto de resultados") as etapa:
+            sub_vista.mostrar_resultados(texto)
+            self.vista.root.update_idletasks()
+        extra = self._linea_tiempo(etapa, total, instrumentacion.memoria)
+        
+        if instrumentacion.perfil is not None:
+            extra += f"\n🔬 PERFIL (cProfile, hilo de cálculo):\n{instrumentacion.texto_perfil()}"
+        if instrumentacion.registro:
+            contexto = {"funcion": resultado.func, "dimension": len(resultado.limites), "n": resultado.n}
+            try:
+                ruta = instrumentacion.exportar(contexto)
+                extra += f"\n   Métricas añadidas a {ruta}\n"
+            except OSError as e:
+                extra += f"\n   ⚠️ No se pudo escribir el registro de métricas: {e}\n"
+        sub_vista.agregar_resultados(extra)
+    
+    def mostrar_resultados_1d(self, resultado, func, a, b, n, referencia=None, aviso="", instrumentacion=None):
         """Formatea y muestra resultados para 1D"""
-        texto = "="*60 + "\n"
+        integral = resultado.integral
+        
+        texto = aviso + "="*60 + "\n"
         texto += "INTEGRAL SIMPLE - MÉTODO DE MONTE CARLO\n"
         texto += "="*60 + "\n\n"
         
         texto += f"📊 INFORMACIÓN DEL CÁLCULO:\n"
         texto += f"   Función: f(x) = {func}\n"
         texto += f"   Intervalo: [{a}, {b}]\n"
-        texto += f"   Puntos generados (N): {n:,}\n\n"
+        texto += f"   Puntos generados (N): {n:,}\n"
+        texto += self._texto_muestreo(resultado) + "\n"
         
         texto += f"🎯 RESULTADO DE LA APROXIMACIÓN:\n"
-        texto += f"   ∫f(x)dx ≈ {resultado:.8f}\n\n"
+        texto += f"   ∫f(x)dx ≈ {integral:.8f}\n"
+        texto += self._texto_reduccion(resultado) + "\n"
+        texto += self._texto_precision(resultado)
         
-        # Calcular valor exacto si es posible
-        exacto = self.modelo.calcular_valor_exacto_1d(func, a, b)
-        if exacto is not None:
-            error = abs(resultado - exacto)
-            texto += f"📐 COMPARACIÓN CON VALOR EXACTO:\n"
-            texto += f"   Valor exacto: {exacto:.8f}\n"
-            texto += f"   Error absoluto: {error:.8f}\n"
-            texto += f"   Error relativo: {(error/exacto*100):.4f}%\n\n"
+        # Valor exacto o de referencia, si se pudo calcular
+        texto += self._texto_comparacion(integral, referencia)
         
         texto += f"🔢 PUNTOS ALEATORIOS UTILIZADOS (primeros 10):\n"
-        for i, punto in enumerate(puntos[:10]):
-            texto += f"   Punto {i+1}: x = {punto['x']:.4f}, f(x) = {punto['y']:.4f}\n"
-        if len(puntos) > 10:
-            texto += f"   ... y {len(puntos)-10} puntos más\n\n"
+        for i in range(min(10, len(resultado))):
+            texto += f"   Punto {i+1}: x = {resultado.x[i]:.4f}, f(x) = {resultado.fx[i]:.4f}\n"
+        if resultado.n > 10:
+            texto += f"   ... y {resultado.n-10:,} puntos más\n\n"
         
         texto += f"📈 EXPLICACIÓN DEL MÉTODO:\n"
         texto += f"   1. Se generan {n:,} puntos xᵢ aleatorios en [{a}, {b}]\n"
@@ -116,15 +556,17 @@ class ControladorMonteCarlo:
         texto += f"   4. Se multiplica por el ancho del intervalo: ({b-a})\n"
         texto += f"   5. Fórmula: ∫f(x)dx ≈ (b-a) × (1/N) × Σ f(xᵢ)\n\n"
         
-        texto += f"   Resultado: ({b-a}) × ({resultado/(b-a):.8f}) = {resultado:.8f}\n"
+        texto += f"   Resultado: ({b-a}) × ({integral/(b-a):.8f}) = {integral:.8f}\n"
         
-        self.vista_1d.mostrar_resultados(texto)
+        self._publicar(self.vista_1d, texto, resultado, instrumentacion)
     
-    def mostrar_resultados_2d(self, resultado, puntos, func, ax, bx, cy, dy, n):
+    def mostrar_resultados_2d(self, resultado, func, ax, bx, cy, dy, n, referencia=None, aviso="",
+                              instrumentacion=None):
         """Formatea y muestra resultados para 2D"""
+        integral = resultado.integral
         area = (bx - ax) * (dy - cy)
         
-        texto = "="*60 + "\n"
+        texto = aviso + "="*60 + "\n"
         texto += "INTEGRAL DOBLE - MÉTODO DE MONTE CARLO\n"
         texto += "="*60 + "\n\n"
         
@@ -133,16 +575,20 @@ class ControladorMonteCarlo:
         texto += f"   Intervalo X: [{ax}, {bx}]\n"
         texto += f"   Intervalo Y: [{cy}, {dy}]\n"
         texto += f"   Área de integración: {area:.4f}\n"
-        texto += f"   Puntos generados (N): {n:,}\n\n"
+        texto += f"   Puntos generados (N): {n:,}\n"
+        texto += self._texto_muestreo(resultado) + "\n"
         
         texto += f"🎯 RESULTADO DE LA APROXIMACIÓN:\n"
-        texto += f"   ∬f(x,y)dxdy ≈ {resultado:.8f}\n\n"
+        texto += f"   ∬f(x,y)dxdy ≈ {integral:.8f}\n"
+        texto += self._texto_reduccion(resultado) + "\n"
+        texto += self._texto_precision(resultado)
+        texto += self._texto_comparacion(integral, referencia)
         
         texto += f"🔢 PUNTOS ALEATORIOS UTILIZADOS (primeros 10):\n"
-        for i, punto in enumerate(puntos[:10]):
-            texto += f"   Punto {i+1}: x = {punto['x']:.3f}, y = {punto['y']:.3f}, f(x,y) = {punto['z']:.4f}\n"
-        if len(puntos) > 10:
-            texto += f"   ... y {len(puntos)-10} puntos más \n\n"
+        for i in range(min(10, len(resultado))):
+            texto += f"   Punto {i+1}: x = {resultado.x[i]:.3f}, y = {resultado.y[i]:.3f}, f(x,y) = {resultado.z[i]:.4f}\n"
+        if resultado.n > 10:
+            texto += f"   ... y {resultado.n-10:,} puntos más \n\n"
         texto += f"📈 EXPLICACIÓN DEL MÉTODO 2D:\n"
         texto += f"   1. Se generan {n:,} puntos (xᵢ,yᵢ) en el rectángulo\n"
         texto += f"   2. Se evalúa f(xᵢ,yᵢ) en cada punto\n"
@@ -150,9 +596,50 @@ class ControladorMonteCarlo:
         texto += f"   4. Se multiplica por el área: {area:.4f}\n"
         texto += f"   5. Fórmula: ∬f(x,y)dxdy ≈ Área × (1/N) × Σ f(xᵢ,yᵢ)\n\n"
         
-        texto += f"   Resultado: {area:.4f} × ({resultado/area:.8f}) = {resultado:.8f}\n"
+        texto += f"   Resultado: {area:.4f} × ({integral/area:.8f}) = {integral:.8f}\n"
+        
+        self._publicar(self.vista_2d, texto, resultado, instrumentacion)
+    
+    def mostrar_resultados_barrido(self, sub_vista, resultado, aviso="", instrumentacion=None):
+        """Formatea y muestra la tabla de un barrido de parámetros"""
+        nombres = list(resultado.parametros)
+        rejilla = resultado.rejilla()
+        integrales = resultado.integrales.ravel()
+        errores = resultado.errores_estandar.ravel()
+        intervalos = resultado.intervalos_confianza.reshape(-1, 2)
+        
+        texto = aviso + "="*60 + "\n"
+        texto += "BARRIDO DE PARÁMETROS - MÉTODO DE MONTE CARLO\n"
+        texto += "="*60 + "\n\n"
+        
+        texto += f"📊 INFORMACIÓN DEL CÁLCULO:\n"
+        texto += f"   Función: f({', '.join(resultado.variables)}; {', '.join(nombres)}) = {resultado.func}\n"
+        for variable, (inferior, superior) in zip(resultado.variables, resultado.limites):
+            texto += f"   Intervalo {variable}: [{inferior:g}, {superior:g}]\n"
+        for nombre, valores in resultado.parametros.items():
+            texto += f"   Parámetro {nombre}: {len(valores)} valores en [{valores.min():g}, {valores.max():g}]\n"
+        texto += f"   Combinaciones: {len(resultado):,}\n"
+        texto += f"   Puntos generados (N): {resultado.n:,}, los mismos para todas las combinaciones\n"
+        texto += self._texto_muestreo(resultado) + "\n"
+        
+        texto += f"🎯 RESULTADOS (IC {resultado.nivel_confianza*100:g}%):\n"
+        texto += "   " + "".join(f"{nombre:>12}" for nombre in nombres)
+        texto += f"{'Integral':>16}{'Error est.':>14}{'IC inferior':>16}{'IC superior':>16}\n"
+        filas = range(len(resultado))
+        if len(resultado) > self.MAXIMO_FILAS_BARRIDO:
+            filas = np.unique(np.linspace(0, len(resultado) - 1, self.MAXIMO_FILAS_BARRIDO).round().astype(int))
+        for i in filas:
+            texto += "   " + "".join(f"{rejilla[nombre].flat[i]:>12.5g}" for nombre in nombres)
+            texto += f"{integrales[i]:>16.8f}{errores[i]:>14.2e}{intervalos[i, 0]:>16.8f}{intervalos[i, 1]:>16.8f}\n"
+        if len(filas) < len(resultado):
+            texto += f"   ... se muestran {len(filas)} de {len(resultado):,} combinaciones\n"
+        
+        texto += f"\n📈 EXPLICACIÓN DEL MÉTODO:\n"
+        texto += f"   Las N muestras se generan una sola vez y f se evalúa en ellas para cada\n"
+        texto += f"   combinación de parámetros. Al compartir las muestras, las diferencias entre\n"
+        texto += f"   combinaciones vecinas tienen mucho menos ruido que con muestras independientes.\n"
         
-        self.vista_2d.mostrar_resultados(texto)
+        self._publicar(sub_vista, texto, resultado, instrumentacion)
     
     def cargar_ejemplo_1d(self, func, a, b, n):
         """Carga un ejemplo en los campos 1D"""
@@ -0,0 +1,262 @@
+import numpy as np
+from typing import Optional
+
+
+class AcumuladorWelford:
+    """Suma, media y varianza en línea (Welford) actualizadas por bloques de muestras"""
+
+    __slots__ = ("n", "suma", "media", "m2")
+
+    def __init__(self):
+        self.n = 0
+        self.suma = 0.0
+        self.media = 0.0
+        self.m2 = 0.0
+
+    def agregar(self, valores: np.ndarray):
+        """Incorpora un bloque de valores sin guardarlos"""
+        m = len(valores)
+        if m == 0:
+            return
+        media_bloque = float(valores.mean())
+        m2_bloque = float(np.square(valores - media_bloque).sum())
+        self._fusionar(m, float(valores.sum()), media_bloque, m2_bloque)
+
+    def agregar_momentos(self, m: int, media: float, m2: float):
+        """Incorpora un bloque ya resumido por su tamaño, su media y su suma de cuadrados centrada"""
+        if m:
+            self._fusionar(m, media * m, media, m2)
+
+    def vacio(self) -> "AcumuladorWelford":
+        """Acumulador nuevo del mismo tipo, sin muestras"""
+        return AcumuladorWelford()
+
+    def combinar(self, otro: "AcumuladorWelford"):
+        """Fusiona otro acumulador (fórmula de Chan para varianzas parciales)"""
+        if otro.n:
+            self._fusionar(otro.n, otro.suma, otro.media, otro.m2)
+
+    def _fusionar(self, n_b: int, suma_b: float, media_b: float, m2_b: float):
+        n_a = self.n
+        n_total = n_a + n_b
+        delta = media_b - self.media
+        self.media += delta * n_b / n_total
+        self.m2 += m2_b + delta * delta * n_a * n_b / n_total
+        self.suma += suma_b
+        self.n = n_total
+
+    @property
+    def varianza(self) -> float:
+        """Varianza muestral (insesgada)"""
+        return self.m2 / (self.n - 1) if self.n > 1 else 0.0
+
+    @property
+    def error_estandar(self) -> float:
+        """Error estándar de la media"""
+        return (self.varianza / self.n) ** 0.5 if self.n else 0.0
+
+
+class Reservorio:
+    """Muestra uniforme de tamaño acotado de un flujo de puntos (algoritmo R vectorizado)"""
+
+    def __init__(self, capacidad: int, dimension: int, rng: Optional[np.random.Generator] = None):
+        self.capacidad = int(capacidad)
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.coordenadas = np.empty((self.capacidad, dimension), dtype=np.float64)
+        self.valores = np.empty(self.capacidad, dtype=np.float64)
+        # Número de puntos vistos hasta ahora
+        self.vistos = 0
+
+    def agregar(self, coordenadas: np.ndarray, valores: np.ndarray):
+        """Ofrece un bloque de puntos al reservorio"""
+        m = len(valores)
+        libres = min(max(self.capacidad - self.vistos, 0), m)
+
+        # Fase de llenado: los primeros puntos se guardan tal cual
+        if libres:
+            self.coordenadas[self.vistos:self.vistos + libres] = coordenadas[:libres]
+            self.valores[self.vistos:self.vistos + libres] = valores[:libres]
+
+        # Fase de reemplazo: el punto i-ésimo sustituye a uno al azar con probabilidad k/(i+1)
+        if libres < m:
+            indices = np.arange(self.vistos + libres, self.vistos + m)
+            destino = self.rng.integers(0, indices + 1)
+            aceptados = destino < self.capacidad
+            # Con índices repetidos gana el último, igual que en el algoritmo secuencial
+            self.coordenadas[destino[aceptados]] = coordenadas[libres:][aceptados]
+            self.valores[destino[aceptados]] = valores[libres:][aceptados]
+
+        self.vistos += m
+
+    def __len__(self) -> int:
+        return min(self.vistos, self.capacidad)
+
+
+class AcumuladorReplicas:
+    """Acumula réplicas independientes (QMC aleatorizado) y estima el error a partir de su dispersión"""
+
+    def __init__(self, replicas):
+        # Acepta un número de réplicas o una lista de acumuladores ya construidos
+        if isinstance(replicas, int):
+            replicas = [AcumuladorWelford() for _ in range(replicas)]
+        self.replicas = list(replicas)
+
+    def _total(self):
+        total = self.replicas[0].vacio()
+        for replica in self.replicas:
+            total.combinar(replica)
+        return total
+
+    @property
+    def n(self) -> int:
+        return sum(replica.n for replica in self.replicas)
+
+    @property
+    def suma(self) -> float:
+        return sum(replica.suma for replica in self.replicas)
+
+    @property
+    def media(self) -> float:
+        return self._total().media
+
+    @property
+    def varianza(self) -> float:
+        """Varianza muestral de los valores individuales (informativa)"""
+        return self._total().varianza
+
+    @property
+    def error_estandar(self) -> float:
+        """Error estándar a partir de la dispersión entre las medias de las réplicas"""
+        medias = [replica.media for replica in self.replicas if replica.n]
+        if len(medias) < 2:
+            return float("inf")
+        # Con acumuladores vectoriales se obtiene un error por componente
+        return np.std(medias, axis=0, ddof=1) / np.sqrt(len(medias))
+
+
+class AcumuladorVectorial:
+    """Welford por componentes: media y varianza en línea de k integrandos a la vez (sin covarianzas)"""
+
+    __slots__ = ("n", "media", "m2")
+
+    def __init__(self, integrandos: int):
+        self.n = 0
+        self.media = np.zeros(integrandos)
+        self.m2 = np.zeros(integrandos)
+
+    def agregar(self, valores: np.ndarray):
+        """Incorpora un bloque (m, k): una columna por integrando"""
+        m = len(valores)
+        if m == 0:
+            return
+        media_bloque = valores.mean(axis=0)
+        self._fusionar(m, media_bloque, np.square(valores - media_bloque).sum(axis=0))
+
+    def vacio(self) -> "AcumuladorVectorial":
+        return AcumuladorVectorial(len(self.media))
+
+    def combinar(self, otro: "AcumuladorVectorial"):
+        if otro.n:
+            self._fusionar(otro.n, otro.media, otro.m2)
+
+    def _fusionar(self, n_b: int, media_b: np.ndarray, m2_b: np.ndarray):
+        n_a = self.n
+        n_total = n_a + n_b
+        delta = media_b - self.media
+        self.media = self.media + delta * n_b / n_total
+        self.m2 = self.m2 + m2_b + delta * delta * n_a * n_b / n_total
+        self.n = n_total
+
+    @property
+    def varianza(self) -> np.ndarray:
+        return self.m2 / (self.n - 1) if self.n > 1 else np.zeros_like(self.m2)
+
+    @property
+    def error_estandar(self) -> np.ndarray:
+        return np.sqrt(self.varianza / self.n) if self.n else np.zeros_like(self.m2)
+
+
+class AcumuladorCovarianza:
+    """Medias y co-momentos en línea de varios integrandos evaluados sobre las mismas muestras"""
+
+    __slots__ = ("n", "media", "m2")
+
+    def __init__(self, integrandos: int):
+        self.n = 0
+        self.media = np.zeros(integrandos)
+        self.m2 = np.zeros((integrandos, integrandos))
+
+    def agregar(self, valores: np.ndarray):
+        """Incorpora un bloque (m, k): una columna por integrando"""
+        m = len(valores)
+        if m == 0:
+            return
+        media_bloque = valores.mean(axis=0)
+        centrados = valores - media_bloque
+        self._fusionar(m, media_bloque, centrados.T @ centrados)
+
+    def combinar(self, otro: "AcumuladorCovarianza"):
+        """Fusiona otro acumulador (fórmula de Chan extendida a co-momentos)"""
+        if otro.n:
+            self._fusionar(otro.n, otro.media, otro.m2)
+
+    def _fusionar(self, n_b: int, media_b: np.ndarray, m2_b: np.ndarray):
+        n_a = self.n
+        n_total = n_a + n_b
+        delta = media_b - self.media
+        self.media = self.media + delta * n_b / n_total
+        self.m2 = self.m2 + m2_b + np.outer(delta, delta) * n_a * n_b / n_total
+        self.n = n_total
+
+    @property
+    def covarianza(self) -> np.ndarray:
+        """Matriz de covarianza muestral (insesgada) entre integrandos"""
+        return self.m2 / (self.n - 1) if self.n > 1 else np.zeros_like(self.m2)
+
+    @property
+    def covarianza_media(self) -> np.ndarray:
+        """Covarianza de las medias (de los estimadores)"""
+        return self.covarianza / self.n if self.n else np.zeros_like(self.m2)
+
+    @property
+    def error_estandar(self) -> np.ndarray:
+        """Error estándar de cada media"""
+        return np.sqrt(np.diag(self.covarianza_media))
+
+
+class AcumuladorReplicasCovarianza:
+    """Réplicas independientes (QMC aleatorizado) de varios integrandos; la covarianza de los
+    estimadores se obtiene de la dispersión conjunta de las medias de las réplicas"""
+
+    def __init__(self, replicas: int, integrandos: int):
+        self.replicas = [AcumuladorCovarianza(integrandos) for _ in range(replicas)]
+
+    def _total(self) -> AcumuladorCovarianza:
+        total = AcumuladorCovarianza(len(self.replicas[0].media))
+        for replica in self.replicas:
+            total.combinar(replica)
+        return total
+
+    @property
+    def n(self) -> int:
+        return sum(replica.n for replica in self.replicas)
+
+    @property
+    def media(self) -> np.ndarray:
+        return self._total().media
+
+    @property
+    def covarianza(self) -> np.ndarray:
+        """Covarianza muestral de los valores individuales (informativa)"""
+        return self._total().covarianza
+
+    @property
+    def covarianza_media(self) -> np.ndarray:
+        medias = np.array([replica.media for replica in self.replicas if replica.n])
+        if len(medias) < 2:
+            return np.full_like(self.replicas[0].m2, np.inf)
+        return np.atleast_2d(np.cov(medias, rowvar=False, ddof=1)) / len(medias)
+
+    @property
+    def error_estandar(self) -> np.ndarray:
+        return np.sqrt(np.diag(self.covarianza_media))
@@ -0,0 +1,111 @@
+import numpy as np
+from typing import Optional, Tuple
+from modelo.acumulador import Reservorio
+from modelo.seguimiento import CalculoCancelado, Seguimiento
+
+# Parámetros de MISER (Press y Farrar), ajustados para evaluar bloques vectorizados
+FRACCION_EXPLORACION = 0.1   # fracción de puntos de cada región usada para explorar la varianza
+PUNTOS_MINIMOS = 64          # puntos mínimos por mitad al explorar y al asignar
+N_MINIMO_BISECCION = 4096    # por debajo de este N la región se integra con Monte Carlo simple
+DESPLAZAMIENTO_CORTE = 0.05  # variación aleatoria del punto de corte para romper simetrías
+
+
+def integrar_miser(f, limites, n: int, rng: np.random.Generator, reservorio: Reservorio,
+                   seguimiento: Optional[Seguimiento] = None) -> Tuple[float, float, float, int]:
+    """Integración adaptativa recursiva estratificada (MISER).
+
+    Devuelve la estimación, la varianza del estimador, la varianza por muestra que tendría
+    Monte Carlo simple en el dominio completo (para calcular el factor de reducción) y el
+    número de evaluaciones realizadas. Si se cancela a través del seguimiento lanza CalculoCancelado
+    sin resultado parcial, ya que las regiones sin integrar no tienen estimación.
+    """
+    evaluaciones = 0
+
+    def f_contada(*columnas):
+        nonlocal evaluaciones
+        evaluaciones += len(columnas[0])
+        if seguimiento is not None:
+            if seguimiento.cancelado:
+                raise CalculoCancelado()
+            seguimiento.avance(evaluaciones)
+        return f(*columnas)
+
+    inferiores = np.array([lim[0] for lim in limites], dtype=float)
+    superiores = np.array([lim[1] for lim in limites], dtype=float)
+    volumen = float(np.prod(superiores - inferiores))
+
+    if n < N_MINIMO_BISECCION:
+        estimacion, varianza = _monte_carlo_simple(f_contada, inferiores, superiores - inferiores, n, rng,
+                                                   reservorio)
+        return estimacion, varianza, varianza * evaluaciones, evaluaciones
+
+    # La exploración de la región raíz también estima la varianza de Monte Carlo simple
+    n_exploracion = max(int(n * FRACCION_EXPLORACION), 2 * PUNTOS_MINIMOS)
+    puntos = inferiores + (superiores - inferiores) * rng.random((n_exploracion, len(limites)))
+    valores = f_contada(*puntos.T)
+    varianza_simple = float(np.var(volumen * valores, ddof=1)) if n_exploracion > 1 else 0.0
+
+    estimacion, varianza = _miser(f_contada, inferiores, superiores, n, rng, reservorio, puntos, valores)
+    return estimacion, varianza, varianza_simple, evaluaciones
+
+
+def _miser(f, inferiores: np.ndarray, superiores: np.ndarray, n: int, rng: np.random.Generator,
+           reservorio: Reservorio, puntos: np.ndarray = None, valores: np.ndarray = None) -> Tuple[float, float]:
+    """Integra la región [inferiores, superiores] con n evaluaciones; devuelve (estimación, varianza)"""
+    anchos = superiores - inferiores
+    dimension = len(anchos)
+
+    if n < N_MINIMO_BISECCION:
+        return _monte_carlo_simple(f, inferiores, anchos, n, rng, reservorio)
+
+    # Exploración: se evalúa una fracción de los puntos para decidir por dónde cortar
+    if puntos is None:
+        n_exploracion = max(int(n * FRACCION_EXPLORACION), 2 * PUNTOS_MINIMOS)
+        puntos = inferiores + anchos * rng.random((n_exploracion, dimension))
+        valores = f(*puntos.T)
+    n_restante = n - len(valores)
+
+    cortes = inferiores + anchos * (0.5 + rng.uniform(-DESPLAZAMIENTO_CORTE, DESPLAZAMIENTO_CORTE, dimension))
+    mejor = None
+    for j in range(dimension):
+        izquierda = puntos[:, j] < cortes[j]
+        n_izq = int(izquierda.sum())
+        if n_izq < 2 or len(valores) - n_izq < 2:
+            continue
+        sigma_izq = float(np.std(valores[izquierda], ddof=1))
+        sigma_der = float(np.std(valores[~izquierda], ddof=1))
+        # Error de la bisección con asignación óptima ∝ (σ_izq·V_izq + σ_der·V_der)²
+        fraccion = (cortes[j] - inferiores[j]) / anchos[j]
+        coste = sigma_izq * fraccion + sigma_der * (1 - fraccion)
+        if mejor is None or coste < mejor[0]:
+            mejor = (coste, j, sigma_izq * fraccion, sigma_der * (1 - fraccion))
+
+    if mejor is None or n_restante < 2 * PUNTOS_MINIMOS:
+        return _monte_carlo_simple(f, inferiores, anchos, n_restante, rng, reservorio)
+
+    _, j, peso_izq, peso_der = mejor
+    # Asignación de puntos proporcional a la desviación ponderada por el volumen de cada mitad
+    total = peso_izq + peso_der
+    proporcion = peso_izq / total if total > 0 else 0.5
+    n_izq = PUNTOS_MINIMOS + int((n_restante - 2 * PUNTOS_MINIMOS) * proporcion)
+    n_der = n_restante - n_izq
+
+    superiores_izq = superiores.copy()
+    superiores_izq[j] = cortes[j]
+    inferiores_der = inferiores.copy()
+    inferiores_der[j] = cortes[j]
+
+    estimacion_izq, varianza_izq = _miser(f, inferiores, superiores_izq, n_izq, rng, reservorio)
+    estimacion_der, varianza_der = _miser(f, inferiores_der, superiores, n_der, rng, reservorio)
+    return estimacion_izq + estimacion_der, varianza_izq + varianza_der
+
+
+def _monte_carlo_simple(f, inferiores: np.ndarray, anchos: np.ndarray, n: int, rng: np.random.Generator,
+                        reservorio: Reservorio) -> Tuple[float, float]:
+    """Monte Carlo simple en una región; devuelve (estimación, varianza del estimador)"""
+    volumen = float(np.prod(anchos))
+    n = max(n, 2)
+    puntos = inferiores + anchos * rng.random((n, len(anchos)))
+    valores = f(*puntos.T)
+    reservorio.agregar(puntos, valores)
+    return volumen * float(valores.mean()), volumen ** 2 * float(np.var(valores, ddof=1)) / n
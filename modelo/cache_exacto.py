@@ -0,0 +1,141 @@
+import os
+import sqlite3
+import sys
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Tuple
+
+# Se incrementa si cambia el formato de lo guardado, para no leer entradas antiguas
+VERSION_CACHE = 1
+
+
+def directorio_cache() -> Path:
+    """Directorio de caché del usuario para el programa (MONTECARLO_CACHE_DIR lo sustituye)"""
+    if os.environ.get("MONTECARLO_CACHE_DIR"):
+        return Path(os.environ["MONTECARLO_CACHE_DIR"])
+    if sys.platform == "win32":
+        base = Path(os.environ.get("LOCALAPPDATA", Path.home() / "AppData" / "Local"))
+    elif sys.platform == "darwin":
+        base = Path.home() / "Library" / "Caches"
+    else:
+        base = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache"))
+    return base / "montecarlo"
+
+
+class MemoriaLRU:
+    """Diccionario acotado que descarta la entrada usada hace más tiempo"""
+
+    def __init__(self, capacidad: int):
+        self.capacidad = capacidad
+        self.datos = OrderedDict()
+
+    def obtener(self, clave) -> Tuple[bool, object]:
+        if clave not in self.datos:
+            return False, None
+        self.datos.move_to_end(clave)
+        return True, self.datos[clave]
+
+    def guardar(self, clave, valor):
+        self.datos[clave] = valor
+        self.datos.move_to_end(clave)
+        while len(self.datos) > self.capacidad:
+            self.datos.popitem(last=False)
+
+
+class CacheIntegrales:
+    """Memoriza integrales exactas y primitivas: LRU en memoria respaldado por SQLite en disco.
+
+    Las claves son la expresión SymPy normalizada (srepr). Un valor None también se guarda: indica
+    que no hay resultado exacto y evita repetir un cálculo simbólico que ya falló.
+    Si el archivo no se puede abrir, la caché funciona solo en memoria.
+    """
+
+    CAPACIDAD_MEMORIA = 256
+    _compartida = None
+
+    def __init__(self, ruta: Optional[os.PathLike] = None, capacidad: int = CAPACIDAD_MEMORIA):
+        self._valores = MemoriaLRU(capacidad)
+        self._primitivas = MemoriaLRU(capacidad)
+        # La caché se usa desde el hilo de cálculo: una única conexión protegida por un cerrojo
+        self._cerrojo = threading.Lock()
+        self._conexion = None
+        if ruta is None:
+            ruta = directorio_cache() / f"integrales-v{VERSION_CACHE}.sqlite"
+        self.ruta = Path(ruta)
+        try:
+            self.ruta.parent.mkdir(parents=True, exist_ok=True)
+            self._conexion = sqlite3.connect(str(self.ruta), check_same_thread=False)
+            with self._conexion:
+                self._conexion.execute("CREATE TABLE IF NOT EXISTS valores ("
+                                       "expresion TEXT, a REAL, b REAL, valor REAL, PRIMARY KEY (expresion, a, b))")
+                self._conexion.execute("CREATE TABLE IF NOT EXISTS primitivas ("
+                                       "expresion TEXT PRIMARY KEY, primitiva TEXT)")
+        except (OSError, sqlite3.Error):
+            self._conexion = None
+
+    @classmethod
+    def compartida(cls) -> "CacheIntegrales":
+        """Instancia única usada por defecto, creada la primera vez que se necesita"""
+        if cls._compartida is None:
+            cls._compartida = cls()
+        return cls._compartida
+
+    def valor(self, expresion: str, a: float, b: float) -> Tuple[bool, Optional[float]]:
+        """Devuelve (encontrado, valor) para la integral definida de la expresión en [a, b]"""
+        clave = (expresion, float(a), float(b))
+        with self._cerrojo:
+            encontrado, valor = self._valores.obtener(clave)
+            if not encontrado:
+                fila = self._consultar("SELECT valor FROM valores WHERE expresion = ? AND a = ? AND b = ?", clave)
+                if fila is not None:
+                    encontrado, valor = True, fila[0]
+                    self._valores.guardar(clave, valor)
+        return encontrado, valor
+
+    def guardar_valor(self, expresion: str, a: float, b: float, valor: Optional[float]):
+        clave = (expresion, float(a), float(b))
+        with self._cerrojo:
+            self._valores.guardar(clave, valor)
+            self._escribir("INSERT OR REPLACE INTO valores VALUES (?, ?, ?, ?)", clave + (valor,))
+
+    def primitiva(self, expresion: str) -> Tuple[bool, Optional[str]]:
+        """Devuelve (encontrada, primitiva en srepr) de la expresión; None si no tiene forma cerrada"""
+        with self._cerrojo:
+            encontrada, primitiva = self._primitivas.obtener(expresion)
+            if not encontrada:
+                fila = self._consultar("SELECT primitiva FROM primitivas WHERE expresion = ?", (expresion,))
+                if fila is not None:
+                    encontrada, primitiva = True, fila[0]
+                    self._primitivas.guardar(expresion, primitiva)
+        return encontrada, primitiva
+
+    def guardar_primitiva(self, expresion: str, primitiva: Optional[str]):
+        with self._cerrojo:
+            self._primitivas.guardar(expresion, primitiva)
+            self._escribir("INSERT OR REPLACE INTO primitivas VALUES (?, ?)", (expresion, primitiva))
+
+    def cerrar(self):
+        """Cierra el archivo en disco; la caché sigue funcionando solo en memoria"""
+        with self._cerrojo:
+            if self._conexion is not None:
+                self._conexion.close()
+                self._conexion = None
+
+    def _consultar(self, sql: str, parametros):
+        if self._conexion is None:
+            return None
+        try:
+            return self._conexion.execute(sql, parametros).fetchone()
+        except sqlite3.Error:
+            return None
+
+    def _escribir(self, sql: str, parametros):
+        if self._conexion is None:
+            return
+        try:
+            with self._conexion:
+                self._conexion.execute(sql, parametros)
+        except sqlite3.Error:
+            # Un fallo de disco no debe impedir el cálculo: se sigue con la memoria
+            pass
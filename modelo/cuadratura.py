@@ -0,0 +1,138 @@
+import numpy as np
+from typing import Tuple
+
+# Regla de Gauss–Kronrod de 15 nodos con la de Gauss de 7 nodos embebida (QUADPACK, QK15)
+_NODOS_POSITIVOS = np.array([
+    0.991455371120812639206854697526329, 0.949107912342758524526189684047851,
+    0.864864423359769072789712788640926, 0.741531185599394439863864773280788,
+    0.586087235467691130294144845693013, 0.405845151377397166906606412076961,
+    0.207784955007898467600689403773245,
+])
+_PESOS_KRONROD_POSITIVOS = np.array([
+    0.022935322010529224963732008058970, 0.063092092629978553290700663189204,
+    0.104790010322250183839876322541518, 0.140653259715525918745189590510238,
+    0.169004726639267902826583426598550, 0.190350578064785409913256402421014,
+    0.204432940075298892414161999234649,
+])
+_PESO_KRONROD_CENTRAL = 0.209482141084727828012999174891714
+_PESOS_GAUSS_POSITIVOS = np.array([
+    0.129484966168869693270611432679082, 0.279705391489276667901467771423780,
+    0.381830050505118944950369775488975,
+])
+_PESO_GAUSS_CENTRAL = 0.417959183673469387755102040816327
+
+# Nodos en [-1, 1] ordenados y pesos de ambas reglas (los de Gauss son 0 en los nodos solo de Kronrod)
+NODOS = np.concatenate([-_NODOS_POSITIVOS, [0.0], _NODOS_POSITIVOS[::-1]])
+PESOS_KRONROD = np.concatenate([_PESOS_KRONROD_POSITIVOS, [_PESO_KRONROD_CENTRAL], _PESOS_KRONROD_POSITIVOS[::-1]])
+PESOS_GAUSS = np.zeros(15)
+PESOS_GAUSS[1:7:2] = _PESOS_GAUSS_POSITIVOS
+PESOS_GAUSS[7] = _PESO_GAUSS_CENTRAL
+PESOS_GAUSS[9:15:2] = _PESOS_GAUSS_POSITIVOS[::-1]
+
+# Tolerancias por defecto y máximo de subdivisiones (intervalos en 1D, rectángulos en 2D)
+TOLERANCIA_ABS = 1e-10
+TOLERANCIA_REL = 1e-10
+MAXIMO_REGIONES_1D = 2_000
+MAXIMO_REGIONES_2D = 1_000
+
+
+def integrar_gauss_kronrod(f, a: float, b: float, tolerancia_abs: float = TOLERANCIA_ABS,
+                           tolerancia_rel: float = TOLERANCIA_REL,
+                           maximo_regiones: int = MAXIMO_REGIONES_1D) -> Tuple[float, float]:
+    """Cuadratura adaptativa global de Gauss–Kronrod (7-15) en [a, b]; devuelve (valor, error estimado).
+
+    En cada ronda se evalúan vectorizados todos los intervalos que se subdividen.
+    """
+    inferiores = np.array([a], dtype=float)
+    superiores = np.array([b], dtype=float)
+    valores, errores = _reglas_1d(f, inferiores, superiores)
+    while True:
+        total = float(valores.sum())
+        error = float(errores.sum())
+        if error <= max(tolerancia_abs, tolerancia_rel * abs(total)) or len(valores) >= maximo_regiones:
+            return total, error
+        marcados = _a_subdividir(errores, max(tolerancia_abs, tolerancia_rel * abs(total)),
+                                 maximo_regiones - len(valores))
+        medios = 0.5 * (inferiores[marcados] + superiores[marcados])
+        nuevos_inf = np.concatenate([inferiores[marcados], medios])
+        nuevos_sup = np.concatenate([medios, superiores[marcados]])
+        nuevos_valores, nuevos_errores = _reglas_1d(f, nuevos_inf, nuevos_sup)
+
+        conservados = np.ones(len(valores), dtype=bool)
+        conservados[marcados] = False
+        inferiores = np.concatenate([inferiores[conservados], nuevos_inf])
+        superiores = np.concatenate([superiores[conservados], nuevos_sup])
+        valores = np.concatenate([valores[conservados], nuevos_valores])
+        errores = np.concatenate([errores[conservados], nuevos_errores])
+
+
+def integrar_cubatura_2d(f, ax: float, bx: float, cy: float, dy: float, tolerancia_abs: float = TOLERANCIA_ABS,
+                         tolerancia_rel: float = TOLERANCIA_REL,
+                         maximo_regiones: int = MAXIMO_REGIONES_2D) -> Tuple[float, float]:
+    """Cubatura adaptativa con el producto tensorial de Gauss–Kronrod en cada rectángulo.
+
+    Cada rectángulo se parte por la mitad en el eje cuyo error estimado es mayor.
+    Devuelve (valor, error estimado).
+    """
+    rectangulos = np.array([[ax, bx, cy, dy]], dtype=float)
+    valores, errores_x, errores_y = _reglas_2d(f, rectangulos)
+    while True:
+        errores = errores_x + errores_y
+        total = float(valores.sum())
+        error = float(errores.sum())
+        if error <= max(tolerancia_abs, tolerancia_rel * abs(total)) or len(valores) >= maximo_regiones:
+            return total, error
+        marcados = _a_subdividir(errores, max(tolerancia_abs, tolerancia_rel * abs(total)),
+                                 maximo_regiones - len(valores))
+        padres = rectangulos[marcados]
+        en_x = errores_x[marcados] >= errores_y[marcados]
+        primeros, segundos = padres.copy(), padres.copy()
+        medios_x = 0.5 * (padres[:, 0] + padres[:, 1])
+        medios_y = 0.5 * (padres[:, 2] + padres[:, 3])
+        primeros[en_x, 1] = segundos[en_x, 0] = medios_x[en_x]
+        primeros[~en_x, 3] = segundos[~en_x, 2] = medios_y[~en_x]
+        nuevos = np.concatenate([primeros, segundos])
+        nuevos_valores, nuevos_x, nuevos_y = _reglas_2d(f, nuevos)
+
+        conservados = np.ones(len(valores), dtype=bool)
+        conservados[marcados] = False
+        rectangulos = np.concatenate([rectangulos[conservados], nuevos])
+        valores = np.concatenate([valores[conservados], nuevos_valores])
+        errores_x = np.concatenate([errores_x[conservados], nuevos_x])
+        errores_y = np.concatenate([errores_y[conservados], nuevos_y])
+
+
+def _a_subdividir(errores: np.ndarray, tolerancia: float, disponibles: int) -> np.ndarray:
+    """Regiones de mayor error cuya subdivisión bastaría para bajar de la tolerancia"""
+    orden = np.argsort(errores)[::-1]
+    restante = errores.sum() - np.cumsum(errores[orden])
+    cuantos = int(np.searchsorted(-restante, -tolerancia)) + 1
+    # Sin superar el máximo de regiones: cada subdivisión añade una
+    return orden[:max(1, min(cuantos, disponibles))]
+
+
+def _reglas_1d(f, inferiores: np.ndarray, superiores: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Valor de Kronrod y diferencia con Gauss en cada intervalo"""
+    centros = 0.5 * (inferiores + superiores)[:, None]
+    semianchos = 0.5 * (superiores - inferiores)[:, None]
+    fx = f(centros + semianchos * NODOS)
+    kronrod = semianchos[:, 0] * (fx @ PESOS_KRONROD)
+    gauss = semianchos[:, 0] * (fx @ PESOS_GAUSS)
+    return kronrod, np.abs(kronrod - gauss)
+
+
+def _reglas_2d(f, rectangulos: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Valor Kronrod×Kronrod y errores por eje (sustituyendo Kronrod por Gauss en cada uno)"""
+    centros_x = 0.5 * (rectangulos[:, 0] + rectangulos[:, 1])[:, None, None]
+    semianchos_x = 0.5 * (rectangulos[:, 1] - rectangulos[:, 0])[:, None, None]
+    centros_y = 0.5 * (rectangulos[:, 2] + rectangulos[:, 3])[:, None, None]
+    semianchos_y = 0.5 * (rectangulos[:, 3] - rectangulos[:, 2])[:, None, None]
+    # Malla de 15×15 nodos por rectángulo: eje 1 para x, eje 2 para y
+    fxy = f(centros_x + semianchos_x * NODOS[None, :, None], centros_y + semianchos_y * NODOS[None, None, :])
+    fxy = np.broadcast_to(fxy, (len(rectangulos), 15, 15))
+    jacobiano = (semianchos_x * semianchos_y)[:, 0, 0]
+    en_y_kronrod = fxy @ PESOS_KRONROD
+    kk = jacobiano * (en_y_kronrod @ PESOS_KRONROD)
+    gk = jacobiano * (en_y_kronrod @ PESOS_GAUSS)
+    kg = jacobiano * ((fxy @ PESOS_GAUSS) @ PESOS_KRONROD)
+    return kk, np.abs(kk - gk), np.abs(kk - kg)
@@ -0,0 +1,82 @@
+import math
+import numpy as np
+from types import SimpleNamespace
+from typing import Callable, Sequence
+
+
+def _log(x, base=None):
+    """Logaritmo natural o en la base indicada (como math.log)"""
+    if base is None:
+        return np.log(x)
+    return np.log(x) / np.log(base)
+
+
+# Equivalentes vectorizados de las funciones del módulo math
+MATH_VECTORIZADO = SimpleNamespace(
+    # Trigonométricas
+    sin=np.sin, cos=np.cos, tan=np.tan,
+    asin=np.arcsin, acos=np.arccos, atan=np.arctan, atan2=np.arctan2,
+    # Hiperbólicas
+    sinh=np.sinh, cosh=np.cosh, tanh=np.tanh,
+    asinh=np.arcsinh, acosh=np.arccosh, atanh=np.arctanh,
+    # Exponencial y logarítmica
+    exp=np.exp, expm1=np.expm1, log=_log, log10=np.log10, log2=np.log2, log1p=np.log1p,
+    # Potencias y redondeo
+    sqrt=np.sqrt, pow=np.power, hypot=np.hypot, fabs=np.fabs,
+    floor=np.floor, ceil=np.ceil, trunc=np.trunc,
+    degrees=np.degrees, radians=np.radians,
+    # Constantes
+    pi=math.pi, e=math.e, tau=math.tau, inf=math.inf,
+)
+
+
+def compilar_funcion(func_str: str, variables: Sequence[str] = ("x",)) -> Callable[..., np.ndarray]:
+    """Compila la función una sola vez en un callable que opera sobre arrays de NumPy"""
+    codigo = compile(func_str, "<función>", "eval")
+    variables = tuple(variables)
+
+    # Entornos de evaluación: primero sin builtins, luego con ellos (igual que el cálculo escalar)
+    entornos_vectoriales = [
+        {"math": MATH_VECTORIZADO, "np": np, "__builtins__": {}},
+        {"math": MATH_VECTORIZADO, "np": np},
+    ]
+
+    def evaluar_escalar(*valores):
+        entorno = dict(zip(variables, (float(v) for v in valores)))
+        try:
+            return float(eval(codigo, {**entorno, "math": math, "np": np, "__builtins__": {}}))
+        except Exception:
+            try:
+                return float(eval(codigo, {**entorno, "math": math, "np": np}))
+            except Exception:
+                return 0.0
+
+    evaluar_por_elemento = np.frompyfunc(evaluar_escalar, len(variables), 1)
+
+    # Se recuerda qué modo de evaluación funcionó para no repetir intentos fallidos
+    estado = {"modo": 0}
+
+    def funcion(*valores: np.ndarray) -> np.ndarray:
+        valores = [np.asarray(v, dtype=float) for v in valores]
+        forma = np.broadcast(*valores).shape if valores else ()
+
+        resultado = None
+        with np.errstate(all="ignore"):
+            while resultado is None and estado["modo"] < len(entornos_vectoriales):
+                entorno = dict(entornos_vectoriales[estado["modo"]])
+                entorno.update(zip(variables, valores))
+                try:
+                    resultado = np.asarray(eval(codigo, entorno), dtype=float)
+                except Exception:
+                    estado["modo"] += 1
+
+            if resultado is None:
+                # La expresión no admite arrays (p. ej. 'x if x > 0 else 0'): se evalúa punto a punto
+                resultado = np.asarray(evaluar_por_elemento(*valores), dtype=float)
+
+        resultado = np.array(np.broadcast_to(resultado, forma), dtype=float)
+        # Los puntos donde la función no está definida cuentan como 0
+        resultado[~np.isfinite(resultado)] = 0.0
+        return resultado
+
+    return funcion
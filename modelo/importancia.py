@@ -0,0 +1,286 @@
+import math
+import numpy as np
+from statistics import NormalDist
+from typing import Dict, Sequence, Type
+from modelo.funciones import compilar_funcion
+from modelo.reduccion import Reduccion
+
+# Coeficientes de la aproximación racional de Acklam para la inversa de la CDF normal
+_ACKLAM_A = (-3.969683028665376e+01, 2.209460984245205e+02, -2.759285104469687e+02,
+             1.383577518672690e+02, -3.066479806614716e+01, 2.506628277459239e+00)
+_ACKLAM_B = (-5.447609879822406e+01, 1.615858368580409e+02, -1.556989798598866e+02,
+             6.680131188771972e+01, -1.328068155288572e+01)
+_ACKLAM_C = (-7.784894002430293e-03, -3.223964580411365e-01, -2.400758277161838e+00,
+             -2.549732539343734e+00, 4.374664141464968e+00, 2.938163982698783e+00)
+_ACKLAM_D = (7.784695709041462e-03, 3.224671290700398e-01, 2.445134137142996e+00,
+             3.754408661907416e+00)
+_ACKLAM_P_BAJO = 0.02425
+
+
+class Propuesta:
+    """Densidad de propuesta en un intervalo [a, b], muestreada de forma vectorizada"""
+
+    nombre = ""
+    # La propuesta es función de los uniformes u (inversa de la CDF): vale con muestreo cuasi-aleatorio
+    por_inversion = True
+
+    def preparar(self, a: float, b: float):
+        """Fija el intervalo en el que se trunca la propuesta"""
+        self.a, self.b = float(a), float(b)
+
+    def muestrear(self, u: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        """Transforma uniformes u en [0,1) en puntos de la propuesta (inversa de la CDF)"""
+        raise NotImplementedError
+
+    def densidad(self, x: np.ndarray) -> np.ndarray:
+        raise NotImplementedError
+
+    @property
+    def descripcion(self) -> str:
+        return self.nombre
+
+
+class PropuestaUniforme(Propuesta):
+    """Densidad uniforme (equivale a Monte Carlo simple en ese eje)"""
+
+    nombre = "uniforme"
+
+    def muestrear(self, u, rng):
+        return self.a + (self.b - self.a) * u
+
+    def densidad(self, x):
+        return np.full(len(x), 1.0 / (self.b - self.a))
+
+
+class PropuestaNormalTruncada(Propuesta):
+    """Normal N(μ, σ²) truncada al intervalo"""
+
+    nombre = "normal truncada"
+
+    def __init__(self, mu: float, sigma: float):
+        if sigma <= 0:
+            raise ValueError("La desviación σ de la normal debe ser positiva")
+        self.mu, self.sigma = float(mu), float(sigma)
+
+    def preparar(self, a, b):
+        super().preparar(a, b)
+        normal = NormalDist(self.mu, self.sigma)
+        self.cdf_a, self.cdf_b = normal.cdf(a), normal.cdf(b)
+        if self.cdf_b - self.cdf_a <= 0:
+            raise ValueError("La normal truncada no tiene masa en el intervalo")
+
+    def muestrear(self, u, rng):
+        p = self.cdf_a + (self.cdf_b - self.cdf_a) * u
+        x = self.mu + self.sigma * _inversa_normal(p)
+        return np.clip(x, self.a, self.b)
+
+    def densidad(self, x):
+        z = (x - self.mu) / self.sigma
+        return np.exp(-0.5 * z * z) / (self.sigma * math.sqrt(2 * math.pi) * (self.cdf_b - self.cdf_a))
+
+    @property
+    def descripcion(self):
+        return f"normal truncada(μ={self.mu:g}, σ={self.sigma:g})"
+
+
+class PropuestaExponencial(Propuesta):
+    """Exponencial de tasa λ desde el extremo a, truncada en b (λ < 0 concentra la masa en b)"""
+
+    nombre = "exponencial"
+
+    def __init__(self, tasa: float):
+        if tasa == 0:
+            raise ValueError("La tasa λ de la exponencial no puede ser 0")
+        self.tasa = float(tasa)
+
+    def preparar(self, a, b):
+        super().preparar(a, b)
+        # Masa total de exp(-λ(x-a)) en [a, b], sin λ
+        self.masa = -math.expm1(-self.tasa * (b - a))
+
+    def muestrear(self, u, rng):
+        x = self.a - np.log1p(-u * self.masa) / self.tasa
+        return np.clip(x, self.a, self.b)
+
+    def densidad(self, x):
+        return self.tasa * np.exp(-self.tasa * (x - self.a)) / self.masa
+
+    @property
+    def descripcion(self):
+        return f"exponencial(λ={self.tasa:g})"
+
+
+class PropuestaBeta(Propuesta):
+    """Beta(α, β) reescalada al intervalo"""
+
+    nombre = "beta"
+    por_inversion = False
+
+    def __init__(self, alfa: float, beta: float):
+        if alfa <= 0 or beta <= 0:
+            raise ValueError("Los parámetros α y β de la beta deben ser positivos")
+        self.alfa, self.beta = float(alfa), float(beta)
+        self.log_beta = math.lgamma(alfa) + math.lgamma(beta) - math.lgamma(alfa + beta)
+
+    def muestrear(self, u, rng):
+        # La beta no tiene inversa de la CDF cerrada: se usa directamente el generador (por eso se
+        # rechaza con muestreo cuasi-aleatorio, cuyos puntos no llegarían a este eje)
+        return self.a + (self.b - self.a) * rng.beta(self.alfa, self.beta, len(u))
+
+    def densidad(self, x):
+        ancho = self.b - self.a
+        t = (x - self.a) / ancho
+        with np.errstate(divide="ignore", invalid="ignore"):
+            log_p = (self.alfa - 1) * np.log(t) + (self.beta - 1) * np.log1p(-t) - self.log_beta
+        return np.exp(log_p) / ancho
+
+    @property
+    def descripcion(self):
+        return f"beta(α={self.alfa:g}, β={self.beta:g})"
+
+
+class PropuestaPotencia(Propuesta):
+    """Ley de potencia p(x) ∝ (x-a)^(α-1); con α < 1 se concentra en una singularidad en a"""
+
+    nombre = "potencia"
+
+    def __init__(self, alfa: float):
+        if alfa <= 0:
+            raise ValueError("El exponente α de la ley de potencia debe ser positivo")
+        self.alfa = float(alfa)
+
+    def muestrear(self, u, rng):
+        return self.a + (self.b - self.a) * u ** (1.0 / self.alfa)
+
+    def densidad(self, x):
+        ancho = self.b - self.a
+        with np.errstate(divide="ignore"):
+            return self.alfa * (x - self.a) ** (self.alfa - 1) / ancho ** self.alfa
+
+    @property
+    def descripcion(self):
+        return f"potencia(α={self.alfa:g})"
+
+
+class PropuestaPersonalizada(Propuesta):
+    """Densidad dada por el usuario junto con la expresión de su inversa de la CDF en u"""
+
+    nombre = "personalizada"
+
+    def __init__(self, densidad_str: str, inversa_str: str, variable: str = "x"):
+        self.densidad_str = densidad_str
+        self.inversa_str = inversa_str
+        self.variable = variable
+        self._densidad = compilar_funcion(densidad_str, (variable,))
+        self._inversa = compilar_funcion(inversa_str, ("u",))
+
+    def muestrear(self, u, rng):
+        x = self._inversa(u)
+        # Un redondeo en los extremos se tolera; un punto fuera de [a, b] indica una inversa errónea
+        holgura = 1e-12 * (self.b - self.a)
+        fuera = ~((x >= self.a - holgura) & (x <= self.b + holgura))
+        if fuera.any():
+            raise ValueError(f"La inversa F⁻¹(u) = {self.inversa_str} da {x[fuera][0]:g} para "
+                             f"u = {u[fuera][0]:g}, fuera de [{self.a:g}, {self.b:g}] en {self.variable}")
+        return np.clip(x, self.a, self.b)
+
+    def densidad(self, x):
+        return self._densidad(x)
+
+    def __getstate__(self):
+        # Las funciones compiladas no se serializan; se recompilan en cada proceso
+        return {k: v for k, v in self.__dict__.items() if k not in ("_densidad", "_inversa")}
+
+    def __setstate__(self, estado):
+        self.__init__(estado["densidad_str"], estado["inversa_str"], estado["variable"])
+        self.__dict__.update(estado)
+
+    @property
+    def descripcion(self):
+        return f"p({self.variable}) = {self.densidad_str}"
+
+
+PROPUESTAS: Dict[str, Type[Propuesta]] = {
+    "uniforme": PropuestaUniforme,
+    "normal": PropuestaNormalTruncada,
+    "exponencial": PropuestaExponencial,
+    "beta": PropuestaBeta,
+    "potencia": PropuestaPotencia,
+    "personalizada": PropuestaPersonalizada,
+}
+
+
+def crear_propuesta(nombre: str, *parametros) -> Propuesta:
+    """Crea una propuesta por nombre con sus parámetros (p. ej. 'normal', 0.5, 0.1)"""
+    try:
+        clase = PROPUESTAS[nombre]
+    except KeyError:
+        raise ValueError(f"Propuesta desconocida: {nombre}") from None
+    try:
+        return clase(*parametros)
+    except TypeError:
+        raise ValueError(f"Número de parámetros incorrecto para la propuesta {nombre}") from None
+
+
+class MuestreoImportancia(Reduccion):
+    """Muestreo por importancia con una propuesta producto (una densidad por eje)"""
+
+    def __init__(self, propuestas: Sequence[Propuesta]):
+        self.propuestas = list(propuestas)
+
+    @property
+    def nombre(self) -> str:
+        return "muestreo por importancia (" + " × ".join(p.descripcion for p in self.propuestas) + ")"
+
+    def preparar(self, variables, limites):
+        if len(self.propuestas) != len(limites):
+            raise ValueError("Debe indicarse una propuesta por cada variable de integración")
+        for propuesta, (a, b) in zip(self.propuestas, limites):
+            propuesta.preparar(a, b)
+        self._inferiores = np.array([a for a, _ in limites], dtype=float)
+        self._anchos = np.array([b - a for a, b in limites], dtype=float)
+        self._volumen = float(np.prod(self._anchos))
+
+    def generar(self, muestreador, m, acumulador):
+        if muestreador.cuasi_aleatorio:
+            sin_inversion = [p.descripcion for p in self.propuestas if not p.por_inversion]
+            if sin_inversion:
+                raise ValueError(f"La propuesta {sin_inversion[0]} usa su propio generador y no admite "
+                                 f"el muestreo {muestreador.nombre}: elija muestreo pseudoaleatorio")
+        u = muestreador.generar(m)
+        x = np.column_stack([p.muestrear(u[:, j], muestreador.rng) for j, p in enumerate(self.propuestas)])
+        # El motor vuelve a escalar al dominio: se devuelven coordenadas relativas
+        return (x - self._inferiores) / self._anchos
+
+    def agregar(self, acumulador, u, puntos, valores):
+        densidad = np.ones(len(puntos))
+        for j, propuesta in enumerate(self.propuestas):
+            densidad *= propuesta.densidad(puntos[:, j])
+        # Peso f/p; los valores llegan multiplicados por el volumen
+        with np.errstate(divide="ignore", invalid="ignore"):
+            pesos = valores / (self._volumen * densidad)
+        pesos[~np.isfinite(pesos) | (densidad <= 0)] = 0.0
+        acumulador.agregar(pesos)
+
+
+def _inversa_normal(p: np.ndarray) -> np.ndarray:
+    """Inversa de la CDF normal estándar (Acklam, error relativo < 1.2e-9)"""
+    p = np.clip(p, 1e-300, 1 - 1e-16)
+    x = np.empty_like(p)
+
+    bajo = p < _ACKLAM_P_BAJO
+    alto = p > 1 - _ACKLAM_P_BAJO
+    centro = ~(bajo | alto)
+
+    q = p[centro] - 0.5
+    r = q * q
+    a, b = _ACKLAM_A, _ACKLAM_B
+    x[centro] = ((((((a[0] * r + a[1]) * r + a[2]) * r + a[3]) * r + a[4]) * r + a[5]) * q /
+                 (((((b[0] * r + b[1]) * r + b[2]) * r + b[3]) * r + b[4]) * r + 1))
+
+    c, d = _ACKLAM_C, _ACKLAM_D
+    for mascara, signo, cola in ((bajo, 1.0, p[bajo]), (alto, -1.0, 1 - p[alto])):
+        q = np.sqrt(-2 * np.log(cola))
+        x[mascara] = signo * ((((((c[0] * q + c[1]) * q + c[2]) * q + c[3]) * q + c[4]) * q + c[5]) /
+                              ((((d[0] * q + d[1]) * q + d[2]) * q + d[3]) * q + 1))
+    return x
@@ -0,0 +1,168 @@
+import cProfile
+import csv
+import io
+import json
+import os
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from typing import Dict, List, Optional
+
+# Funciones mostradas del perfil de cProfile, ordenadas por tiempo acumulado
+FUNCIONES_PERFIL = 15
+# Columnas del registro en CSV (una fila por etapa)
+COLUMNAS_REGISTRO = ("fecha", "funcion", "dimension", "n", "etapa", "nivel", "llamadas", "tiempo_s",
+                     "muestras", "muestras_por_s", "memoria_pico_mb")
+
+
+class Etapa:
+    """Totales de una etapa medida: tiempo de pared, llamadas, muestras y memoria pico"""
+
+    __slots__ = ("nombre", "nivel", "tiempo", "llamadas", "muestras", "memoria_pico")
+
+    def __init__(self, nombre: str, nivel: int):
+        self.nombre = nombre
+        self.nivel = nivel
+        self.tiempo = 0.0
+        self.llamadas = 0
+        self.muestras = 0
+        self.memoria_pico = None
+
+    @property
+    def muestras_por_segundo(self) -> Optional[float]:
+        return self.muestras / self.tiempo if self.muestras and self.tiempo > 0 else None
+
+    def como_diccionario(self) -> dict:
+        return {"etapa": self.nombre, "nivel": self.nivel, "llamadas": self.llamadas, "tiempo_s": self.tiempo,
+                "muestras": self.muestras or None, "muestras_por_s": self.muestras_por_segundo,
+                "memoria_pico_mb": self.memoria_pico / 2**20 if self.memoria_pico is not None else None}
+
+
+class Instrumentacion:
+    """Mide el tiempo de cada etapa de un cálculo y, si se pide, su memoria y un perfil de cProfile.
+
+    Las etapas se anidan: una etapa abierta dentro de otra queda un nivel por debajo. Las llamadas
+    repetidas a una misma etapa (un bloque de muestras tras otro) se suman. La memoria es el pico
+    reservado durante la etapa según tracemalloc, que cuenta todo el proceso y ralentiza el cálculo,
+    por eso es opcional.
+    """
+
+    def __init__(self, memoria: bool = False, perfil: bool = False, registro: Optional[str] = None):
+        self.memoria = memoria
+        self.registro = registro
+        self.etapas: Dict[str, Etapa] = {}
+        self.perfil = cProfile.Profile() if perfil else None
+        self._nivel = 0
+        self._abiertas: List[list] = []
+        self._inicio_memoria = False
+
+    @contextmanager
+    def medir(self, nombre: str, muestras: int = 0):
+        """Suma a la etapa `nombre` el tiempo (y las muestras) de lo ejecutado dentro del bloque"""
+        etapa = self.etapas.get(nombre)
+        if etapa is None:
+            etapa = self.etapas[nombre] = Etapa(nombre, self._nivel)
+        marca = self._entrar_memoria() if self.memoria else None
+        self._nivel += 1
+        inicio = time.perf_counter()
+        try:
+            yield etapa
+        finally:
+            etapa.tiempo += time.perf_counter() - inicio
+            self._nivel -= 1
+            etapa.llamadas += 1
+            etapa.muestras += muestras
+            if marca is not None:
+                pico = self._salir_memoria(marca)
+                etapa.memoria_pico = pico if etapa.memoria_pico is None else max(etapa.memoria_pico, pico)
+
+    def _entrar_memoria(self) -> list:
+        """Abre una medida de memoria; el pico se reinicia, así que se pasa antes a la etapa exterior"""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._inicio_memoria = True
+        actual, pico = tracemalloc.get_traced_memory()
+        if self._abiertas:
+            self._abiertas[-1][1] = max(self._abiertas[-1][1], pico)
+        tracemalloc.reset_peak()
+        marca = [actual, actual]
+        self._abiertas.append(marca)
+        return marca
+
+    def _salir_memoria(self, marca: list) -> int:
+        """Cierra la medida y devuelve los bytes reservados por encima de los que había al entrar"""
+        pico = max(marca[1], tracemalloc.get_traced_memory()[1])
+        self._abiertas.pop()
+        if self._abiertas:
+            self._abiertas[-1][1] = max(self._abiertas[-1][1], pico)
+        elif self._inicio_memoria:
+            tracemalloc.stop()
+            self._inicio_memoria = False
+        return pico - marca[0]
+
+    @contextmanager
+    def perfilar(self):
+        """Activa cProfile (si se pidió) en el hilo actual durante el bloque"""
+        if self.perfil is None:
+            yield
+            return
+        self.perfil.enable()
+        try:
+            yield
+        finally:
+            self.perfil.disable()
+
+    @property
+    def total(self) -> float:
+        """Tiempo de las etapas de primer nivel"""
+        return sum(etapa.tiempo for etapa in self.etapas.values() if etapa.nivel == 0)
+
+    def texto_perfil(self, funciones: int = FUNCIONES_PERFIL) -> str:
+        """Las funciones con más tiempo acumulado según cProfile, como texto de pstats"""
+        if self.perfil is None:
+            return ""
+        salida = io.StringIO()
+        estadisticas = pstats.Stats(self.perfil, stream=salida)
+        estadisticas.strip_dirs().sort_stats("cumulative").print_stats(funciones)
+        return salida.getvalue()
+
+    def exportar(self, contexto: dict, ruta: Optional[str] = None) -> str:
+        """Añade las etapas al registro: filas en CSV o un objeto por línea (JSON Lines) en otro caso.
+
+        Con perfil, lo guarda además junto al registro en formato de pstats (.prof). Devuelve la ruta.
+        """
+        ruta = ruta or self.registro
+        fecha = datetime.now().isoformat(timespec="seconds")
+        filas = [etapa.como_diccionario() for etapa in self.etapas.values()]
+        if ruta.lower().endswith(".csv"):
+            nuevo = not os.path.exists(ruta) or os.path.getsize(ruta) == 0
+            with open(ruta, "a", encoding="utf-8", newline="") as archivo:
+                escritor = csv.DictWriter(archivo, fieldnames=COLUMNAS_REGISTRO)
+                if nuevo:
+                    escritor.writeheader()
+                for fila in filas:
+                    escritor.writerow(dict(fila, fecha=fecha, **contexto))
+        else:
+            with open(ruta, "a", encoding="utf-8") as archivo:
+                archivo.write(json.dumps(dict(contexto, fecha=fecha, total_s=self.total, etapas=filas),
+                                         ensure_ascii=False) + "\n")
+        if self.perfil is not None:
+            self.perfil.dump_stats(f"{os.path.splitext(ruta)[0]}-{datetime.now():%Y%m%d-%H%M%S}.prof")
+        return ruta
+
+
+class _SinInstrumentacion:
+    """Sustituto sin coste cuando no se mide nada"""
+
+    _vacio = nullcontext()
+
+    def medir(self, nombre: str, muestras: int = 0):
+        return self._vacio
+
+    def perfilar(self):
+        return self._vacio
+
+
+SIN_INSTRUMENTACION = _SinInstrumentacion()
@@ -1,97 +1,831 @@
-import random
 import math
+import multiprocessing
+import queue
 import numpy as np
-import sympy as sp
-from typing import Tuple, List, Dict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, List, Optional, Sequence, Tuple
+from modelo.acumulador import (AcumuladorCovarianza, AcumuladorReplicas, AcumuladorReplicasCovarianza,
+                               AcumuladorVectorial, AcumuladorWelford, Reservorio)
+from modelo.adaptativo import integrar_miser
+from modelo.cache_exacto import CacheIntegrales
+from modelo.cuadratura import integrar_cubatura_2d, integrar_gauss_kronrod
+from modelo.funciones import compilar_funcion
+from modelo.instrumentacion import SIN_INSTRUMENTACION
+from modelo.muestreadores import Muestreador, crear_muestreador
+from modelo.nucleo_jit import NucleoJIT, nucleo_jit
+from modelo.reduccion import Reduccion
+from modelo.referencia import CalculadorReferencia, ValorReferencia
+from modelo.resultado import (ResultadoBarrido, ResultadoMonteCarlo, ResultadoMultiple, semiancho_confianza,
+                              variables_por_defecto)
+from modelo.seguimiento import CalculoCancelado, Seguimiento
+
+def _integrar_particion(func_str: str, variables: Sequence[str], limites, n: int,
+                        semilla: np.random.SeedSequence, capacidad_reservorio: int, muestreador: str,
+                        reduccion: Optional[Reduccion], indice: int = 0, cola=None, evento=None):
+    """Integra una partición de las muestras en un proceso trabajador.
+
+    Devuelve solo el acumulador (totales parciales) y una muestra acotada de puntos, nunca las muestras completas.
+    Si se pasan una cola y un evento compartidos, informa del avance por la cola y se detiene cuando
+    se activa el evento.
+    """
+    f = compilar_funcion(func_str, variables)
+    rng = np.random.default_rng(semilla)
+    reduccion = reduccion or Reduccion()
+
+    seguimiento = None
+    if cola is not None:
+        seguimiento = Seguimiento(lambda p: cola.put((indice, p.hechos, p.estimacion, p.error_estandar)), evento)
+        seguimiento.iniciar(n)
+
+    muestreadores, acumulador = MonteCarloCalculator._preparar_muestreo(muestreador, variables, limites, rng,
+                                                                        reduccion)
+    reservorio = Reservorio(capacidad_reservorio, len(limites), rng)
+    MonteCarloCalculator._muestrear(f, limites, n, muestreadores, acumulador, reservorio, reduccion, seguimiento)
+    return acumulador, reservorio.coordenadas[:len(reservorio)], reservorio.valores[:len(reservorio)]
+
 
 class MonteCarloCalculator:
     """Modelo - Lógica de cálculo Monte Carlo"""
-    
-    @staticmethod
-    def calcular_integral_1d(func_str: str, a: float, b: float, n: int) -> Tuple[float, List[Dict]]:
+
+    # A partir de este N no se guardan todas las muestras (modo streaming)
+    UMBRAL_STREAMING = 1_000_000
+    # Muestras generadas y evaluadas por bloque
+    TAMANO_BLOQUE = 1_000_000
+    # Primer bloque de cada muestreo (los siguientes se duplican hasta TAMANO_BLOQUE)
+    TAMANO_BLOQUE_INICIAL = 10_000
+    # Puntos conservados para el gráfico en modo streaming
+    TAMANO_RESERVORIO = 5_000
+    # Primer lote del modo por tolerancia (los siguientes duplican el total)
+    N_INICIAL_TOLERANCIA = 10_000
+    # Réplicas aleatorizadas independientes para estimar el error en QMC
+    REPLICAS_QMC = 16
+    # Memoria máxima (bytes) de la matriz muestras × parámetros evaluada de una vez en un barrido
+    MEMORIA_BLOQUE_BARRIDO = 64 * 2**20
+
+    def __init__(self):
+        # Valores de referencia para comparar: SymPy con tiempo límite y cuadratura como respaldo
+        self._referencia_1d = CalculadorReferencia(MonteCarloCalculator.calcular_valor_exacto_1d,
+                                                   MonteCarloCalculator.calcular_cuadratura_1d)
+        self._referencia_2d = CalculadorReferencia(MonteCarloCalculator.calcular_valor_exacto_2d,
+                                                   MonteCarloCalculator.calcular_cuadratura_2d)
+
+    @classmethod
+    def calcular_integral_nd(cls, func_str: str, limites: Sequence[Tuple[float, float]], n: int,
+                             variables: Optional[Sequence[str]] = None,
+                             semilla: Optional[int] = None,
+                             umbral_streaming: Optional[int] = None,
+                             nivel_confianza: float = 0.95,
+                             trabajadores: int = 1,
+                             muestreador: str = "pseudo",
+                             reduccion: Optional[Reduccion] = None,
+                             seguimiento: Optional[Seguimiento] = None,
+                             motor: str = "numpy") -> ResultadoMonteCarlo:
+        """Calcula la integral sobre el hiperrectángulo dado por los límites [(a₁, b₁), ..., (a_d, b_d)].
+
+        Con un Seguimiento se informa del avance y el cálculo puede cancelarse entre bloques; en ese caso
+        se lanza CalculoCancelado con el resultado parcial.
+        Con motor="jit" se usa un núcleo compilado con Numba si está instalado y la combinación lo
+        admite (muestreo pseudoaleatorio, sin reducción de varianza, un proceso); si no, NumPy.
+        El resultado indica en `motor` cuál se usó.
+        """
+        if motor not in ("numpy", "jit"):
+            raise ValueError(f"Motor desconocido: {motor}")
+        variables, limites = cls._validar_dominio(variables, limites, n)
+        return cls._integrar(func_str, variables, limites, n, semilla, umbral_streaming, nivel_confianza,
+                             trabajadores, muestreador, reduccion, seguimiento, motor)
+
+    @classmethod
+    def calcular_integral_nd_tolerancia(cls, func_str: str, limites: Sequence[Tuple[float, float]],
+                                        variables: Optional[Sequence[str]] = None,
+                                        tolerancia_abs: Optional[float] = None,
+                                        tolerancia_rel: Optional[float] = None,
+                                        n_max: int = 100_000_000,
+                                        semilla: Optional[int] = None,
+                                        nivel_confianza: float = 0.95,
+                                        muestreador: str = "pseudo",
+                                        reduccion: Optional[Reduccion] = None,
+                                        seguimiento: Optional[Seguimiento] = None) -> ResultadoMonteCarlo:
+        """Calcula la integral sobre el hiperrectángulo muestreando hasta alcanzar la tolerancia pedida"""
+        variables, limites = cls._validar_dominio(variables, limites, n_max)
+        return cls._integrar_hasta_tolerancia(func_str, variables, limites, semilla, tolerancia_abs,
+                                              tolerancia_rel, n_max, nivel_confianza, muestreador, reduccion,
+                                              seguimiento)
+
+    @classmethod
+    def calcular_integral_adaptativa_nd(cls, func_str: str, limites: Sequence[Tuple[float, float]], n: int,
+                                        variables: Optional[Sequence[str]] = None,
+                                        semilla: Optional[int] = None,
+                                        nivel_confianza: float = 0.95,
+                                        seguimiento: Optional[Seguimiento] = None) -> ResultadoMonteCarlo:
+        """Calcula la integral sobre el hiperrectángulo con el integrador adaptativo recursivo (MISER)"""
+        variables, limites = cls._validar_dominio(variables, limites, n)
+        return cls._integrar_adaptativa(func_str, variables, limites, n, semilla, nivel_confianza, seguimiento)
+
+    @classmethod
+    def calcular_integrales_nd(cls, funciones: Sequence[str], limites: Sequence[Tuple[float, float]], n: int,
+                               variables: Optional[Sequence[str]] = None,
+                               semilla: Optional[int] = None,
+                               nivel_confianza: float = 0.95,
+                               muestreador: str = "pseudo",
+                               seguimiento: Optional[Seguimiento] = None) -> ResultadoMultiple:
+        """Integra varias funciones sobre el mismo hiperrectángulo con un único conjunto de muestras.
+
+        Cada bloque de puntos se genera una vez y se evalúa en todos los integrandos (números aleatorios
+        comunes): las estimaciones quedan correlacionadas y se devuelve su covarianza.
+        """
+        variables, limites = cls._validar_dominio(variables, limites, n)
+        if not funciones:
+            raise ValueError("Debe indicarse al menos una función")
+        with cls._instrumentacion(seguimiento).medir("compilación de f"):
+            integrandos = [compilar_funcion(func_str, variables) for func_str in funciones]
+        rng = np.random.default_rng(semilla)
+        if seguimiento is not None:
+            seguimiento.iniciar(n)
+
+        dimension, k = len(limites), len(integrandos)
+        if muestreador == "pseudo":
+            muestreadores = [crear_muestreador(muestreador, dimension, rng)]
+            acumulador = AcumuladorCovarianza(k)
+        else:
+            muestreadores = [crear_muestreador(muestreador, dimension, rng) for _ in range(cls.REPLICAS_QMC)]
+            acumulador = AcumuladorReplicasCovarianza(cls.REPLICAS_QMC, k)
+        def evaluar(columnas):
+            valores = np.empty((len(columnas[0]), k))
+            for j, f in enumerate(integrandos):
+                valores[:, j] = f(*columnas)
+            return valores
+
+        cls._muestrear_varias(evaluar, limites, n, muestreadores, acumulador, seguimiento)
+
+        resultado = ResultadoMultiple(funciones, acumulador.media, acumulador.covarianza_media, acumulador.n,
+                                      limites, variables, nivel_confianza, muestreador)
+        if seguimiento is not None and seguimiento.cancelado:
+            raise CalculoCancelado(resultado)
+        return resultado
+
+    @classmethod
+    def calcular_integrales_1d(cls, funciones: Sequence[str], a: float, b: float, n: int,
+                               **opciones) -> ResultadoMultiple:
+        """Integra varias funciones simples en [a, b] con las mismas muestras"""
+        return cls.calcular_integrales_nd(funciones, [(a, b)], n, ("x",), **opciones)
+
+    @classmethod
+    def calcular_integrales_2d(cls, funciones: Sequence[str], a: float, b: float, c: float, d: float, n: int,
+                               **opciones) -> ResultadoMultiple:
+        """Integra varias funciones dobles en [a, b]×[c, d] con las mismas muestras"""
+        return cls.calcular_integrales_nd(funciones, [(a, b), (c, d)], n, ("x", "y"), **opciones)
+
+    @classmethod
+    def calcular_barrido_nd(cls, func_str: str, limites: Sequence[Tuple[float, float]],
+                            parametros: Dict[str, Sequence[float]], n: int,
+                            variables: Optional[Sequence[str]] = None,
+                            semilla: Optional[int] = None,
+                            nivel_confianza: float = 0.95,
+                            muestreador: str = "pseudo",
+                            seguimiento: Optional[Seguimiento] = None) -> ResultadoBarrido:
+        """Integra f(x; p) para cada combinación de valores de los parámetros con un único conjunto de muestras.
+
+        Cada bloque de puntos se evalúa de una vez contra la rejilla de parámetros por difusión
+        (muestras × parámetros), con bloques acotados por MEMORIA_BLOQUE_BARRIDO. Si la rejilla es tan
+        grande que no cabe ni con el bloque inicial, se recorre por partes repitiendo las mismas muestras.
+        """
+        variables, limites = cls._validar_dominio(variables, limites, n)
+        nombres, valores = cls._validar_parametros(parametros, variables)
+        with cls._instrumentacion(seguimiento).medir("compilación de f"):
+            f = compilar_funcion(func_str, variables + nombres)
+        # Rejilla (q, P): una fila por parámetro y una columna por combinación
+        rejilla = np.array([malla.ravel() for malla in np.meshgrid(*valores, indexing="ij")])
+        combinaciones = rejilla.shape[1]
+
+        por_pasada = max(1, cls.MEMORIA_BLOQUE_BARRIDO // (8 * cls.TAMANO_BLOQUE_INICIAL))
+        inicios = range(0, combinaciones, por_pasada)
+        # La misma semilla en cada pasada reproduce exactamente las mismas muestras
+        secuencia = np.random.SeedSequence(semilla)
+        if seguimiento is not None:
+            seguimiento.iniciar(n * len(inicios))
+
+        medias, errores, hechos = [], [], 0
+        for inicio in inicios:
+            parte = rejilla[:, inicio:inicio + por_pasada]
+            rng = np.random.default_rng(secuencia)
+            if muestreador == "pseudo":
+                muestreadores = [crear_muestreador(muestreador, len(limites), rng)]
+                acumulador = AcumuladorVectorial(parte.shape[1])
+            else:
+                muestreadores = [crear_muestreador(muestreador, len(limites), rng)
+                                 for _ in range(cls.REPLICAS_QMC)]
+                acumulador = AcumuladorReplicas([AcumuladorVectorial(parte.shape[1])
+                                                 for _ in range(cls.REPLICAS_QMC)])
+
+            def evaluar(columnas, parte=parte):
+                # (m, 1) contra (1, P): la función se evalúa una vez para todo el bloque y la rejilla
+                return f(*(c[:, None] for c in columnas), *(fila[None, :] for fila in parte))
+
+            bloque_maximo = max(1, cls.MEMORIA_BLOQUE_BARRIDO // (8 * parte.shape[1]))
+            cls._muestrear_varias(evaluar, limites, n, muestreadores, acumulador, seguimiento,
+                                  bloque_maximo=bloque_maximo, hechos_previos=hechos, columna_avance=None)
+            hechos += acumulador.n
+            medias.append(acumulador.media)
+            errores.append(np.broadcast_to(acumulador.error_estandar, (parte.shape[1],)))
+            if seguimiento is not None and seguimiento.cancelado:
+                break
+
+        cancelado = seguimiento is not None and seguimiento.cancelado
+        if cancelado and len(inicios) > 1:
+            # Las pasadas no tendrían el mismo N ni cubrirían todas las combinaciones: sin resultado parcial
+            raise CalculoCancelado()
+        resultado = ResultadoBarrido(func_str, dict(zip(nombres, valores)), np.concatenate(medias),
+                                     np.concatenate(errores), acumulador.n, limites, variables,
+                                     nivel_confianza, muestreador)
+        if cancelado:
+            raise CalculoCancelado(resultado)
+        return resultado
+
+    @classmethod
+    def calcular_barrido_1d(cls, func_str: str, a: float, b: float, parametros: Dict[str, Sequence[float]],
+                            n: int, **opciones) -> ResultadoBarrido:
+        """Barrido de parámetros de una integral simple en [a, b]"""
+        return cls.calcular_barrido_nd(func_str, [(a, b)], parametros, n, ("x",), **opciones)
+
+    @classmethod
+    def calcular_barrido_2d(cls, func_str: str, a: float, b: float, c: float, d: float,
+                            parametros: Dict[str, Sequence[float]], n: int, **opciones) -> ResultadoBarrido:
+        """Barrido de parámetros de una integral doble en [a, b]×[c, d]"""
+        return cls.calcular_barrido_nd(func_str, [(a, b), (c, d)], parametros, n, ("x", "y"), **opciones)
+
+    @classmethod
+    def calcular_integral_1d(cls, func_str: str, a: float, b: float, n: int, **opciones) -> ResultadoMonteCarlo:
         """Calcula integral simple usando Monte Carlo"""
-        suma = 0
-        puntos = []
-        
-        for i in range(n):
-            x = random.uniform(a, b)
-            try:
-                y = eval(func_str, {"x": x, "math": math, "np": np, "__builtins__": {}})
-            except:
-                try:
-                    y = eval(func_str, {"x": x, "math": math, "np": np})
-                except:
-                    y = 0
-            suma += y
-            
-            puntos.append({"x": x, "y": y})
-        
-        integral = (b - a) * suma / n
-        return integral, puntos
-    
-    @staticmethod
-    def calcular_integral_2d(func_str: str, a: float, b: float, c: float, d: float, n: int) -> Tuple[float, List[Dict]]:
+        return cls.calcular_integral_nd(func_str, [(a, b)], n, ("x",), **opciones)
+
+    @classmethod
+    def calcular_integral_2d(cls, func_str: str, a: float, b: float, c: float, d: float, n: int,
+                             **opciones) -> ResultadoMonteCarlo:
         """Calcula integral doble usando Monte Carlo"""
-        suma = 0
-        puntos = []
-        
-        for i in range(n):
-            x = random.uniform(a, b)
-            y = random.uniform(c, d)
-            try:
-                z = eval(func_str, {"x": x, "y": y, "math": math, "np": np, "__builtins__": {}})
-            except:
+        return cls.calcular_integral_nd(func_str, [(a, b), (c, d)], n, ("x", "y"), **opciones)
+
+    @classmethod
+    def calcular_integral_1d_tolerancia(cls, func_str: str, a: float, b: float, **opciones) -> ResultadoMonteCarlo:
+        """Calcula integral simple muestreando hasta alcanzar la tolerancia pedida"""
+        return cls.calcular_integral_nd_tolerancia(func_str, [(a, b)], ("x",), **opciones)
+
+    @classmethod
+    def calcular_integral_2d_tolerancia(cls, func_str: str, a: float, b: float, c: float, d: float,
+                                        **opciones) -> ResultadoMonteCarlo:
+        """Calcula integral doble muestreando hasta alcanzar la tolerancia pedida"""
+        return cls.calcular_integral_nd_tolerancia(func_str, [(a, b), (c, d)], ("x", "y"), **opciones)
+
+    @classmethod
+    def calcular_integral_adaptativa_1d(cls, func_str: str, a: float, b: float, n: int,
+                                        **opciones) -> ResultadoMonteCarlo:
+        """Calcula integral simple con el integrador adaptativo recursivo (MISER)"""
+        return cls.calcular_integral_adaptativa_nd(func_str, [(a, b)], n, ("x",), **opciones)
+
+    @classmethod
+    def calcular_integral_adaptativa_2d(cls, func_str: str, a: float, b: float, c: float, d: float, n: int,
+                                        **opciones) -> ResultadoMonteCarlo:
+        """Calcula integral doble con el integrador adaptativo recursivo (MISER)"""
+        return cls.calcular_integral_adaptativa_nd(func_str, [(a, b), (c, d)], n, ("x", "y"), **opciones)
+
+    @staticmethod
+    def _validar_dominio(variables: Optional[Sequence[str]], limites,
+                         n: Optional[int] = None) -> Tuple[Tuple[str, ...], list]:
+        """Normaliza variables y límites y comprueba que describen un hiperrectángulo válido (y N, si se da)"""
+        if n is not None and n < 1:
+            raise ValueError("N debe ser al menos 1")
+        limites = [(float(a), float(b)) for a, b in limites]
+        if not limites:
+            raise ValueError("Debe indicarse al menos un par de límites")
+        variables = tuple(variables) if variables is not None else variables_por_defecto(len(limites))
+        if len(variables) != len(limites):
+            raise ValueError(f"Hay {len(variables)} variables pero {len(limites)} pares de límites")
+        if len(set(variables)) != len(variables) or not all(v.isidentifier() for v in variables):
+            raise ValueError("Los nombres de variable deben ser identificadores distintos")
+        if any(a >= b for a, b in limites):
+            raise ValueError("Los límites inferiores deben ser menores que los superiores")
+        return variables, limites
+
+    @staticmethod
+    def _validar_parametros(parametros: Dict[str, Sequence[float]],
+                            variables: Sequence[str]) -> Tuple[Tuple[str, ...], List[np.ndarray]]:
+        """Comprueba los nombres y valores de los parámetros de un barrido"""
+        if not parametros:
+            raise ValueError("Debe indicarse al menos un parámetro")
+        nombres = tuple(parametros)
+        for nombre in nombres:
+            if not nombre.isidentifier() or nombre in ("math", "np"):
+                raise ValueError(f"Nombre de parámetro no válido: {nombre!r}")
+            if nombre in variables:
+                raise ValueError(f"El parámetro {nombre!r} coincide con una variable de integración")
+        valores = [np.atleast_1d(np.asarray(parametros[nombre], dtype=float)).ravel() for nombre in nombres]
+        for nombre, v in zip(nombres, valores):
+            if len(v) == 0 or not np.all(np.isfinite(v)):
+                raise ValueError(f"El parámetro {nombre!r} necesita al menos un valor finito")
+        return nombres, valores
+
+    @classmethod
+    def _integrar_adaptativa(cls, func_str: str, variables: Sequence[str], limites, n: int,
+                             semilla: Optional[int], nivel_confianza: float,
+                             seguimiento: Optional[Seguimiento] = None) -> ResultadoMonteCarlo:
+        """Bisección recursiva de la región asignando más puntos donde la varianza local es mayor"""
+        instrumentacion = cls._instrumentacion(seguimiento)
+        with instrumentacion.medir("compilación de f"):
+            f = compilar_funcion(func_str, variables)
+        rng = np.random.default_rng(semilla)
+        capacidad = n if n <= cls.UMBRAL_STREAMING else cls.TAMANO_RESERVORIO
+        reservorio = Reservorio(capacidad, len(limites), rng)
+        if seguimiento is not None:
+            seguimiento.iniciar(n)
+
+        with instrumentacion.medir("muestreo adaptativo (MISER)", n):
+            estimacion, varianza, varianza_simple, evaluaciones = integrar_miser(f, limites, n, rng, reservorio,
+                                                                                 seguimiento)
+
+        # Factor frente a Monte Carlo simple con el mismo número de evaluaciones
+        factor = (varianza_simple / evaluaciones) / varianza if varianza > 0 else None
+        return ResultadoMonteCarlo(estimacion, reservorio.coordenadas[:len(reservorio)],
+                                   reservorio.valores[:len(reservorio)], evaluaciones, func_str, limites,
+                                   variables=variables, varianza=varianza * evaluaciones,
+                                   error_estandar=math.sqrt(varianza), nivel_confianza=nivel_confianza,
+                                   reduccion="adaptativo (MISER)", factor_reduccion=factor)
+
+    @classmethod
+    def _integrar(cls, func_str: str, variables: Sequence[str], limites, n: int, semilla: Optional[int],
+                  umbral_streaming: Optional[int], nivel_confianza: float, trabajadores: int,
+                  muestreador: str, reduccion: Optional[Reduccion],
+                  seguimiento: Optional[Seguimiento] = None, motor: str = "numpy") -> ResultadoMonteCarlo:
+        """Integra con N fijo, en este proceso o repartido entre varios"""
+        nucleo = None
+        if motor == "jit" and trabajadores == 1 and muestreador == "pseudo" and reduccion is None:
+            with cls._instrumentacion(seguimiento).medir("compilación del núcleo JIT"):
+                nucleo = nucleo_jit(func_str, variables)
+        if nucleo is not None:
+            return cls._integrar_con_nucleo(nucleo, func_str, variables, limites, n, semilla, umbral_streaming,
+                                            nivel_confianza, seguimiento)
+        reduccion = reduccion or Reduccion()
+        reduccion.preparar(variables, limites)
+        reduccion.validar(n // trabajadores)
+        if seguimiento is not None:
+            seguimiento.iniciar(n)
+        instrumentacion = cls._instrumentacion(seguimiento)
+        if trabajadores > 1:
+            # Las etapas de cada proceso no se ven desde aquí: se mide el reparto completo
+            with instrumentacion.medir("procesos en paralelo", n):
+                acumulador, reservorio = cls._integrar_en_paralelo(func_str, variables, limites, n, semilla,
+                                                                   trabajadores, umbral_streaming, muestreador,
+                                                                   reduccion, seguimiento)
+        else:
+            with instrumentacion.medir("compilación de f"):
+                f = compilar_funcion(func_str, variables)
+            rng = np.random.default_rng(semilla)
+            acumulador, reservorio = cls._integrar_por_bloques(f, variables, limites, n, rng, umbral_streaming,
+                                                               muestreador, reduccion, seguimiento)
+        resultado = cls._construir_resultado(func_str, variables, limites, acumulador, reservorio,
+                                             nivel_confianza, muestreador=muestreador, reduccion=reduccion)
+        if seguimiento is not None and seguimiento.cancelado:
+            raise CalculoCancelado(resultado)
+        return resultado
+
+    @classmethod
+    def _integrar_con_nucleo(cls, nucleo: NucleoJIT, func_str: str, variables: Sequence[str], limites, n: int,
+                             semilla: Optional[int], umbral_streaming: Optional[int], nivel_confianza: float,
+                             seguimiento: Optional[Seguimiento] = None) -> ResultadoMonteCarlo:
+        """Integra con el núcleo compilado: genera, evalúa y acumula cada bloque en un solo bucle.
+
+        Las muestras son independientes, así que las primeras `capacidad` ya son una muestra uniforme
+        para el gráfico: el núcleo las guarda y deja de hacerlo al llenarse el reservorio.
+        """
+        if umbral_streaming is None:
+            umbral_streaming = cls.UMBRAL_STREAMING
+        capacidad = n if n <= umbral_streaming else cls.TAMANO_RESERVORIO
+        reservorio = Reservorio(capacidad, len(limites))
+        acumulador = AcumuladorWelford()
+        inferiores = np.array([lim[0] for lim in limites], dtype=float)
+        anchos = np.array([lim[1] - lim[0] for lim in limites], dtype=float)
+        volumen = float(np.prod(anchos))
+        instrumentacion = cls._instrumentacion(seguimiento)
+        if seguimiento is not None:
+            seguimiento.iniciar(n)
+
+        nucleo.sembrar(int(np.random.SeedSequence(semilla).generate_state(1)[0]))
+        bloque = cls.TAMANO_BLOQUE_INICIAL
+        while acumulador.n < n:
+            m = min(bloque, n - acumulador.n)
+            guardar = min(m, capacidad - len(reservorio))
+            puntos, valores = np.empty((guardar, len(limites))), np.empty(guardar)
+            with instrumentacion.medir("núcleo JIT (muestreo, evaluación y acumulación)", m):
+                media, m2 = nucleo.bloque(m, inferiores, anchos, volumen, puntos, valores)
+            acumulador.agregar_momentos(m, media, m2)
+            reservorio.agregar(puntos, valores)
+
+            if seguimiento is not None:
+                seguimiento.avance(acumulador.n, acumulador.media, acumulador.error_estandar)
+                if seguimiento.cancelado:
+                    break
+            bloque = min(2 * bloque, cls.TAMANO_BLOQUE)
+
+        resultado = cls._construir_resultado(func_str, variables, limites, acumulador, reservorio,
+                                             nivel_confianza, motor="jit")
+        if seguimiento is not None and seguimiento.cancelado:
+            raise CalculoCancelado(resultado)
+        return resultado
+
+    @staticmethod
+    def _instrumentacion(seguimiento: Optional[Seguimiento]):
+        """Instrumentación del cálculo seguido (un sustituto sin coste si no hay seguimiento)"""
+        return seguimiento.instrumentacion if seguimiento is not None else SIN_INSTRUMENTACION
+
+    @classmethod
+    def _preparar_muestreo(cls, muestreador: str, variables: Sequence[str], limites, rng: np.random.Generator,
+                           reduccion: Reduccion) -> Tuple[List[Muestreador], object]:
+        """Crea los flujos de puntos y el acumulador adecuados al tipo de muestreo y de reducción"""
+        reduccion.preparar(variables, limites)
+        dimension = len(limites)
+        if muestreador == "pseudo":
+            return [crear_muestreador(muestreador, dimension, rng)], reduccion.crear_acumulador()
+        if type(reduccion) is not Reduccion:
+            raise ValueError("La reducción de varianza solo se aplica con muestreo pseudoaleatorio")
+        # QMC aleatorizado: réplicas con aleatorizaciones independientes
+        muestreadores = [crear_muestreador(muestreador, dimension, rng) for _ in range(cls.REPLICAS_QMC)]
+        return muestreadores, AcumuladorReplicas(cls.REPLICAS_QMC)
+
+    @classmethod
+    def _integrar_por_bloques(cls, f, variables: Sequence[str], limites, n: int, rng: np.random.Generator,
+                              umbral_streaming: Optional[int] = None, muestreador: str = "pseudo",
+                              reduccion: Optional[Reduccion] = None,
+                              seguimiento: Optional[Seguimiento] = None) -> Tuple[object, Reservorio]:
+        """Genera y evalúa las muestras por bloques, sin retener más que el reservorio"""
+        if umbral_streaming is None:
+            umbral_streaming = cls.UMBRAL_STREAMING
+        reduccion = reduccion or Reduccion()
+
+        # Por debajo del umbral el reservorio guarda todas las muestras
+        capacidad = n if n <= umbral_streaming else cls.TAMANO_RESERVORIO
+
+        muestreadores, acumulador = cls._preparar_muestreo(muestreador, variables, limites, rng, reduccion)
+        reservorio = Reservorio(capacidad, len(limites), rng)
+        cls._muestrear(f, limites, n, muestreadores, acumulador, reservorio, reduccion, seguimiento)
+        return acumulador, reservorio
+
+    @classmethod
+    def _integrar_en_paralelo(cls, func_str: str, variables: Sequence[str], limites, n: int,
+                              semilla: Optional[int], trabajadores: int,
+                              umbral_streaming: Optional[int] = None, muestreador: str = "pseudo",
+                              reduccion: Optional[Reduccion] = None,
+                              seguimiento: Optional[Seguimiento] = None) -> Tuple[object, Reservorio]:
+        """Reparte las n muestras entre procesos con flujos aleatorios independientes"""
+        if umbral_streaming is None:
+            umbral_streaming = cls.UMBRAL_STREAMING
+        # Reparto determinista de n (en grupos completos de la reducción) y de la muestra para el gráfico:
+        # por debajo del umbral se guardan todos los puntos, como en un solo proceso
+        grupo = (reduccion or Reduccion()).multiplo
+        grupos = n // grupo
+        tamanos = [grupo * (grupos // trabajadores + (1 if i < grupos % trabajadores else 0))
+                   for i in range(trabajadores)]
+        capacidad = n if n <= umbral_streaming else cls.TAMANO_RESERVORIO
+        capacidades = [math.ceil(capacidad * m / n) if n else 0 for m in tamanos]
+        semillas = np.random.SeedSequence(semilla).spawn(trabajadores)
+
+        # 'spawn' evita heredar el estado de Tk y de los hilos del proceso principal
+        contexto = multiprocessing.get_context("spawn")
+        if seguimiento is None:
+            with ProcessPoolExecutor(max_workers=trabajadores, mp_context=contexto) as ejecutor:
+                futuros = [ejecutor.submit(_integrar_particion, func_str, tuple(variables), limites, m, s, c,
+                                           muestreador, reduccion)
+                           for m, s, c in zip(tamanos, semillas, capacidades)]
+                # Se combinan siempre en el mismo orden para que el resultado sea reproducible
+                parciales = [futuro.result() for futuro in futuros]
+        else:
+            # El avance y la cancelación viajan por una cola y un evento compartidos entre procesos
+            with contexto.Manager() as gestor, \
+                    ProcessPoolExecutor(max_workers=trabajadores, mp_context=contexto) as ejecutor:
+                cola, evento = gestor.Queue(), gestor.Event()
+                futuros = [ejecutor.submit(_integrar_particion, func_str, tuple(variables), limites, m, s, c,
+                                           muestreador, reduccion, i, cola, evento)
+                           for i, (m, s, c) in enumerate(zip(tamanos, semillas, capacidades))]
+                cls._seguir_trabajadores(futuros, cola, evento, seguimiento)
+                parciales = [futuro.result() for futuro in futuros]
+
+        reservorio = Reservorio(sum(capacidades), len(limites))
+        for _, coordenadas, valores in parciales:
+            reservorio.agregar(coordenadas, valores)
+
+        acumuladores = [acumulador for acumulador, _, _ in parciales]
+        if muestreador != "pseudo":
+            return AcumuladorReplicas([r for acumulador in acumuladores for r in acumulador.replicas]), reservorio
+        acumulador = acumuladores[0]
+        for otro in acumuladores[1:]:
+            acumulador.combinar(otro)
+        return acumulador, reservorio
+
+    @staticmethod
+    def _seguir_trabajadores(futuros, cola, evento, seguimiento: Seguimiento):
+        """Reúne el avance de los procesos trabajadores y les transmite la cancelación"""
+        hechos = [0] * len(futuros)
+        estimaciones = [0.0] * len(futuros)
+        errores = [0.0] * len(futuros)
+        pendientes = set(futuros)
+        while pendientes:
+            _, pendientes = wait(pendientes, timeout=max(seguimiento.intervalo, 0.05), return_when=FIRST_COMPLETED)
+            while True:
                 try:
-                    z = eval(func_str, {"x": x, "y": y, "math": math, "np": np})
-                except:
-                    z = 0
-            suma += z
-            
-            puntos.append({"x": x, "y": y, "z": z})
-        
-        area = (b - a) * (d - c)
-        integral = area * suma / n
-        return integral, puntos
-    
+                    i, hechos[i], estimaciones[i], errores[i] = cola.get_nowait()
+                except queue.Empty:
+                    break
+            if seguimiento.cancelado:
+                evento.set()
+            total = sum(hechos)
+            if total:
+                # Media ponderada por muestras; los errores se combinan como los de medias independientes
+                pesos = [h / total for h in hechos]
+                estimacion = sum(p * e for p, e in zip(pesos, estimaciones))
+                error = math.sqrt(sum((p * s) ** 2 for p, s in zip(pesos, errores)))
+                seguimiento.avance(total, estimacion, error)
+
+    @classmethod
+    def _muestrear(cls, f, limites, n: int, muestreadores: List[Muestreador], acumulador,
+                   reservorio: Reservorio, reduccion: Reduccion, seguimiento: Optional[Seguimiento] = None):
+        """Añade n muestras al acumulador y al reservorio, bloque a bloque y repartidas entre réplicas.
+
+        Con un Seguimiento informa del avance tras cada bloque y se detiene si se pidió cancelar.
+        """
+        inferiores = np.array([lim[0] for lim in limites], dtype=float)
+        anchos = np.array([lim[1] - lim[0] for lim in limites], dtype=float)
+        # Las muestras se acumulan ya multiplicadas por el volumen del dominio
+        volumen = float(np.prod(anchos))
+
+        replicas = acumulador.replicas if isinstance(acumulador, AcumuladorReplicas) else [acumulador]
+        k = len(replicas)
+        restantes = [n // k + (1 if i < n % k else 0) for i in range(k)]
+        # Los bloques empiezan pequeños y se duplican: las instantáneas del avance quedan en N geométrico
+        # (siempre igual, para que el resultado con una semilla no dependa de si se sigue el avance)
+        bloque = cls.TAMANO_BLOQUE_INICIAL
+
+        instrumentacion = cls._instrumentacion(seguimiento)
+
+        # Las réplicas avanzan por turnos para que la estimación intermedia las incluya a todas
+        while any(r > 0 for r in restantes):
+            for i, (muestreador, replica) in enumerate(zip(muestreadores, replicas)):
+                if restantes[i] <= 0:
+                    continue
+                m = min(bloque, restantes[i])
+                m -= m % reduccion.multiplo
+                if m == 0:
+                    # Lo que no completa un grupo (un par antitético) no se evalúa: N no se supera
+                    restantes[i] = 0
+                    continue
+                with instrumentacion.medir("generación de muestras", m):
+                    u = reduccion.generar(muestreador, m, replica)
+                    puntos = inferiores + anchos * u
+                with instrumentacion.medir("evaluación de f", len(u)):
+                    valores = f(*puntos.T)
+
+                with instrumentacion.medir("acumulación", len(u)):
+                    reduccion.agregar(replica, u, puntos, volumen * valores)
+                    reservorio.agregar(puntos, valores)
+                restantes[i] -= len(u)
+
+            if seguimiento is not None:
+                seguimiento.avance(acumulador.n, acumulador.media, acumulador.error_estandar)
+                if seguimiento.cancelado:
+                    return
+            bloque = min(2 * bloque, cls.TAMANO_BLOQUE)
+
+    @classmethod
+    def _muestrear_varias(cls, evaluar, limites, n: int, muestreadores: List[Muestreador], acumulador,
+                          seguimiento: Optional[Seguimiento] = None, bloque_maximo: Optional[int] = None,
+                          hechos_previos: int = 0, columna_avance: Optional[int] = 0):
+        """Como _muestrear, pero evaluar(columnas) devuelve un bloque (m, k) que se acumula por columnas.
+
+        `bloque_maximo` limita las filas de cada bloque (para acotar la memoria); el avance informa de
+        la estimación de la columna `columna_avance` (None para no dar estimación).
+        """
+        inferiores = np.array([lim[0] for lim in limites], dtype=float)
+        anchos = np.array([lim[1] - lim[0] for lim in limites], dtype=float)
+        volumen = float(np.prod(anchos))
+        tope = min(cls.TAMANO_BLOQUE, bloque_maximo or cls.TAMANO_BLOQUE)
+
+        replicas = getattr(acumulador, "replicas", [acumulador])
+        k = len(replicas)
+        restantes = [n // k + (1 if i < n % k else 0) for i in range(k)]
+        bloque = min(cls.TAMANO_BLOQUE_INICIAL, tope)
+        instrumentacion = cls._instrumentacion(seguimiento)
+
+        while any(r > 0 for r in restantes):
+            for i, (muestreador, replica) in enumerate(zip(muestreadores, replicas)):
+                if restantes[i] <= 0:
+                    continue
+                m = min(bloque, restantes[i])
+                with instrumentacion.medir("generación de muestras", m):
+                    columnas = (inferiores + anchos * muestreador.generar(m)).T
+                with instrumentacion.medir("evaluación de f", m):
+                    valores = evaluar(columnas)
+                with instrumentacion.medir("acumulación", m):
+                    replica.agregar(volumen * valores)
+                restantes[i] -= m
+
+            if seguimiento is not None:
+                if columna_avance is None:
+                    seguimiento.avance(hechos_previos + acumulador.n)
+                else:
+                    seguimiento.avance(hechos_previos + acumulador.n, float(acumulador.media[columna_avance]),
+                                       float(np.ravel(acumulador.error_estandar)[columna_avance]))
+                if seguimiento.cancelado:
+                    return
+            bloque = min(2 * bloque, tope)
+
+    @classmethod
+    def _integrar_hasta_tolerancia(cls, func_str: str, variables: Sequence[str], limites, semilla: Optional[int],
+                                   tolerancia_abs: Optional[float], tolerancia_rel: Optional[float],
+                                   n_max: int, nivel_confianza: float, muestreador: str = "pseudo",
+                                   reduccion: Optional[Reduccion] = None,
+                                   seguimiento: Optional[Seguimiento] = None) -> ResultadoMonteCarlo:
+        """Muestrea en lotes crecientes hasta que el semiancho del IC cumple la tolerancia"""
+        if tolerancia_abs is None and tolerancia_rel is None:
+            raise ValueError("Debe indicarse una tolerancia absoluta o relativa")
+        with cls._instrumentacion(seguimiento).medir("compilación de f"):
+            f = compilar_funcion(func_str, variables)
+        rng = np.random.default_rng(semilla)
+        reduccion = reduccion or Reduccion()
+
+        muestreadores, acumulador = cls._preparar_muestreo(muestreador, variables, limites, rng, reduccion)
+        reservorio = Reservorio(cls.TAMANO_RESERVORIO, len(limites), rng)
+        if seguimiento is not None:
+            # Se desconoce cuántas muestras harán falta: el avance se mide respecto al máximo
+            seguimiento.iniciar(n_max)
+
+        # Cada lote duplica el número total de muestras
+        lote = min(cls.N_INICIAL_TOLERANCIA, n_max)
+        reduccion.validar(lote)
+        lote -= lote % reduccion.multiplo
+        alcanzada = False
+        while lote > 0:
+            cls._muestrear(f, limites, lote, muestreadores, acumulador, reservorio, reduccion, seguimiento)
+            if seguimiento is not None and seguimiento.cancelado:
+                break
+
+            objetivo = max(tolerancia_abs or 0.0, (tolerancia_rel or 0.0) * abs(acumulador.media))
+            if semiancho_confianza(acumulador.error_estandar, nivel_confianza) <= objetivo:
+                alcanzada = True
+                break
+            lote = min(acumulador.n, n_max - acumulador.n)
+            lote -= lote % reduccion.multiplo
+
+        resultado = cls._construir_resultado(func_str, variables, limites, acumulador, reservorio,
+                                             nivel_confianza, tolerancia_alcanzada=alcanzada,
+                                             muestreador=muestreador, reduccion=reduccion)
+        if seguimiento is not None and seguimiento.cancelado:
+            raise CalculoCancelado(resultado)
+        return resultado
+
+    @staticmethod
+    def _construir_resultado(func_str: str, variables: Sequence[str], limites, acumulador, reservorio: Reservorio,
+                             nivel_confianza: float = 0.95,
+                             tolerancia_alcanzada: Optional[bool] = None,
+                             muestreador: str = "pseudo",
+                             reduccion: Optional[Reduccion] = None,
+                             motor: str = "numpy") -> ResultadoMonteCarlo:
+        """Arma el resultado a partir del acumulador y los puntos conservados"""
+        return ResultadoMonteCarlo(acumulador.media, reservorio.coordenadas[:len(reservorio)],
+                                   reservorio.valores[:len(reservorio)], acumulador.n, func_str, limites,
+                                   variables=variables, varianza=acumulador.varianza,
+                                   error_estandar=acumulador.error_estandar, nivel_confianza=nivel_confianza,
+                                   tolerancia_alcanzada=tolerancia_alcanzada, muestreador=muestreador,
+                                   reduccion=(reduccion or Reduccion()).nombre,
+                                   factor_reduccion=getattr(acumulador, "factor_reduccion", None),
+                                   motor=motor)
+
+    @staticmethod
+    def _a_sympy(func_str: str):
+        """Convierte la expresión con prefijos 'math.' en una expresión simbólica de SymPy"""
+        import sympy as sp
+        # Reemplazamos prefijos 'math.' por versiones de SymPy
+        reemplazos = {
+            # Trigonométricas básicas
+            "math.sin": "sin",
+            "math.cos": "cos",
+            "math.tan": "tan",
+            # Trigonométricas inversas
+            "math.asin": "asin",
+            "math.acos": "acos",
+            "math.atan": "atan",
+            # Exponencial y logarítmica
+            "math.exp": "exp",
+            "math.log": "ln",  # logaritmo natural
+            "math.log10": "(log(x)/log(10))", # logaritmo base 10 (clásico)
+            # Constantes
+            "math.pi": "pi",
+            "math.e": "E"
+        }
+
+        for k, v in reemplazos.items():
+            func_str = func_str.replace(k, v)
+
+        return sp.sympify(func_str)
+
     @staticmethod
-    def calcular_valor_exacto_1d(func_str: str, a: float, b: float) -> float:
-        """Calcula valor exacto para funciones conocidas"""
+    def calcular_valor_exacto_1d(func_str: str, a: float, b: float,
+                                 cache: Optional[CacheIntegrales] = None) -> Optional[float]:
+        """Calcula valor exacto para funciones conocidas.
+
+        Los valores y las primitivas se memorizan (en memoria y en disco) por expresión
+        normalizada, de modo que nuevos límites solo requieren evaluar la primitiva.
+        """
+        # SymPy tarda en importarse: solo se carga al pedir el primer valor exacto
+        import sympy as sp
+        cache = cache if cache is not None else CacheIntegrales.compartida()
         try:
             # Definimos variable simbólica
             x = sp.Symbol('x')
+            # Convertimos a expresión simbólica; su forma canónica es la clave de la caché
+            func = MonteCarloCalculator._a_sympy(func_str)
+            clave = sp.srepr(func)
+        except Exception:
+            return None
+
+        encontrado, valor = cache.valor(clave, a, b)
+        if encontrado:
+            return valor
+
+        try:
+            valor = MonteCarloCalculator._evaluar_con_primitiva(func, x, a, b, clave, cache)
+            if valor is None:
+                # Integramos analíticamente en el intervalo
+                resultado = sp.simplify(sp.integrate(func, (x, a, b)))
+                # Una integral sin evaluar no es un valor exacto (evalf la aproximaría numéricamente)
+                valor = None if resultado.has(sp.Integral) else float(resultado.evalf())
+            if valor is not None and not math.isfinite(valor):
+                valor = None
+        except Exception:
+            valor = None
+
+        cache.guardar_valor(clave, a, b, valor)
+        return valor
+
+    @staticmethod
+    def _evaluar_con_primitiva(func, x, a: float, b: float, clave: str,
+                               cache: CacheIntegrales) -> Optional[float]:
+        """F(b) - F(a) con la primitiva memorizada; None si no es aplicable en [a, b]"""
+        import sympy as sp
+        encontrada, primitiva = cache.primitiva(clave)
+        if encontrada:
+            primitiva = sp.sympify(primitiva) if primitiva is not None else None
+        else:
+            primitiva = sp.integrate(func, x)
+            if primitiva.has(sp.Integral):
+                primitiva = None
+            cache.guardar_primitiva(clave, sp.srepr(primitiva) if primitiva is not None else None)
+        if primitiva is None:
+            return None
+
+        # La regla de Barrow solo vale si la primitiva es continua en todo el intervalo
+        abierto = sp.Interval.open(a, b)
+        try:
+            continua = abierto.is_subset(sp.calculus.util.continuous_domain(primitiva, x, abierto))
+        except NotImplementedError:
+            continua = False
+        if not continua:
+            return None
+
+        extremos = []
+        for extremo, lado in ((b, '-'), (a, '+')):
+            valor = primitiva.subs(x, extremo)
+            if not valor.is_finite:
+                # Singularidad evitable o integrable en el extremo
+                valor = sp.limit(primitiva, x, extremo, lado)
+            extremos.append(valor)
+        return float(sp.N(extremos[0] - extremos[1]))
+
+    @staticmethod
+    def calcular_valor_exacto_2d(func_str: str, ax: float, bx: float, cy: float, dy: float) -> Optional[float]:
+        """Calcula la integral doble exacta en el rectángulo, si SymPy encuentra forma cerrada"""
+        import sympy as sp
+        try:
+            x, y = sp.symbols('x y')
+            resultado = sp.integrate(MonteCarloCalculator._a_sympy(func_str), (x, ax, bx), (y, cy, dy))
+            if resultado.has(sp.Integral):
+                return None
+            valor = float(resultado.evalf())
+            return valor if math.isfinite(valor) else None
+        except Exception:
+            return None
+
+    @staticmethod
+    def calcular_cuadratura_1d(func_str: str, a: float, b: float) -> Tuple[float, float]:
+        """Integral por cuadratura adaptativa de Gauss–Kronrod; devuelve (valor, error estimado)"""
+        return integrar_gauss_kronrod(compilar_funcion(func_str, ("x",)), a, b)
+
+    @staticmethod
+    def calcular_cuadratura_2d(func_str: str, ax: float, bx: float, cy: float, dy: float) -> Tuple[float, float]:
+        """Integral doble por cubatura adaptativa; devuelve (valor, error estimado)"""
+        return integrar_cubatura_2d(compilar_funcion(func_str, ("x", "y")), ax, bx, cy, dy)
+
+    def calcular_valor_referencia_1d(self, func_str: str, a: float, b: float,
+                                     cancelar=None) -> Optional[ValorReferencia]:
+        """Valor exacto (SymPy en otro proceso, con tiempo límite) o, si no, por cuadratura"""
+        return self._referencia_1d.calcular(func_str, a, b, cancelar=cancelar)
 
-            # Reemplazamos prefijos 'math.' por versiones de SymPy
-            reemplazos = {
-                # Trigonométricas básicas
-                "math.sin": "sin",
-                "math.cos": "cos",
-                "math.tan": "tan",
-                # Trigonométricas inversas
-                "math.asin": "asin",
-                "math.acos": "acos",
-                "math.atan": "atan",
-                # Exponencial y logarítmica
-                "math.exp": "exp",
-                "math.log": "ln",  # logaritmo natural
-                "math.log10": "(log(x)/log(10))", # logaritmo base 10 (clásico)
-                # Constantes
-                "math.pi": "pi",
-                "math.e": "E"
-            }
-
-            for k, v in reemplazos.items():
-                func_str = func_str.replace(k, v)
-
-            # Convertimos a expresión simbólica
-            func = sp.sympify(func_str)
-
-            # Integramos analíticamente
-            resultado = sp.integrate(func, (x, a, b))
-
-            # Simplificamos
-            resultado_simplificado = sp.simplify(resultado)
-
-            return float(resultado_simplificado.evalf())
-
-        except:
-            return None
\ No newline at end of file
+    def calcular_valor_referencia_2d(self, func_str: str, ax: float, bx: float, cy: float, dy: float,
+                                     cancelar=None) -> Optional[ValorReferencia]:
+        """Valor exacto de la integral doble o, si SymPy no lo obtiene a tiempo, por cubatura"""
+        return self._referencia_2d.calcular(func_str, ax, bx, cy, dy, cancelar=cancelar)
@@ -0,0 +1,180 @@
+import numpy as np
+from typing import Dict, Type
+
+# Bits de precisión de las secuencias digitales (Sobol y retícula)
+_BITS = 32
+
+# Números de dirección de Sobol para las dimensiones 2..10 (Joe y Kuo, new-joe-kuo-6.21201):
+# grado s del polinomio primitivo, coeficientes a y valores iniciales m_i
+_DIRECCIONES_SOBOL = [
+    (1, 0, (1,)),
+    (2, 1, (1, 3)),
+    (3, 1, (1, 3, 1)),
+    (3, 2, (1, 1, 1)),
+    (4, 1, (1, 1, 3, 3)),
+    (4, 4, (1, 3, 5, 13)),
+    (5, 2, (1, 1, 5, 5, 17)),
+    (5, 4, (1, 1, 5, 5, 5)),
+    (5, 7, (1, 1, 7, 11, 19)),
+]
+
+# Vector generador de una retícula de rango 1 extensible en base 2 (Cools, Kuo y Nuyens)
+_VECTOR_RETICULA = (1, 182667, 469891, 498753, 110745, 446247, 250185, 118627, 245333, 283199)
+
+# Bases de Halton: primeros números primos
+_PRIMOS = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29)
+
+
+class Muestreador:
+    """Generador de puntos en el hipercubo unidad [0,1)^d"""
+
+    nombre = ""
+    # Las secuencias cuasi-aleatorias necesitan réplicas independientes para estimar el error
+    cuasi_aleatorio = False
+    dimension_maxima = None
+
+    def __init__(self, dimension: int, rng: np.random.Generator):
+        if self.dimension_maxima is not None and dimension > self.dimension_maxima:
+            raise ValueError(f"El muestreo {self.nombre} admite como máximo {self.dimension_maxima} dimensiones")
+        self.dimension = dimension
+        self.rng = rng
+        # Índice del siguiente punto de la secuencia
+        self.indice = 0
+
+    def generar(self, m: int) -> np.ndarray:
+        """Devuelve los siguientes m puntos como array (m, d)"""
+        indices = np.arange(self.indice, self.indice + m, dtype=np.uint64)
+        self.indice += m
+        return self._puntos(indices)
+
+    def _puntos(self, indices: np.ndarray) -> np.ndarray:
+        raise NotImplementedError
+
+
+class MuestreadorPseudoaleatorio(Muestreador):
+    """Puntos pseudoaleatorios independientes del numpy.random.Generator"""
+
+    nombre = "Pseudoaleatorio"
+
+    def generar(self, m: int) -> np.ndarray:
+        self.indice += m
+        return self.rng.random((m, self.dimension))
+
+
+class MuestreadorSobol(Muestreador):
+    """Secuencia de Sobol en orden de código Gray, aleatorizada con un desplazamiento digital"""
+
+    nombre = "Sobol"
+    cuasi_aleatorio = True
+    dimension_maxima = len(_DIRECCIONES_SOBOL) + 1
+
+    def __init__(self, dimension: int, rng: np.random.Generator):
+        super().__init__(dimension, rng)
+        self.direcciones = _numeros_direccion_sobol(dimension)
+        # XOR con un entero aleatorio por dimensión: cada réplica sigue siendo uniforme
+        self.desplazamiento = rng.integers(0, 2 ** _BITS, size=dimension, dtype=np.uint64)
+
+    def _puntos(self, indices: np.ndarray) -> np.ndarray:
+        gray = indices ^ (indices >> np.uint64(1))
+        enteros = np.zeros((len(indices), self.dimension), dtype=np.uint64)
+        # Un bit puede ser 0 en todo el bloque y los siguientes no: se recorre hasta el más alto
+        bits = int(gray.max()).bit_length() if len(gray) else 0
+        for bit in range(bits):
+            activos = ((gray >> np.uint64(bit)) & np.uint64(1)).astype(bool)
+            if activos.any():
+                enteros[activos] ^= self.direcciones[:, bit]
+        enteros ^= self.desplazamiento
+        return enteros.astype(np.float64) / 2.0 ** _BITS
+
+
+class MuestreadorHalton(Muestreador):
+    """Secuencia de Halton aleatorizada con una rotación de Cranley-Patterson"""
+
+    nombre = "Halton"
+    cuasi_aleatorio = True
+    dimension_maxima = len(_PRIMOS)
+
+    def __init__(self, dimension: int, rng: np.random.Generator):
+        super().__init__(dimension, rng)
+        self.desplazamiento = rng.random(dimension)
+
+    def _puntos(self, indices: np.ndarray) -> np.ndarray:
+        puntos = np.empty((len(indices), self.dimension))
+        for j, base in enumerate(_PRIMOS[:self.dimension]):
+            puntos[:, j] = _inverso_radical(indices + np.uint64(1), base)
+        return (puntos + self.desplazamiento) % 1.0
+
+
+class MuestreadorReticula(Muestreador):
+    """Retícula de rango 1 extensible (orden de van der Corput) con rotación aleatoria"""
+
+    nombre = "Retícula"
+    cuasi_aleatorio = True
+    dimension_maxima = len(_VECTOR_RETICULA)
+
+    def __init__(self, dimension: int, rng: np.random.Generator):
+        super().__init__(dimension, rng)
+        self.vector = np.array(_VECTOR_RETICULA[:dimension], dtype=np.uint64)
+        self.desplazamiento = rng.random(dimension)
+
+    def _puntos(self, indices: np.ndarray) -> np.ndarray:
+        # φ₂(i)·z mod 1 calculado en aritmética entera de 32 bits
+        invertidos = _invertir_bits(indices)
+        enteros = (invertidos[:, None] * self.vector) & np.uint64(2 ** _BITS - 1)
+        return (enteros.astype(np.float64) / 2.0 ** _BITS + self.desplazamiento) % 1.0
+
+
+MUESTREADORES: Dict[str, Type[Muestreador]] = {
+    "pseudo": MuestreadorPseudoaleatorio,
+    "sobol": MuestreadorSobol,
+    "halton": MuestreadorHalton,
+    "reticula": MuestreadorReticula,
+}
+
+
+def crear_muestreador(nombre: str, dimension: int, rng: np.random.Generator) -> Muestreador:
+    """Crea un muestreador por nombre ('pseudo', 'sobol', 'halton' o 'reticula')"""
+    try:
+        clase = MUESTREADORES[nombre]
+    except KeyError:
+        raise ValueError(f"Muestreo desconocido: {nombre}") from None
+    return clase(dimension, rng)
+
+
+def _numeros_direccion_sobol(dimension: int) -> np.ndarray:
+    """Números de dirección V[j, k] ya desplazados a enteros de 32 bits"""
+    direcciones = np.zeros((dimension, _BITS), dtype=np.uint64)
+    # Primera dimensión: secuencia de van der Corput
+    direcciones[0] = [1 << (_BITS - 1 - k) for k in range(_BITS)]
+
+    for j, (s, a, m) in enumerate(_DIRECCIONES_SOBOL[:dimension - 1], start=1):
+        v = [m[k] << (_BITS - 1 - k) for k in range(s)]
+        for k in range(s, _BITS):
+            valor = v[k - s] ^ (v[k - s] >> s)
+            for i in range(1, s):
+                valor ^= ((a >> (s - 1 - i)) & 1) * v[k - i]
+            v.append(valor)
+        direcciones[j] = v
+    return direcciones
+
+
+def _inverso_radical(indices: np.ndarray, base: int) -> np.ndarray:
+    """Inverso radical de los índices en la base dada"""
+    restantes = indices.copy()
+    resultado = np.zeros(len(indices))
+    factor = 1.0 / base
+    while restantes.any():
+        resultado += (restantes % np.uint64(base)).astype(np.float64) * factor
+        restantes //= np.uint64(base)
+        factor /= base
+    return resultado
+
+
+def _invertir_bits(indices: np.ndarray) -> np.ndarray:
+    """Invierte los 32 bits inferiores de cada índice"""
+    invertidos = np.zeros_like(indices)
+    restantes = indices.copy()
+    for _ in range(_BITS):
+        invertidos = (invertidos << np.uint64(1)) | (restantes & np.uint64(1))
+        restantes >>= np.uint64(1)
+    return invertidos
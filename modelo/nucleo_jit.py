@@ -0,0 +1,201 @@
+"""Núcleo compilado con Numba (opcional) que genera, evalúa y acumula las muestras en una sola pasada.
+
+La expresión del usuario se traduce a un bucle escalar sin arrays temporales. Solo se admiten
+expresiones cuyo significado es el mismo en Numba que en el motor de NumPy (variables, números,
+operadores, comparaciones y funciones de `math`); con cualquier otra cosa, o sin Numba instalado,
+`nucleo_jit` devuelve None y el modelo usa el motor de NumPy.
+"""
+import ast
+import importlib.util
+import math
+import threading
+import numpy as np
+from typing import Callable, Optional, Sequence
+from modelo.cache_exacto import MemoriaLRU
+
+# Funciones de math que Numba compila en modo nopython, con su número de argumentos
+FUNCIONES_JIT = {
+    "sin": 1, "cos": 1, "tan": 1, "asin": 1, "acos": 1, "atan": 1, "atan2": 2,
+    "sinh": 1, "cosh": 1, "tanh": 1, "asinh": 1, "acosh": 1, "atanh": 1,
+    "exp": 1, "expm1": 1, "log": 1, "log10": 1, "log2": 1, "log1p": 1,
+    "sqrt": 1, "pow": 2, "hypot": 2, "fabs": 1, "floor": 1, "ceil": 1, "trunc": 1,
+    "degrees": 1, "radians": 1,
+}
+CONSTANTES_JIT = {"pi", "e", "tau", "inf"}
+# Funciones integradas admitidas
+INTEGRADAS_JIT = {"abs": 1, "min": 2, "max": 2}
+# Núcleos compilados que se conservan (por expresión y variables)
+CAPACIDAD_NUCLEOS = 32
+
+_OPERADORES = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow, ast.Mod, ast.FloorDiv, ast.UAdd, ast.USub,
+               ast.Not, ast.And, ast.Or, ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE)
+_NODOS = (ast.Expression, ast.BinOp, ast.UnaryOp, ast.BoolOp, ast.Compare, ast.IfExp, ast.Call,
+          ast.Attribute, ast.Name, ast.Load, ast.Constant) + _OPERADORES
+
+_nucleos = MemoriaLRU(CAPACIDAD_NUCLEOS)
+# Protege _nucleos y _compilando; cada expresión en compilación tiene su evento
+_cerrojo = threading.Lock()
+_compilando = {}
+_numba = None
+
+
+def numba_disponible() -> bool:
+    """Indica si Numba está instalado (sin importarlo: su importación es lenta)"""
+    return importlib.util.find_spec("numba") is not None
+
+
+def expresion_compatible(func_str: str, variables: Sequence[str]) -> bool:
+    """Comprueba que la expresión solo usa construcciones con el mismo significado en Numba"""
+    try:
+        arbol = ast.parse(func_str, mode="eval")
+    except SyntaxError:
+        return False
+    variables = set(variables)
+    for nodo in ast.walk(arbol):
+        if not isinstance(nodo, _NODOS):
+            return False
+        if isinstance(nodo, ast.Constant) and (isinstance(nodo.value, bool)
+                                               or not isinstance(nodo.value, (int, float))):
+            return False
+        if isinstance(nodo, ast.Attribute):
+            if not (isinstance(nodo.value, ast.Name) and nodo.value.id == "math"
+                    and nodo.attr in FUNCIONES_JIT.keys() | CONSTANTES_JIT):
+                return False
+        if isinstance(nodo, ast.Name) and nodo.id not in variables and nodo.id != "math" \
+                and nodo.id not in INTEGRADAS_JIT:
+            return False
+        if isinstance(nodo, ast.Call):
+            if nodo.keywords:
+                return False
+            if isinstance(nodo.func, ast.Attribute):
+                aridad = FUNCIONES_JIT.get(nodo.func.attr)
+            elif isinstance(nodo.func, ast.Name):
+                aridad = INTEGRADAS_JIT.get(nodo.func.id)
+            else:
+                aridad = None
+            if aridad != len(nodo.args):
+                return False
+    # Las funciones solo pueden aparecer llamadas y `math` solo como prefijo
+    llamadas = {id(nodo.func) for nodo in ast.walk(arbol) if isinstance(nodo, ast.Call)}
+    for nodo in ast.walk(arbol):
+        if isinstance(nodo, ast.Name) and nodo.id in INTEGRADAS_JIT and id(nodo) not in llamadas:
+            return False
+        if isinstance(nodo, ast.Attribute) and nodo.attr in FUNCIONES_JIT and id(nodo) not in llamadas:
+            return False
+    atributos = {id(nodo.value) for nodo in ast.walk(arbol) if isinstance(nodo, ast.Attribute)}
+    return all(id(nodo) in atributos for nodo in ast.walk(arbol)
+               if isinstance(nodo, ast.Name) and nodo.id == "math")
+
+
+def fuente_nucleo(func_str: str, variables: Sequence[str]) -> str:
+    """Código Python del núcleo de un bloque: muestra, evalúa, guarda los primeros puntos y acumula.
+
+    Devuelve la media y la suma de cuadrados centrada (M2) del bloque de volumen × f. Los nombres
+    internos empiezan por doble guion bajo para no chocar con las variables de la integral.
+    """
+    lineas = [
+        "def __nucleo(__m, __inferiores, __anchos, __volumen, __puntos, __valores):",
+        "    __media = 0.0",
+        "    __m2 = 0.0",
+        "    __guardar = __valores.shape[0]",
+        "    for __i in range(__m):",
+    ]
+    for j, variable in enumerate(variables):
+        lineas.append(f"        {variable} = __inferiores[{j}] + __anchos[{j}] * np.random.random()")
+    lineas += [
+        f"        __v = float({func_str})",
+        # Los puntos donde la función no está definida cuentan como 0, igual que en NumPy
+        "        if not math.isfinite(__v):",
+        "            __v = 0.0",
+        "        if __i < __guardar:",
+    ]
+    for j, variable in enumerate(variables):
+        lineas.append(f"            __puntos[__i, {j}] = {variable}")
+    lineas += [
+        "            __valores[__i] = __v",
+        "        __v = __v * __volumen",
+        "        __delta = __v - __media",
+        "        __media += __delta / (__i + 1)",
+        "        __m2 += __delta * (__v - __media)",
+        "    return __media, __m2",
+    ]
+    return "\n".join(lineas) + "\n"
+
+
+def _sembrar(semilla):
+    np.random.seed(semilla)
+
+
+class NucleoJIT:
+    """Núcleo compilado de una expresión: `sembrar` fija el generador y `bloque` procesa m muestras.
+
+    El generador es el de Numba (Mersenne Twister por hilo), no el de NumPy: con la misma semilla
+    el resultado es reproducible, pero no coincide muestra a muestra con el motor de NumPy.
+    """
+
+    def __init__(self, sembrar: Callable, bloque: Callable):
+        self.sembrar = sembrar
+        self.bloque = bloque
+
+
+def construir_nucleo(func_str: str, variables: Sequence[str], compilar: Optional[Callable] = None) -> NucleoJIT:
+    """Genera el núcleo y lo pasa por `compilar` (por defecto numba.njit); sin compilar es Python puro"""
+    espacio = {"math": math, "np": np}
+    exec(compile(fuente_nucleo(func_str, variables), "<núcleo>", "exec"), espacio)
+    bloque, sembrar = espacio["__nucleo"], _sembrar
+    if compilar is not None:
+        bloque, sembrar = compilar(bloque), compilar(sembrar)
+    return NucleoJIT(sembrar, bloque)
+
+
+def nucleo_jit(func_str: str, variables: Sequence[str]) -> Optional[NucleoJIT]:
+    """Núcleo compilado de la expresión, o None si no hay Numba o la expresión no es compatible.
+
+    Se guarda por expresión y variables: compilar cuesta del orden de un segundo y solo se hace
+    la primera vez. Un fallo de compilación también se recuerda para no repetirlo. La compilación
+    se hace fuera del cerrojo: solo espera quien pide esa misma expresión mientras se compila.
+    """
+    clave = (func_str, tuple(variables))
+    while True:
+        with _cerrojo:
+            encontrado, nucleo = _nucleos.obtener(clave)
+            if encontrado:
+                return nucleo
+            compilando = _compilando.get(clave)
+            if compilando is None:
+                compilando = _compilando[clave] = threading.Event()
+                break
+        compilando.wait()
+
+    try:
+        nucleo = _compilar(func_str, variables)
+        with _cerrojo:
+            _nucleos.guardar(clave, nucleo)
+    finally:
+        # Si no se guardó nada, quien esperaba vuelve a intentarlo
+        with _cerrojo:
+            del _compilando[clave]
+        compilando.set()
+    return nucleo
+
+
+def _compilar(func_str: str, variables: Sequence[str]) -> Optional[NucleoJIT]:
+    """Compila el núcleo con Numba; None si no es posible"""
+    global _numba
+    if not (numba_disponible() and expresion_compatible(func_str, variables)):
+        return None
+    try:
+        if _numba is None:
+            import numba
+            _numba = numba
+        # error_model="numpy": 1/0 da inf (luego 0) en lugar de lanzar ZeroDivisionError
+        compilar = lambda funcion: _numba.njit(funcion, error_model="numpy")
+        nucleo = construir_nucleo(func_str, variables, compilar)
+        # Compilación anticipada con un bloque vacío: los errores de tipos aparecen aquí
+        nucleo.sembrar(0)
+        dimension = len(variables)
+        nucleo.bloque(0, np.zeros(dimension), np.ones(dimension), 1.0,
+                      np.empty((0, dimension)), np.empty(0))
+    except Exception:
+        return None
+    return nucleo
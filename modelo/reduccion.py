@@ -0,0 +1,292 @@
+import numpy as np
+from typing import Optional, Sequence
+from modelo.acumulador import AcumuladorWelford
+from modelo.funciones import compilar_funcion
+from modelo.muestreadores import Muestreador
+
+
+class AcumuladorAntitetico:
+    """Acumula pares antitéticos f(u), f(1-u) y, aparte, los valores individuales"""
+
+    __slots__ = ("pares", "simple")
+
+    def __init__(self):
+        self.pares = AcumuladorWelford()
+        self.simple = AcumuladorWelford()
+
+    def agregar(self, valores: np.ndarray):
+        """Recibe [f(u₁..uₘ), f(1-u₁..1-uₘ)] concatenados"""
+        m = len(valores) // 2
+        self.pares.agregar(0.5 * (valores[:m] + valores[m:]))
+        self.simple.agregar(valores)
+
+    def combinar(self, otro: "AcumuladorAntitetico"):
+        self.pares.combinar(otro.pares)
+        self.simple.combinar(otro.simple)
+
+    @property
+    def n(self) -> int:
+        return self.simple.n
+
+    @property
+    def media(self) -> float:
+        return self.pares.media
+
+    @property
+    def varianza(self) -> float:
+        return self.simple.varianza
+
+    @property
+    def error_estandar(self) -> float:
+        return self.pares.error_estandar
+
+    @property
+    def factor_reduccion(self) -> Optional[float]:
+        return _factor(self.simple, self.error_estandar)
+
+
+class AcumuladorEstratificado:
+    """Media y varianza por estrato; la estimación pondera cada estrato por igual"""
+
+    __slots__ = ("n_estrato", "media_estrato", "m2_estrato", "simple")
+
+    def __init__(self, estratos: int):
+        self.n_estrato = np.zeros(estratos, dtype=np.int64)
+        self.media_estrato = np.zeros(estratos)
+        self.m2_estrato = np.zeros(estratos)
+        self.simple = AcumuladorWelford()
+
+    def agregar(self, valores: np.ndarray, celdas: np.ndarray):
+        """Incorpora un bloque de valores con el estrato al que pertenece cada uno"""
+        k = len(self.n_estrato)
+        n_b = np.bincount(celdas, minlength=k)
+        con_datos = n_b > 0
+        media_b = np.zeros(k)
+        media_b[con_datos] = np.bincount(celdas, weights=valores, minlength=k)[con_datos] / n_b[con_datos]
+        m2_b = np.bincount(celdas, weights=np.square(valores - media_b[celdas]), minlength=k)
+        self._fusionar(n_b, media_b, m2_b)
+        self.simple.agregar(valores)
+
+    def combinar(self, otro: "AcumuladorEstratificado"):
+        self._fusionar(otro.n_estrato, otro.media_estrato, otro.m2_estrato)
+        self.simple.combinar(otro.simple)
+
+    def _fusionar(self, n_b: np.ndarray, media_b: np.ndarray, m2_b: np.ndarray):
+        # Fórmula de Chan aplicada estrato a estrato
+        n_a = self.n_estrato
+        n_total = n_a + n_b
+        peso = np.divide(n_b, n_total, out=np.zeros(len(n_total)), where=n_total > 0)
+        delta = media_b - self.media_estrato
+        self.media_estrato = self.media_estrato + delta * peso
+        self.m2_estrato = self.m2_estrato + m2_b + delta * delta * n_a * peso
+        self.n_estrato = n_total
+
+    @property
+    def n(self) -> int:
+        return self.simple.n
+
+    @property
+    def media(self) -> float:
+        return float(self.media_estrato.mean())
+
+    @property
+    def varianza(self) -> float:
+        return self.simple.varianza
+
+    @property
+    def error_estandar(self) -> float:
+        if np.any(self.n_estrato < 2):
+            return float("inf")
+        varianzas = self.m2_estrato / (self.n_estrato - 1)
+        return float(np.sqrt(np.sum(varianzas / self.n_estrato)) / len(self.n_estrato))
+
+    @property
+    def factor_reduccion(self) -> Optional[float]:
+        return _factor(self.simple, self.error_estandar)
+
+
+class AcumuladorControl:
+    """Momentos conjuntos de f y de la variable de control g (Welford bivariante)"""
+
+    __slots__ = ("n", "media_f", "media_g", "m2_f", "m2_g", "c_fg", "integral_g")
+
+    def __init__(self, integral_g: float):
+        self.n = 0
+        self.media_f = self.media_g = 0.0
+        self.m2_f = self.m2_g = self.c_fg = 0.0
+        self.integral_g = float(integral_g)
+
+    def agregar(self, valores_f: np.ndarray, valores_g: np.ndarray):
+        """Incorpora un bloque de valores de f y g evaluados en los mismos puntos"""
+        m = len(valores_f)
+        if m == 0:
+            return
+        media_f, media_g = float(valores_f.mean()), float(valores_g.mean())
+        df, dg = valores_f - media_f, valores_g - media_g
+        self._fusionar(m, media_f, media_g, float(df @ df), float(dg @ dg), float(df @ dg))
+
+    def combinar(self, otro: "AcumuladorControl"):
+        if otro.n:
+            self._fusionar(otro.n, otro.media_f, otro.media_g, otro.m2_f, otro.m2_g, otro.c_fg)
+
+    def _fusionar(self, n_b, media_f, media_g, m2_f, m2_g, c_fg):
+        n_a = self.n
+        n_total = n_a + n_b
+        delta_f = media_f - self.media_f
+        delta_g = media_g - self.media_g
+        factor = n_a * n_b / n_total
+        self.media_f += delta_f * n_b / n_total
+        self.media_g += delta_g * n_b / n_total
+        self.m2_f += m2_f + delta_f * delta_f * factor
+        self.m2_g += m2_g + delta_g * delta_g * factor
+        self.c_fg += c_fg + delta_f * delta_g * factor
+        self.n = n_total
+
+    @property
+    def beta(self) -> float:
+        """Coeficiente óptimo estimado Cov(f,g)/Var(g)"""
+        return self.c_fg / self.m2_g if self.m2_g > 0 else 0.0
+
+    @property
+    def media(self) -> float:
+        return self.media_f - self.beta * (self.media_g - self.integral_g)
+
+    @property
+    def varianza(self) -> float:
+        return self.m2_f / (self.n - 1) if self.n > 1 else 0.0
+
+    @property
+    def varianza_residual(self) -> float:
+        """Varianza de f - β·g"""
+        return max(self.m2_f - self.beta * self.c_fg, 0.0) / (self.n - 2) if self.n > 2 else 0.0
+
+    @property
+    def error_estandar(self) -> float:
+        return (self.varianza_residual / self.n) ** 0.5 if self.n else 0.0
+
+    @property
+    def factor_reduccion(self) -> Optional[float]:
+        if self.varianza_residual == 0:
+            return None
+        return self.varianza / self.varianza_residual
+
+
+class Reduccion:
+    """Técnica de reducción de varianza: decide cómo se generan y se acumulan las muestras"""
+
+    nombre = "ninguna"
+    # Las muestras se generan en grupos de este tamaño: N se redondea hacia abajo a un múltiplo
+    multiplo = 1
+
+    def preparar(self, variables: Sequence[str], limites):
+        """Se llama una vez antes de muestrear, con las variables y límites de la integral"""
+
+    def validar(self, n: int):
+        """Comprueba que n muestras bastan para aplicar la técnica"""
+
+    def crear_acumulador(self):
+        return AcumuladorWelford()
+
+    def generar(self, muestreador: Muestreador, m: int, acumulador) -> np.ndarray:
+        """Puntos en [0,1)^d para el siguiente bloque (m, que es múltiplo de `multiplo`)"""
+        return muestreador.generar(m)
+
+    def agregar(self, acumulador, u: np.ndarray, puntos: np.ndarray, valores: np.ndarray):
+        """Incorpora los valores (volumen × f) del bloque"""
+        acumulador.agregar(valores)
+
+
+class Antiteticas(Reduccion):
+    """Variables antitéticas: cada punto u se empareja con su reflejo 1-u"""
+
+    nombre = "antitéticas"
+    multiplo = 2
+
+    def validar(self, n):
+        if n < 2:
+            raise ValueError("Las variables antitéticas necesitan al menos 2 puntos")
+
+    def crear_acumulador(self):
+        return AcumuladorAntitetico()
+
+    def generar(self, muestreador, m, acumulador):
+        u = muestreador.generar(m // 2)
+        return np.concatenate([u, 1.0 - u])
+
+
+class Estratificado(Reduccion):
+    """Muestreo estratificado en k estratos iguales por eje, con asignación proporcional"""
+
+    nombre = "estratificado"
+
+    def __init__(self, estratos: int = 10):
+        if estratos < 1:
+            raise ValueError("El número de estratos debe ser al menos 1")
+        self.estratos = int(estratos)
+        self.dimension = 1
+
+    @property
+    def celdas(self) -> int:
+        """Número total de celdas (k^d)"""
+        return self.estratos ** self.dimension
+
+    def preparar(self, variables, limites):
+        self.dimension = len(limites)
+
+    def validar(self, n):
+        # Se necesitan al menos dos muestras por celda para estimar su varianza
+        if n < 2 * self.celdas:
+            raise ValueError(f"El muestreo estratificado con {self.celdas:,} celdas necesita al menos "
+                             f"{2 * self.celdas:,} puntos")
+
+    def crear_acumulador(self):
+        return AcumuladorEstratificado(self.celdas)
+
+    def generar(self, muestreador, m, acumulador):
+        # Las celdas se recorren cíclicamente para repartir las muestras por igual
+        celdas = (acumulador.n + np.arange(m)) % self.celdas
+        coordenadas = np.empty((m, self.dimension))
+        for j in range(self.dimension):
+            coordenadas[:, j] = celdas % self.estratos
+            celdas //= self.estratos
+        return (coordenadas + muestreador.generar(m)) / self.estratos
+
+    def agregar(self, acumulador, u, puntos, valores):
+        indices = np.minimum((u * self.estratos).astype(np.int64), self.estratos - 1)
+        celdas = np.zeros(len(u), dtype=np.int64)
+        for j in reversed(range(self.dimension)):
+            celdas = celdas * self.estratos + indices[:, j]
+        acumulador.agregar(valores, celdas)
+
+
+class VariableControl(Reduccion):
+    """Variable de control g con integral conocida sobre el mismo dominio"""
+
+    nombre = "variable de control"
+
+    def __init__(self, func_control: str, integral_control: float):
+        self.func_control = func_control
+        self.integral_control = float(integral_control)
+        self._g = None
+        self._volumen = 1.0
+
+    def preparar(self, variables, limites):
+        self._g = compilar_funcion(self.func_control, variables)
+        self._volumen = float(np.prod([b - a for a, b in limites]))
+
+    def crear_acumulador(self):
+        return AcumuladorControl(self.integral_control)
+
+    def agregar(self, acumulador, u, puntos, valores):
+        acumulador.agregar(valores, self._volumen * self._g(*puntos.T))
+
+    def __getstate__(self):
+        # La función compilada no se puede serializar; se vuelve a compilar en cada proceso
+        return {**self.__dict__, "_g": None}
+
+
+def _factor(simple: AcumuladorWelford, error_estandar: float) -> Optional[float]:
+    """Cociente entre la varianza del estimador simple y la del estimador reducido"""
+    if simple.n == 0 or error_estandar == 0 or not np.isfinite(error_estandar):
+        return None
+    return (simple.varianza / simple.n) / error_estandar ** 2
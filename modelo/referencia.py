@@ -0,0 +1,108 @@
+import multiprocessing
+import threading
+from typing import Callable, Optional, Sequence
+from modelo.cache_exacto import MemoriaLRU
+
+# Tiempo máximo (s) para el cálculo simbólico, incluido el arranque del proceso
+TIEMPO_LIMITE_SIMBOLICO = 8.0
+# Cada cuánto se comprueba si el cálculo se canceló mientras se espera al proceso
+INTERVALO_ESPERA = 0.1
+
+
+class ValorReferencia:
+    """Valor con el que comparar la estimación: exacto (SymPy) o por cuadratura numérica"""
+
+    __slots__ = ("valor", "error", "metodo")
+
+    def __init__(self, valor: float, error: float = 0.0, metodo: str = "exacto"):
+        self.valor = valor
+        self.error = error
+        self.metodo = metodo
+
+    @property
+    def exacto(self) -> bool:
+        return self.metodo == "exacto"
+
+
+def ejecutar_con_limite(funcion: Callable, argumentos: Sequence, tiempo_limite: float = TIEMPO_LIMITE_SIMBOLICO,
+                        cancelar: Optional[threading.Event] = None):
+    """Ejecuta funcion(*argumentos) en un proceso aparte y devuelve su resultado.
+
+    Devuelve None si falla, si supera el tiempo límite o si se activa `cancelar`; en esos casos el
+    proceso se termina, de modo que un cálculo que no acaba nunca no bloquea a quien espera.
+    La función debe poder importarse desde el proceso hijo (se arranca con 'spawn').
+    """
+    contexto = multiprocessing.get_context("spawn")
+    receptor, emisor = contexto.Pipe(duplex=False)
+    proceso = contexto.Process(target=_ejecutar_y_enviar, args=(emisor, funcion, tuple(argumentos)), daemon=True)
+    proceso.start()
+    emisor.close()
+    try:
+        esperado = 0.0
+        while esperado < tiempo_limite:
+            if cancelar is not None and cancelar.is_set():
+                return None
+            if receptor.poll(min(INTERVALO_ESPERA, tiempo_limite - esperado)):
+                return receptor.recv()
+            esperado += INTERVALO_ESPERA
+        return None
+    except (EOFError, OSError):
+        # El proceso terminó sin enviar nada
+        return None
+    finally:
+        if proceso.is_alive():
+            proceso.terminate()
+        proceso.join()
+        receptor.close()
+
+
+def _ejecutar_y_enviar(emisor, funcion: Callable, argumentos: tuple):
+    """Punto de entrada del proceso hijo"""
+    try:
+        resultado = funcion(*argumentos)
+    except Exception:
+        resultado = None
+    emisor.send(resultado)
+    emisor.close()
+
+
+class CalculadorReferencia:
+    """Obtiene el valor de referencia sin bloquear: SymPy con tiempo límite y, si no, cuadratura.
+
+    `simbolico` es la función que calcula el valor exacto (se ejecuta en otro proceso) y
+    `numerico` la que integra por cuadratura y devuelve (valor, error estimado). Los resultados
+    se recuerdan por función y límites para no repetir el proceso en cálculos sucesivos.
+    """
+
+    CAPACIDAD_MEMORIA = 64
+
+    def __init__(self, simbolico: Callable[..., Optional[float]], numerico: Callable[..., tuple],
+                 tiempo_limite: float = TIEMPO_LIMITE_SIMBOLICO):
+        self.simbolico = simbolico
+        self.numerico = numerico
+        self.tiempo_limite = tiempo_limite
+        self._memoria = MemoriaLRU(self.CAPACIDAD_MEMORIA)
+        self._cerrojo = threading.Lock()
+
+    def calcular(self, func_str: str, *limites: float,
+                 cancelar: Optional[threading.Event] = None) -> Optional[ValorReferencia]:
+        clave = (func_str,) + tuple(float(l) for l in limites)
+        with self._cerrojo:
+            encontrado, referencia = self._memoria.obtener(clave)
+        if encontrado:
+            return referencia
+
+        valor = ejecutar_con_limite(self.simbolico, (func_str,) + tuple(limites), self.tiempo_limite, cancelar)
+        if valor is not None:
+            referencia = ValorReferencia(valor)
+        else:
+            try:
+                referencia = ValorReferencia(*self.numerico(func_str, *limites), metodo="cuadratura")
+            except Exception:
+                referencia = None
+
+        # Un resultado obtenido tras cancelar podría no ser el exacto: no se recuerda
+        if cancelar is None or not cancelar.is_set():
+            with self._cerrojo:
+                self._memoria.guardar(clave, referencia)
+        return referencia
@@ -0,0 +1,212 @@
+import math
+import numpy as np
+from statistics import NormalDist
+from typing import Dict, Optional, Sequence, Tuple
+
+
+class ResultadoMonteCarlo:
+    """Resultado de una integración Monte Carlo con las muestras en arrays contiguos"""
+
+    __slots__ = ("integral", "puntos", "fx", "n", "func", "limites", "variables",
+                 "varianza", "error_estandar", "nivel_confianza", "tolerancia_alcanzada", "muestreador",
+                 "reduccion", "factor_reduccion", "motor")
+
+    def __init__(self, integral: float, puntos: np.ndarray, fx: np.ndarray, n: int, func: str,
+                 limites: Sequence[Tuple[float, float]], variables: Optional[Sequence[str]] = None,
+                 varianza: float = 0.0, error_estandar: Optional[float] = None,
+                 nivel_confianza: float = 0.95, tolerancia_alcanzada: Optional[bool] = None,
+                 muestreador: str = "pseudo", reduccion: str = "ninguna",
+                 factor_reduccion: Optional[float] = None, motor: str = "numpy"):
+        self.integral = float(integral)
+        # Matriz (m, d) en orden por columnas: cada coordenada es un array float64 contiguo
+        self.puntos = np.asfortranarray(np.reshape(puntos, (-1, len(limites))), dtype=np.float64)
+        self.fx = np.ascontiguousarray(fx, dtype=np.float64)
+        self.n = int(n)
+        self.func = func
+        self.limites = tuple(tuple(map(float, lim)) for lim in limites)
+        self.variables = tuple(variables) if variables is not None else variables_por_defecto(len(limites))
+        # Varianza muestral del estimador por muestra (volumen × f)
+        self.varianza = float(varianza)
+        if error_estandar is None:
+            error_estandar = math.sqrt(self.varianza / self.n) if self.n > 0 else 0.0
+        self.error_estandar = float(error_estandar)
+        self.nivel_confianza = float(nivel_confianza)
+        # None cuando el cálculo se hizo con N fijo
+        self.tolerancia_alcanzada = tolerancia_alcanzada
+        # Tipo de muestreo usado ('pseudo', 'sobol', 'halton' o 'reticula')
+        self.muestreador = muestreador
+        # Técnica de reducción de varianza y cuánto redujo la varianza frente a Monte Carlo simple
+        self.reduccion = reduccion
+        self.factor_reduccion = factor_reduccion
+        # Motor que evaluó las muestras: 'numpy' o 'jit' (núcleo compilado con Numba)
+        self.motor = motor
+
+    @property
+    def x(self) -> np.ndarray:
+        """Primera coordenada de los puntos almacenados"""
+        return self.puntos[:, 0]
+
+    @property
+    def y(self) -> Optional[np.ndarray]:
+        """Segunda coordenada (None en 1D)"""
+        return self.puntos[:, 1] if self.dimension > 1 else None
+
+    def coordenada(self, variable: str) -> np.ndarray:
+        """Coordenadas de los puntos almacenados en la variable indicada"""
+        return self.puntos[:, self.variables.index(variable)]
+
+    @property
+    def z(self) -> np.ndarray:
+        """Valores f(x,y) en 2D (alias de fx)"""
+        return self.fx
+
+    @property
+    def dimension(self) -> int:
+        """Número de variables de integración"""
+        return len(self.limites)
+
+    @property
+    def semiancho(self) -> float:
+        """Semiancho del intervalo de confianza al nivel indicado"""
+        return semiancho_confianza(self.error_estandar, self.nivel_confianza)
+
+    @property
+    def intervalo_confianza(self) -> Tuple[float, float]:
+        """Intervalo de confianza normal para la integral"""
+        return self.integral - self.semiancho, self.integral + self.semiancho
+
+    def __len__(self) -> int:
+        """Número de puntos almacenados"""
+        return len(self.puntos)
+
+    def __repr__(self) -> str:
+        return (f"ResultadoMonteCarlo(integral={self.integral!r}, error_estandar={self.error_estandar!r}, "
+                f"n={self.n}, func={self.func!r})")
+
+
+class ResultadoMultiple:
+    """Integrales de varias funciones estimadas con las mismas muestras (números aleatorios comunes).
+
+    Además de la estimación y el error de cada una, guarda la covarianza entre los estimadores,
+    con la que se obtiene el error de cualquier combinación lineal (p. ej. una diferencia).
+    """
+
+    __slots__ = ("funciones", "integrales", "errores_estandar", "covarianza", "n", "limites", "variables",
+                 "nivel_confianza", "muestreador")
+
+    def __init__(self, funciones: Sequence[str], integrales: np.ndarray, covarianza: np.ndarray, n: int,
+                 limites: Sequence[Tuple[float, float]], variables: Optional[Sequence[str]] = None,
+                 nivel_confianza: float = 0.95, muestreador: str = "pseudo"):
+        self.funciones = tuple(funciones)
+        self.integrales = np.asarray(integrales, dtype=np.float64)
+        # Covarianza (k, k) de los estimadores de las integrales
+        self.covarianza = np.asarray(covarianza, dtype=np.float64)
+        self.errores_estandar = np.sqrt(np.diag(self.covarianza))
+        self.n = int(n)
+        self.limites = tuple(tuple(map(float, lim)) for lim in limites)
+        self.variables = tuple(variables) if variables is not None else variables_por_defecto(len(limites))
+        self.nivel_confianza = float(nivel_confianza)
+        self.muestreador = muestreador
+
+    @property
+    def correlacion(self) -> np.ndarray:
+        """Matriz de correlación entre los estimadores"""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            correlacion = self.covarianza / np.outer(self.errores_estandar, self.errores_estandar)
+        return np.nan_to_num(correlacion)
+
+    @property
+    def semianchos(self) -> np.ndarray:
+        """Semiancho del intervalo de confianza de cada integral"""
+        return semiancho_confianza(1.0, self.nivel_confianza) * self.errores_estandar
+
+    @property
+    def intervalos_confianza(self) -> np.ndarray:
+        """Intervalos de confianza normales, uno por fila"""
+        return np.column_stack([self.integrales - self.semianchos, self.integrales + self.semianchos])
+
+    def combinacion(self, pesos: Sequence[float]) -> Tuple[float, float]:
+        """Estimación y error estándar de Σ wᵢ·Iᵢ teniendo en cuenta la covarianza"""
+        pesos = np.asarray(pesos, dtype=np.float64)
+        return float(pesos @ self.integrales), math.sqrt(max(float(pesos @ self.covarianza @ pesos), 0.0))
+
+    def diferencia(self, i: int, j: int) -> Tuple[float, float]:
+        """Estimación y error estándar de Iᵢ − Iⱼ"""
+        pesos = np.zeros(len(self))
+        pesos[i] += 1.0
+        pesos[j] -= 1.0
+        return self.combinacion(pesos)
+
+    def __len__(self) -> int:
+        """Número de funciones integradas"""
+        return len(self.funciones)
+
+    def __repr__(self) -> str:
+        return (f"ResultadoMultiple(funciones={self.funciones!r}, integrales={self.integrales!r}, "
+                f"errores_estandar={self.errores_estandar!r}, n={self.n})")
+
+
+class ResultadoBarrido:
+    """Integrales de f(x; p) para cada combinación de valores de los parámetros, con las mismas muestras.
+
+    `integrales` y `errores_estandar` tienen un eje por parámetro, en el orden de `parametros`.
+    """
+
+    __slots__ = ("func", "parametros", "integrales", "errores_estandar", "n", "limites", "variables",
+                 "nivel_confianza", "muestreador")
+
+    def __init__(self, func: str, parametros: Dict[str, np.ndarray], integrales: np.ndarray,
+                 errores_estandar: np.ndarray, n: int, limites: Sequence[Tuple[float, float]],
+                 variables: Optional[Sequence[str]] = None, nivel_confianza: float = 0.95,
+                 muestreador: str = "pseudo"):
+        self.func = func
+        self.parametros = {nombre: np.asarray(valores, dtype=np.float64) for nombre, valores in parametros.items()}
+        forma = tuple(len(valores) for valores in self.parametros.values())
+        self.integrales = np.reshape(np.asarray(integrales, dtype=np.float64), forma)
+        self.errores_estandar = np.reshape(np.broadcast_to(np.asarray(errores_estandar, dtype=np.float64),
+                                                           (self.integrales.size,)), forma)
+        self.n = int(n)
+        self.limites = tuple(tuple(map(float, lim)) for lim in limites)
+        self.variables = tuple(variables) if variables is not None else variables_por_defecto(len(limites))
+        self.nivel_confianza = float(nivel_confianza)
+        self.muestreador = muestreador
+
+    @property
+    def forma(self) -> Tuple[int, ...]:
+        """Número de valores de cada parámetro"""
+        return self.integrales.shape
+
+    @property
+    def semianchos(self) -> np.ndarray:
+        """Semiancho del intervalo de confianza de cada integral"""
+        return semiancho_confianza(1.0, self.nivel_confianza) * self.errores_estandar
+
+    @property
+    def intervalos_confianza(self) -> np.ndarray:
+        """Extremos inferior y superior de cada intervalo, en un último eje de tamaño 2"""
+        return np.stack([self.integrales - self.semianchos, self.integrales + self.semianchos], axis=-1)
+
+    def rejilla(self) -> Dict[str, np.ndarray]:
+        """Valor de cada parámetro en cada celda, con la misma forma que las integrales"""
+        mallas = np.meshgrid(*self.parametros.values(), indexing="ij")
+        return dict(zip(self.parametros, mallas))
+
+    def __len__(self) -> int:
+        """Número de combinaciones de parámetros"""
+        return self.integrales.size
+
+    def __repr__(self) -> str:
+        return (f"ResultadoBarrido(func={self.func!r}, parametros={list(self.parametros)}, "
+                f"forma={self.forma}, n={self.n})")
+
+
+def semiancho_confianza(error_estandar: float, nivel_confianza: float = 0.95) -> float:
+    """Semiancho z·σ del intervalo de confianza normal bilateral"""
+    return NormalDist().inv_cdf(0.5 + nivel_confianza / 2) * error_estandar
+
+
+def variables_por_defecto(dimension: int) -> Tuple[str, ...]:
+    """Nombres de variable usados si no se indican: x, y, z y a partir de 4D x1..xd"""
+    if dimension <= 3:
+        return ("x", "y", "z")[:dimension]
+    return tuple(f"x{i}" for i in range(1, dimension + 1))
@@ -0,0 +1,77 @@
+import threading
+import time
+from typing import Callable, Optional
+from modelo.instrumentacion import SIN_INSTRUMENTACION
+
+
+class CalculoCancelado(Exception):
+    """El cálculo se canceló entre dos bloques; lleva el resultado parcial si lo hay"""
+
+    def __init__(self, resultado=None):
+        super().__init__("Cálculo cancelado")
+        self.resultado = resultado
+
+
+class Progreso:
+    """Instantánea del avance de un cálculo"""
+
+    __slots__ = ("hechos", "total", "estimacion", "error_estandar", "transcurrido")
+
+    def __init__(self, hechos: int, total: int, estimacion: Optional[float], transcurrido: float,
+                 error_estandar: Optional[float] = None):
+        self.hechos = hechos
+        self.total = total
+        self.estimacion = estimacion
+        self.error_estandar = error_estandar
+        self.transcurrido = transcurrido
+
+    @property
+    def fraccion(self) -> float:
+        return min(self.hechos / self.total, 1.0) if self.total else 0.0
+
+    @property
+    def eta(self) -> Optional[float]:
+        """Segundos restantes estimados al ritmo actual"""
+        if not self.hechos or not self.total:
+            return None
+        return self.transcurrido * max(self.total - self.hechos, 0) / self.hechos
+
+
+class Seguimiento:
+    """Informa del avance de un cálculo y transmite la petición de cancelarlo.
+
+    El callback recibe un Progreso y se llama como mucho una vez cada `intervalo` segundos
+    (salvo al terminar); con intervalo 0 recibe una instantánea tras cada bloque, útil para
+    seguir la convergencia. El motor consulta `cancelado` entre bloques y mide sus etapas con
+    `instrumentacion` (una Instrumentacion, o un sustituto sin coste si no se pasa).
+    """
+
+    def __init__(self, progreso: Optional[Callable[[Progreso], None]] = None,
+                 cancelar: Optional[threading.Event] = None, intervalo: float = 0.1,
+                 instrumentacion=None):
+        self.progreso = progreso
+        self.cancelar = cancelar if cancelar is not None else threading.Event()
+        self.intervalo = intervalo
+        self.instrumentacion = instrumentacion if instrumentacion is not None else SIN_INSTRUMENTACION
+        self.total = 0
+        self.inicio = time.perf_counter()
+        self._ultimo = float("-inf")
+
+    def iniciar(self, total: int):
+        """Fija el número de muestras previsto y reinicia el reloj"""
+        self.total = int(total)
+        self.inicio = time.perf_counter()
+        self._ultimo = float("-inf")
+
+    @property
+    def cancelado(self) -> bool:
+        return self.cancelar.is_set()
+
+    def avance(self, hechos: int, estimacion: Optional[float] = None, error_estandar: Optional[float] = None):
+        """Notifica el avance (limitado a una llamada por intervalo)"""
+        if self.progreso is None:
+            return
+        ahora = time.perf_counter()
+        if ahora - self._ultimo >= self.intervalo or hechos >= self.total:
+            self._ultimo = ahora
+            self.progreso(Progreso(hechos, self.total, estimacion, ahora - self.inicio, error_estandar))
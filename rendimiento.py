@@ -0,0 +1,264 @@
+# rendimiento.py
+"""Mediciones de rendimiento del motor, de los gráficos y del valor exacto, sin ventana (Agg).
+
+Para cada integrando representativo y cada N se mide por etapa:
+    modelo       calcular_integral_nd: tiempo, muestras/s, memoria pico y error frente al exacto
+    grafico      actualizar_grafico_1d/2d de la vista sobre un lienzo Agg (incluye el dibujado)
+    exacto       calcular_valor_exacto_1d/2d sin caché (una vez por integrando)
+    exacto_cache calcular_valor_exacto_1d con la caché ya llena (solo 1D; una caché temporal,
+                 no la del usuario)
+
+Los resultados se guardan en JSON y pueden compararse con una ejecución anterior: una medición
+es una regresión si tarda (o usa memoria) más de (1 + umbral) veces la de referencia.
+
+Uso:
+    python rendimiento.py --guardar base.json
+    python rendimiento.py --comparar base.json --umbral 0.2 --n-maximo 1000000
+"""
+import matplotlib
+matplotlib.use("Agg")
+import argparse
+import json
+import math
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+# Agregar el directorio actual al path para imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from modelo.cache_exacto import CacheIntegrales
+from modelo.modelo import MonteCarloCalculator
+from vista.graficos import GraficoMuestras1D
+from vista.vista_1d import Vista1D
+from vista.vista_2d import Vista2D
+
+# Se incrementa si cambia el formato del JSON
+VERSION_FORMATO = 1
+
+# Integrandos representativos: nombre -> (función, límites)
+INTEGRANDOS = {
+    "polinomio": ("x**3 - 2*x + 1", [(0.0, 2.0)]),
+    "trigonometrica": ("math.sin(x)**2", [(0.0, math.pi)]),
+    "exponencial": ("math.exp(-x)", [(0.0, 5.0)]),
+    "pico": ("1/(1 + 100*(x - 0.5)**2)", [(0.0, 1.0)]),
+    "2d": ("x*y + math.sin(x)*math.cos(y)", [(0.0, 1.0), (0.0, 1.0)]),
+}
+TAMANOS = [10**3, 10**4, 10**5, 10**6, 10**7]
+SEMILLA = 12345
+# Por debajo de este tiempo las diferencias son ruido y no se comparan
+TIEMPO_MINIMO_COMPARABLE = 1e-3
+
+
+def medir(funcion, repeticiones: int = 1):
+    """Mejor tiempo de pared de varias repeticiones y el valor devuelto por la última"""
+    mejor = math.inf
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        valor = funcion()
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor, valor
+
+
+def memoria_pico(funcion) -> float:
+    """Memoria pico (MB) reservada durante la llamada, según tracemalloc (incluye arrays de NumPy)"""
+    tracemalloc.start()
+    try:
+        funcion()
+        return tracemalloc.get_traced_memory()[1] / 2**20
+    finally:
+        tracemalloc.stop()
+
+
+def valor_exacto(func: str, limites):
+    """Valor exacto sin caché (o por cuadratura si SymPy no lo encuentra) y el tiempo que costó"""
+    if len(limites) == 1:
+        calcular = lambda: MonteCarloCalculator.calcular_valor_exacto_1d(func, *limites[0],
+                                                                        cache=CacheIntegrales(":memory:"))
+    else:
+        calcular = lambda: MonteCarloCalculator.calcular_valor_exacto_2d(func, *limites[0], *limites[1])
+    tiempo, exacto = medir(calcular)
+    if exacto is None:
+        if len(limites) == 1:
+            exacto = MonteCarloCalculator.calcular_cuadratura_1d(func, *limites[0])[0]
+        else:
+            exacto = MonteCarloCalculator.calcular_cuadratura_2d(func, *limites[0], *limites[1])[0]
+    return tiempo, float(exacto)
+
+
+def grafico_sin_ventana(dimension: int):
+    """Vista 1D o 2D con solo los atributos que usan sus gráficos, sobre un lienzo Agg sin Tk"""
+    if dimension == 1:
+        vista = Vista1D.__new__(Vista1D)
+        vista.fig_1d = Figure(figsize=(6, 4))
+        vista.canvas_1d = FigureCanvasAgg(vista.fig_1d)
+        vista.ax_1d = vista.fig_1d.add_subplot(111)
+        vista.linea_1d, = vista.ax_1d.plot([], [], 'b-', linewidth=2)
+        vista.muestras_1d = GraficoMuestras1D(vista.ax_1d)
+        return lambda func, limites, resultado: vista.actualizar_grafico_1d(func, *limites[0], resultado)
+    vista = Vista2D.__new__(Vista2D)
+    vista.fig_2d = Figure(figsize=(6, 6))
+    vista.canvas_2d = FigureCanvasAgg(vista.fig_2d)
+    vista.ejes_2d = None
+    vista.superficie_2d = None
+    return lambda func, limites, resultado: vista.actualizar_grafico_2d(func, *limites[0], *limites[1],
+                                                                       resultado)
+
+
+def ejecutar(integrandos, tamanos, repeticiones: int = 3, memoria: bool = True, progreso=None,
+             motor: str = "numpy") -> list:
+    """Mide todas las etapas y devuelve una lista de mediciones (diccionarios)"""
+    mediciones = []
+
+    def anotar(**medicion):
+        mediciones.append(medicion)
+        if progreso is not None:
+            progreso(medicion)
+
+    # La primera importación de SymPy no forma parte del cálculo exacto
+    import sympy
+
+    # La caché en disco es temporal: ni se lee ni se modifica la del usuario
+    with tempfile.TemporaryDirectory() as directorio:
+        cache = CacheIntegrales(Path(directorio) / "integrales.sqlite")
+        try:
+            _medir_integrandos(integrandos, tamanos, repeticiones, memoria, anotar, motor, cache)
+        finally:
+            cache.cerrar()
+    return mediciones
+
+
+def _medir_integrandos(integrandos, tamanos, repeticiones: int, memoria: bool, anotar, motor: str,
+                       cache: CacheIntegrales):
+    """Mide las etapas de cada integrando y las pasa a `anotar`"""
+    for nombre in integrandos:
+        func, limites = INTEGRANDOS[nombre]
+        dimension = len(limites)
+        tiempo_exacto, exacto = valor_exacto(func, limites)
+        anotar(integrando=nombre, dimension=dimension, n=None, etapa="exacto", tiempo_s=tiempo_exacto)
+        if dimension == 1:
+            # Una llamada previa llena la caché temporal; se mide la siguiente
+            MonteCarloCalculator.calcular_valor_exacto_1d(func, *limites[0], cache=cache)
+            tiempo, _ = medir(lambda: MonteCarloCalculator.calcular_valor_exacto_1d(func, *limites[0],
+                                                                                   cache=cache),
+                              repeticiones)
+            anotar(integrando=nombre, dimension=dimension, n=None, etapa="exacto_cache", tiempo_s=tiempo)
+
+        dibujar = grafico_sin_ventana(dimension)
+        # Con el motor JIT, la compilación del núcleo (una vez por expresión) no se mide
+        MonteCarloCalculator.calcular_integral_nd(func, limites, 1, motor=motor)
+        for n in tamanos:
+            calcular = lambda: MonteCarloCalculator.calcular_integral_nd(func, limites, n, semilla=SEMILLA,
+                                                                         motor=motor)
+            # Las N grandes se repiten menos: el ruido relativo ya es pequeño
+            tiempo, resultado = medir(calcular, repeticiones if n <= 10**6 else 1)
+            anotar(integrando=nombre, dimension=dimension, n=n, etapa="modelo", tiempo_s=tiempo,
+                   motor=resultado.motor, muestras_por_s=n / tiempo,
+                   memoria_pico_mb=memoria_pico(calcular) if memoria else None,
+                   error=abs(resultado.integral - exacto), error_estandar=resultado.error_estandar)
+
+            tiempo, _ = medir(lambda: dibujar(func, limites, resultado), repeticiones)
+            anotar(integrando=nombre, dimension=dimension, n=n, etapa="grafico", tiempo_s=tiempo)
+
+
+def informe(mediciones: list) -> dict:
+    """Mediciones con los datos del entorno, listas para guardar en JSON"""
+    return {
+        "version": VERSION_FORMATO,
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "entorno": {"python": platform.python_version(), "numpy": np.__version__,
+                    "matplotlib": matplotlib.__version__, "plataforma": platform.platform(),
+                    "procesador": platform.processor() or platform.machine()},
+        "mediciones": mediciones,
+    }
+
+
+def comparar(base: dict, actual: dict, umbral: float) -> list:
+    """Mediciones que empeoran más del umbral relativo respecto de la base, como textos"""
+    clave = lambda m: (m["integrando"], m["n"], m["etapa"])
+    anteriores = {clave(m): m for m in base["mediciones"]}
+    regresiones = []
+    for medicion in actual["mediciones"]:
+        anterior = anteriores.get(clave(medicion))
+        if anterior is None:
+            continue
+        for campo, unidad in (("tiempo_s", "s"), ("memoria_pico_mb", "MB")):
+            antes, ahora = anterior.get(campo), medicion.get(campo)
+            if antes is None or ahora is None:
+                continue
+            if campo == "tiempo_s" and max(antes, ahora) < TIEMPO_MINIMO_COMPARABLE:
+                continue
+            if ahora > antes * (1 + umbral):
+                regresiones.append(f"{medicion['integrando']} n={medicion['n']} {medicion['etapa']}: "
+                                   f"{campo} {antes:.4g} {unidad} -> {ahora:.4g} {unidad} "
+                                   f"(+{(ahora / antes - 1) * 100:.0f}%)")
+    return regresiones
+
+
+def _linea(medicion: dict) -> str:
+    """Una medición en una línea de la tabla de salida"""
+    n = f"{medicion['n']:>10,}" if medicion["n"] is not None else " " * 10
+    texto = f"{medicion['integrando']:<15}{n} {medicion['etapa']:<13}{medicion['tiempo_s'] * 1000:>11.2f} ms"
+    if "muestras_por_s" in medicion:
+        texto += f"{medicion['muestras_por_s']:>14.3e} m/s"
+        if medicion.get("memoria_pico_mb") is not None:
+            texto += f"{medicion['memoria_pico_mb']:>9.1f} MB"
+        texto += f"   error {medicion['error']:.2e} (EE {medicion['error_estandar']:.2e})"
+    return texto
+
+
+def main(argumentos=None) -> int:
+    parser = argparse.ArgumentParser(description="Mediciones de rendimiento sin ventana (backend Agg)")
+    parser.add_argument("--integrandos", nargs="+", choices=list(INTEGRANDOS), default=list(INTEGRANDOS),
+                        help="integrandos a medir (por defecto, todos)")
+    parser.add_argument("--n-maximo", type=int, default=max(TAMANOS), help="mayor N medido (por defecto 10^7)")
+    parser.add_argument("-r", "--repeticiones", type=int, default=3,
+                        help="repeticiones de cada medición; se guarda la más rápida (por defecto 3)")
+    parser.add_argument("--sin-memoria", action="store_true",
+                        help="no medir la memoria pico (ahorra una ejecución con tracemalloc)")
+    parser.add_argument("--motor", choices=("numpy", "jit"), default="numpy",
+                        help="motor de evaluación del modelo (jit requiere Numba; si no, se usa NumPy)")
+    parser.add_argument("-g", "--guardar", help="archivo JSON donde guardar las mediciones")
+    parser.add_argument("-c", "--comparar", help="JSON de una ejecución anterior con el que comparar")
+    parser.add_argument("-u", "--umbral", type=float, default=0.2,
+                        help="empeoramiento relativo que se considera regresión (por defecto 0.2 = 20%%)")
+    opciones = parser.parse_args(argumentos)
+    if opciones.repeticiones < 1 or opciones.umbral < 0:
+        parser.error("--repeticiones debe ser al menos 1 y --umbral no negativo")
+
+    base = None
+    if opciones.comparar:
+        with open(opciones.comparar, encoding="utf-8") as archivo:
+            base = json.load(archivo)
+        if base.get("version") != VERSION_FORMATO:
+            print(f"{opciones.comparar}: formato {base.get('version')} no comparable", file=sys.stderr)
+            return 2
+
+    tamanos = [n for n in TAMANOS if n <= opciones.n_maximo]
+    mediciones = ejecutar(opciones.integrandos, tamanos, opciones.repeticiones, not opciones.sin_memoria,
+                          progreso=lambda medicion: print(_linea(medicion), flush=True), motor=opciones.motor)
+    actual = informe(mediciones)
+    if opciones.guardar:
+        with open(opciones.guardar, "w", encoding="utf-8") as archivo:
+            json.dump(actual, archivo, indent=2, ensure_ascii=False)
+
+    if base is None:
+        return 0
+    regresiones = comparar(base, actual, opciones.umbral)
+    if not regresiones:
+        print(f"\nSin regresiones respecto de {opciones.comparar} (umbral {opciones.umbral * 100:g}%)")
+        return 0
+    print(f"\n{len(regresiones)} regresiones respecto de {opciones.comparar} (umbral {opciones.umbral * 100:g}%):")
+    for regresion in regresiones:
+        print(f"   {regresion}")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,347 @@
+# servidor.py
+"""Servicio HTTP/JSON local con el mismo motor que la aplicación.
+
+Recibe trabajos con el formato de `batch.py` y devuelve el mismo resultado JSON. Los cálculos se
+ejecutan en un grupo de procesos; el bucle asyncio solo atiende conexiones.
+
+    POST /integrar   cuerpo: un trabajo JSON (funcion, limites o a/b/c/d, n, semilla, ...)
+    GET  /estado     contadores del servicio (peticiones, caché, agrupadas, rechazadas, cola)
+
+Peticiones idénticas (misma función, límites, N, semilla y opciones) se agrupan mientras se
+calculan y se memorizan en una caché LRU. Solo las que fijan `semilla` se agrupan y memorizan:
+sin semilla cada petición pide una estimación independiente. Si la cola de cálculos pendientes
+está llena se responde 503 con Retry-After en lugar de acumular trabajo.
+
+Uso:
+    python servidor.py --puerto 8765 --trabajadores 4
+    python servidor.py --prueba-carga 500 --concurrencia 50    (servidor y clientes en localhost)
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+# Agregar el directorio actual al path para imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from batch import ejecutar_trabajo, normalizar_trabajo
+from modelo.cache_exacto import MemoriaLRU
+
+# Límites de lo que acepta el servicio
+TAMANO_MAXIMO_CUERPO = 1 << 20
+N_MAXIMO = 10**8
+# Segundos sugeridos al cliente para reintentar cuando la cola está llena
+REINTENTAR_TRAS = 1
+
+RAZONES = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 422: "Unprocessable Entity", 500: "Internal Server Error",
+           503: "Service Unavailable"}
+
+
+class ErrorPeticion(Exception):
+    """Petición que no se puede atender; lleva el código HTTP de la respuesta"""
+
+    def __init__(self, codigo: int, mensaje: str):
+        super().__init__(mensaje)
+        self.codigo = codigo
+
+
+class ServicioIntegrales:
+    """Cola acotada de cálculos, agrupación de peticiones idénticas y caché de resultados"""
+
+    def __init__(self, trabajadores: int = 1, capacidad_cola: int = 64, capacidad_cache: int = 1024):
+        self.trabajadores = trabajadores
+        self.cola = asyncio.Queue(maxsize=capacidad_cola)
+        self.cache = MemoriaLRU(capacidad_cache)
+        # Clave -> futuro compartido por todas las peticiones idénticas en curso
+        self.en_curso = {}
+        self.contadores = {"peticiones": 0, "calculadas": 0, "cache": 0, "agrupadas": 0,
+                           "rechazadas": 0, "errores": 0}
+        self._ejecutor = None
+        self._consumidores = []
+
+    def iniciar(self):
+        """Crea el grupo de procesos y una tarea consumidora por proceso"""
+        contexto = multiprocessing.get_context("spawn")
+        self._ejecutor = ProcessPoolExecutor(max_workers=self.trabajadores, mp_context=contexto)
+        self._consumidores = [asyncio.create_task(self._consumir()) for _ in range(self.trabajadores)]
+
+    async def detener(self):
+        for tarea in self._consumidores:
+            tarea.cancel()
+        await asyncio.gather(*self._consumidores, return_exceptions=True)
+        self._ejecutor.shutdown(cancel_futures=True)
+
+    async def _consumir(self):
+        """Pasa los trabajos de la cola al grupo de procesos, uno a la vez por proceso"""
+        bucle = asyncio.get_running_loop()
+        while True:
+            trabajo, futuro = await self.cola.get()
+            try:
+                resultado = await bucle.run_in_executor(self._ejecutor, ejecutar_trabajo, trabajo)
+                if not futuro.done():
+                    futuro.set_result(resultado)
+            except Exception as e:
+                if not futuro.done():
+                    futuro.set_exception(e)
+            finally:
+                self.cola.task_done()
+
+    async def integrar(self, trabajo: dict) -> dict:
+        """Resultado de un trabajo: de la caché, de un cálculo idéntico en curso o de uno nuevo"""
+        self.contadores["peticiones"] += 1
+        identificador = trabajo.get("id")
+        try:
+            trabajo = normalizar_trabajo(trabajo)
+        except (ValueError, TypeError) as e:
+            raise ErrorPeticion(400, str(e))
+        if not 1 <= trabajo["n"] <= N_MAXIMO:
+            raise ErrorPeticion(400, f"n debe estar entre 1 y {N_MAXIMO:,}")
+
+        clave = clave_trabajo(trabajo) if "semilla" in trabajo else None
+        if clave is not None:
+            encontrado, resultado = self.cache.obtener(clave)
+            if encontrado:
+                self.contadores["cache"] += 1
+                return dict(resultado, id=identificador)
+            if clave in self.en_curso:
+                self.contadores["agrupadas"] += 1
+                return dict(await asyncio.shield(self.en_curso[clave]), id=identificador)
+
+        futuro = asyncio.get_running_loop().create_future()
+        try:
+            self.cola.put_nowait((trabajo, futuro))
+        except asyncio.QueueFull:
+            self.contadores["rechazadas"] += 1
+            raise ErrorPeticion(503, "Demasiados cálculos pendientes; reintente más tarde")
+        if clave is not None:
+            self.en_curso[clave] = futuro
+        futuro.add_done_callback(lambda f: self._terminado(clave, f))
+        # shield: si este cliente se desconecta, el cálculo sigue para los agrupados
+        return dict(await asyncio.shield(futuro), id=identificador)
+
+    def _terminado(self, clave, futuro):
+        """Al acabar un cálculo, lo retira de los pendientes y memoriza el resultado si es válido"""
+        if clave is not None:
+            self.en_curso.pop(clave, None)
+        if futuro.cancelled() or futuro.exception() is not None:
+            self.contadores["errores"] += 1
+            return
+        resultado = futuro.result()
+        self.contadores["calculadas"] += 1
+        if "error" in resultado:
+            self.contadores["errores"] += 1
+        elif clave is not None:
+            self.cache.guardar(clave, resultado)
+
+    def estado(self) -> dict:
+        return dict(self.contadores, en_cola=self.cola.qsize(), en_curso=len(self.en_curso),
+                    en_cache=len(self.cache.datos), trabajadores=self.trabajadores)
+
+
+def clave_trabajo(trabajo: dict) -> str:
+    """Clave que identifica un cálculo: el trabajo normalizado sin su id"""
+    campos = {k: v for k, v in trabajo.items() if k not in ("id", "a", "b", "c", "d")}
+    campos["limites"] = [[float(a), float(b)] for a, b in trabajo["limites"]]
+    return json.dumps(campos, sort_keys=True)
+
+
+async def atender_conexion(servicio: ServicioIntegrales, lector, escritor):
+    """Atiende las peticiones HTTP/1.1 de una conexión (se mantiene abierta si el cliente lo pide)"""
+    try:
+        while True:
+            linea = await lector.readline()
+            if not linea:
+                break
+            try:
+                metodo, ruta, version = linea.decode("latin-1").split()
+            except ValueError:
+                await _responder(escritor, 400, {"error": "Línea de petición inválida"}, cerrar=True)
+                break
+            cabeceras = {}
+            while True:
+                cabecera = await lector.readline()
+                if cabecera in (b"\r\n", b"\n", b""):
+                    break
+                nombre, _, valor = cabecera.decode("latin-1").partition(":")
+                cabeceras[nombre.strip().lower()] = valor.strip()
+            conexion = cabeceras.get("connection", "").lower()
+            cerrar = conexion == "close" or (version == "HTTP/1.0" and conexion != "keep-alive")
+
+            extra = {}
+            try:
+                longitud = int(cabeceras.get("content-length", 0))
+                if longitud > TAMANO_MAXIMO_CUERPO:
+                    cerrar = True
+                    raise ErrorPeticion(413, "Cuerpo demasiado grande")
+                cuerpo = await lector.readexactly(longitud) if longitud else b""
+                codigo, respuesta = 200, await _despachar(servicio, metodo, ruta, cuerpo)
+            except ErrorPeticion as e:
+                codigo, respuesta = e.codigo, {"error": str(e)}
+                if e.codigo == 503:
+                    extra["Retry-After"] = str(REINTENTAR_TRAS)
+            except ValueError as e:
+                codigo, respuesta = 400, {"error": f"Petición inválida: {e}"}
+            except Exception as e:
+                codigo, respuesta = 500, {"error": f"{type(e).__name__}: {e}"}
+            await _responder(escritor, codigo, respuesta, cerrar, extra)
+            if cerrar:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        escritor.close()
+
+
+async def _despachar(servicio: ServicioIntegrales, metodo: str, ruta: str, cuerpo: bytes) -> dict:
+    """Elige la operación según la ruta"""
+    ruta = ruta.split("?", 1)[0]
+    if ruta == "/estado":
+        if metodo != "GET":
+            raise ErrorPeticion(405, "Use GET en /estado")
+        return servicio.estado()
+    if ruta == "/integrar":
+        if metodo != "POST":
+            raise ErrorPeticion(405, "Use POST en /integrar")
+        trabajo = json.loads(cuerpo or b"null")
+        if not isinstance(trabajo, dict):
+            raise ErrorPeticion(400, "El cuerpo debe ser un objeto JSON con el trabajo")
+        resultado = await servicio.integrar(trabajo)
+        if "error" in resultado:
+            raise ErrorPeticion(422, resultado["error"])
+        return resultado
+    raise ErrorPeticion(404, f"Ruta desconocida: {ruta}")
+
+
+async def _responder(escritor, codigo: int, datos: dict, cerrar: bool = False, cabeceras: dict = None):
+    cuerpo = json.dumps(datos, ensure_ascii=False).encode("utf-8")
+    lineas = [f"HTTP/1.1 {codigo} {RAZONES.get(codigo, '')}",
+              "Content-Type: application/json; charset=utf-8",
+              f"Content-Length: {len(cuerpo)}",
+              f"Connection: {'close' if cerrar else 'keep-alive'}"]
+    lineas += [f"{nombre}: {valor}" for nombre, valor in (cabeceras or {}).items()]
+    escritor.write(("\r\n".join(lineas) + "\r\n\r\n").encode("latin-1") + cuerpo)
+    await escritor.drain()
+
+
+async def iniciar_servidor(servicio: ServicioIntegrales, anfitrion: str = "127.0.0.1", puerto: int = 8765):
+    """Arranca el servicio y devuelve el servidor asyncio (puerto 0: uno libre cualquiera)"""
+    servicio.iniciar()
+    return await asyncio.start_server(lambda l, e: atender_conexion(servicio, l, e), anfitrion, puerto)
+
+
+async def _servir(opciones):
+    servicio = ServicioIntegrales(opciones.trabajadores, opciones.cola, opciones.cache)
+    servidor = await iniciar_servidor(servicio, opciones.anfitrion, opciones.puerto)
+    anfitrion, puerto = servidor.sockets[0].getsockname()[:2]
+    print(f"Sirviendo en http://{anfitrion}:{puerto} con {opciones.trabajadores} procesos", file=sys.stderr)
+    try:
+        async with servidor:
+            await servidor.serve_forever()
+    finally:
+        await servicio.detener()
+
+
+# ---------------------------------------------------------------------------
+# Prueba de carga en localhost
+# ---------------------------------------------------------------------------
+
+async def _cliente(puerto: int, trabajos, latencias: list, codigos: dict):
+    """Envía trabajos por una única conexión persistente y anota latencia y código de cada uno"""
+    lector, escritor = await asyncio.open_connection("127.0.0.1", puerto)
+    try:
+        for trabajo in trabajos:
+            cuerpo = json.dumps(trabajo).encode("utf-8")
+            inicio = time.perf_counter()
+            escritor.write(f"POST /integrar HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+                           f"Content-Length: {len(cuerpo)}\r\n\r\n".encode("latin-1") + cuerpo)
+            await escritor.drain()
+            codigo = int((await lector.readline()).split()[1])
+            longitud = 0
+            while True:
+                cabecera = await lector.readline()
+                if cabecera in (b"\r\n", b""):
+                    break
+                nombre, _, valor = cabecera.decode("latin-1").partition(":")
+                if nombre.lower() == "content-length":
+                    longitud = int(valor)
+            await lector.readexactly(longitud)
+            latencias.append(time.perf_counter() - inicio)
+            codigos[codigo] = codigos.get(codigo, 0) + 1
+    finally:
+        escritor.close()
+
+
+async def prueba_carga(peticiones: int, concurrencia: int, distintas: int, n: int, trabajadores: int,
+                       capacidad_cola: int) -> dict:
+    """Levanta el servicio en un puerto libre y lo somete a `peticiones` con `concurrencia` clientes.
+
+    Las peticiones se reparten entre `distintas` integrales con semilla, así que se repiten y
+    ejercitan la agrupación y la caché.
+    """
+    servicio = ServicioIntegrales(trabajadores, capacidad_cola)
+    servidor = await iniciar_servidor(servicio, "127.0.0.1", 0)
+    puerto = servidor.sockets[0].getsockname()[1]
+    funciones = ["x**2", "math.sin(x)", "math.exp(-x*x)", "x*y", "math.sqrt(x)*math.cos(y)"]
+    trabajos = []
+    for i in range(peticiones):
+        indice = i % distintas
+        trabajo = {"id": i, "funcion": funciones[indice % len(funciones)], "n": n, "semilla": indice}
+        trabajo["limites"] = [[0, 1], [0, 2]] if "y" in trabajo["funcion"] else [[0, 1]]
+        trabajos.append(trabajo)
+
+    latencias, codigos = [], {}
+    inicio = time.perf_counter()
+    try:
+        await asyncio.gather(*(_cliente(puerto, trabajos[i::concurrencia], latencias, codigos)
+                               for i in range(concurrencia)))
+        duracion = time.perf_counter() - inicio
+    finally:
+        servidor.close()
+        await servidor.wait_closed()
+        await servicio.detener()
+
+    latencias.sort()
+    percentil = lambda p: latencias[min(len(latencias) - 1, int(p * len(latencias)))] * 1000
+    return {"peticiones": peticiones, "concurrencia": concurrencia, "duracion_s": round(duracion, 3),
+            "peticiones_por_s": round(peticiones / duracion, 1),
+            "latencia_ms": {"p50": round(percentil(0.50), 1), "p90": round(percentil(0.90), 1),
+                            "p99": round(percentil(0.99), 1), "max": round(latencias[-1] * 1000, 1)},
+            "codigos": codigos, "servicio": servicio.estado()}
+
+
+def main(argumentos=None) -> int:
+    parser = argparse.ArgumentParser(description="Servicio HTTP/JSON local de integrales de Monte Carlo")
+    parser.add_argument("--anfitrion", default="127.0.0.1", help="dirección de escucha (por defecto 127.0.0.1)")
+    parser.add_argument("--puerto", type=int, default=8765, help="puerto de escucha (por defecto 8765)")
+    parser.add_argument("-t", "--trabajadores", type=int, default=os.cpu_count() or 1,
+                        help="procesos de cálculo (por defecto, uno por CPU)")
+    parser.add_argument("--cola", type=int, default=64,
+                        help="cálculos pendientes admitidos antes de responder 503 (por defecto 64)")
+    parser.add_argument("--cache", type=int, default=1024, help="resultados memorizados (por defecto 1024)")
+    parser.add_argument("--prueba-carga", type=int, metavar="PETICIONES",
+                        help="en lugar de servir, mide el servicio en localhost con tantas peticiones")
+    parser.add_argument("--concurrencia", type=int, default=20, help="clientes simultáneos en la prueba de carga")
+    parser.add_argument("--distintas", type=int, default=10, help="integrales distintas en la prueba de carga")
+    parser.add_argument("-n", type=int, default=100_000, help="muestras por integral en la prueba de carga")
+    opciones = parser.parse_args(argumentos)
+    if min(opciones.trabajadores, opciones.cola, opciones.cache, opciones.concurrencia, opciones.distintas) < 1:
+        parser.error("--trabajadores, --cola, --cache, --concurrencia y --distintas deben ser al menos 1")
+
+    if opciones.prueba_carga is not None:
+        informe = asyncio.run(prueba_carga(opciones.prueba_carga, opciones.concurrencia, opciones.distintas,
+                                           opciones.n, opciones.trabajadores, opciones.cola))
+        print(json.dumps(informe, indent=2, ensure_ascii=False))
+        return 0 if set(informe["codigos"]) <= {200, 503} else 1
+
+    try:
+        asyncio.run(_servir(opciones))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
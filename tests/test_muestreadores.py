@@ -0,0 +1,45 @@
+"""Los muestreadores cuasi-aleatorios dan los mismos puntos generando la secuencia por bloques que de una vez"""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from modelo.muestreadores import crear_muestreador
+
+SEMILLA = 12345
+PUNTOS = 5000
+
+
+def secuencia_por_bloques(nombre: str, dimension: int, tamanos) -> np.ndarray:
+    """Genera PUNTOS puntos pidiendo bloques con los tamaños dados (el último se recorta)"""
+    muestreador = crear_muestreador(nombre, dimension, np.random.default_rng(SEMILLA))
+    bloques = []
+    for tamano in tamanos:
+        restantes = PUNTOS - muestreador.indice
+        if restantes == 0:
+            break
+        bloques.append(muestreador.generar(min(tamano, restantes)))
+    return np.concatenate(bloques)
+
+
+def secuencia_completa(nombre: str, dimension: int) -> np.ndarray:
+    return crear_muestreador(nombre, dimension, np.random.default_rng(SEMILLA)).generar(PUNTOS)
+
+
+@pytest.mark.parametrize("nombre", ["sobol", "halton", "reticula"])
+@pytest.mark.parametrize("dimension", [1, 3, 8])
+def test_bloques_aleatorios(nombre, dimension):
+    tamanos = np.random.default_rng(SEMILLA).integers(1, 200, size=PUNTOS)
+    np.testing.assert_array_equal(secuencia_por_bloques(nombre, dimension, tamanos),
+                                  secuencia_completa(nombre, dimension))
+
+
+@pytest.mark.parametrize("nombre", ["sobol", "halton", "reticula"])
+@pytest.mark.parametrize("tamano", [1, 7, 64, 1000])
+def test_bloques_fijos(nombre, tamano):
+    # Bloques de potencia de dos y de tamaño impar cruzan los cambios de bit de Sobol de formas distintas
+    np.testing.assert_array_equal(secuencia_por_bloques(nombre, 3, [tamano] * PUNTOS),
+                                  secuencia_completa(nombre, 3))
@@ -0,0 +1,55 @@
+import tkinter as tk
+from tkinter import ttk
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+import numpy as np
+
+# Máximo de curvas dibujadas cuando hay más de un parámetro (una por combinación de los demás)
+MAXIMO_CURVAS = 10
+
+
+class PanelBarrido:
+    """Gráfico de un barrido de parámetros: integral ± IC frente al primer parámetro"""
+
+    def __init__(self, parent_frame):
+        self.frame = ttk.Frame(parent_frame)
+        self.figura = Figure(figsize=(2, 3), constrained_layout=True)
+        self.ax = self.figura.add_subplot(111)
+        self.canvas = FigureCanvasTkAgg(self.figura, self.frame)
+        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self.limpiar()
+
+    def limpiar(self):
+        """Deja el gráfico vacío"""
+        self.ax.clear()
+        self.ax.grid(True, alpha=0.3)
+        self.ax.set_ylabel("Integral")
+        self.ax.set_title("Barrido de parámetros")
+        self.canvas.draw_idle()
+
+    def actualizar(self, resultado):
+        """Dibuja las integrales de un ResultadoBarrido con su banda de confianza"""
+        self.limpiar()
+        nombres = list(resultado.parametros)
+        eje = resultado.parametros[nombres[0]]
+        # Una fila por combinación de los demás parámetros
+        integrales = resultado.integrales.reshape(len(eje), -1).T
+        semianchos = resultado.semianchos.reshape(len(eje), -1).T
+        combinaciones = np.stack([m.ravel() for m in np.meshgrid(
+            *[resultado.parametros[n] for n in nombres[1:]], indexing="ij")], axis=-1) \
+            if len(nombres) > 1 else np.empty((1, 0))
+
+        filas = np.arange(len(integrales))
+        if len(filas) > MAXIMO_CURVAS:
+            filas = np.unique(np.linspace(0, len(filas) - 1, MAXIMO_CURVAS).round().astype(int))
+        for fila in filas:
+            etiqueta = ", ".join(f"{n} = {v:g}" for n, v in zip(nombres[1:], combinaciones[fila])) or "Integral"
+            linea, = self.ax.plot(eje, integrales[fila], "o-" if len(eje) <= 30 else "-", markersize=3,
+                                  label=etiqueta)
+            self.ax.fill_between(eje, integrales[fila] - semianchos[fila], integrales[fila] + semianchos[fila],
+                                 color=linea.get_color(), alpha=0.2)
+
+        self.ax.set_xlabel(nombres[0])
+        self.ax.set_title(f"Barrido de parámetros (IC {resultado.nivel_confianza*100:g}%)")
+        self.ax.legend(fontsize=8)
+        self.canvas.draw_idle()
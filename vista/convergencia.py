@@ -0,0 +1,60 @@
+import tkinter as tk
+from tkinter import ttk
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+import numpy as np
+from statistics import NormalDist
+
+
+class PanelConvergencia:
+    """Gráfico de convergencia: estimación ± IC y error estándar frente a N (escala logarítmica)"""
+
+    def __init__(self, parent_frame):
+        self.frame = ttk.Frame(parent_frame)
+        self.figura = Figure(figsize=(2, 3), constrained_layout=True)
+        self.ax_estimacion, self.ax_error = self.figura.subplots(2, 1, sharex=True)
+        self.canvas = FigureCanvasTkAgg(self.figura, self.frame)
+        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self.limpiar()
+
+    def limpiar(self):
+        """Deja el gráfico vacío, listo para un nuevo cálculo"""
+        for ax in (self.ax_estimacion, self.ax_error):
+            ax.clear()
+            ax.grid(True, which="both", alpha=0.3)
+        self.ax_estimacion.set_ylabel("Estimación")
+        self.ax_estimacion.set_title("Convergencia")
+        self.ax_error.set_xlabel("N")
+        self.ax_error.set_ylabel("Error estándar")
+        self.canvas.draw_idle()
+
+    def actualizar(self, historial, nivel_confianza=0.95, exacto=None):
+        """Redibuja a partir de una lista de instantáneas (n, estimación, error estándar)"""
+        datos = np.array([(n, e, s) for n, e, s in historial
+                          if e is not None and s is not None and np.isfinite(s)], dtype=float).reshape(-1, 3)
+        self.limpiar()
+        if len(datos) == 0:
+            return
+        n, estimacion, error = datos.T
+        semiancho = NormalDist().inv_cdf(0.5 + nivel_confianza / 2) * error
+
+        ax = self.ax_estimacion
+        ax.set_xscale("log")
+        ax.fill_between(n, estimacion - semiancho, estimacion + semiancho, color="tab:blue", alpha=0.2,
+                        label=f"IC {nivel_confianza*100:g}%")
+        ax.plot(n, estimacion, "o-", color="tab:blue", markersize=3, label="Estimación")
+        if exacto is not None:
+            ax.axhline(exacto, color="tab:green", linestyle="--", label="Valor de referencia")
+        ax.legend(fontsize=8)
+
+        ax = self.ax_error
+        positivos = error > 0
+        if positivos.any():
+            ax.set_xscale("log")
+            ax.set_yscale("log")
+            ax.plot(n[positivos], error[positivos], "o-", color="tab:red", markersize=3, label="Error estándar")
+            # Referencia ∝ 1/√N que pasa por la primera instantánea
+            n0, s0 = n[positivos][0], error[positivos][0]
+            ax.plot(n, s0 * np.sqrt(n0 / n), "k:", label="∝ 1/√N")
+            ax.legend(fontsize=8)
+        self.canvas.draw_idle()
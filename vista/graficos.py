@@ -0,0 +1,196 @@
+import numpy as np
+from typing import Callable, Optional, Sequence, Tuple
+from modelo.funciones import compilar_funcion
+
+# Máximo de puntos dibujados individualmente; por encima se recurre a la densidad
+PRESUPUESTO_PUNTOS = 5_000
+# Celdas por eje de los gráficos de densidad
+CELDAS_DENSIDAD = 60
+
+# Resolución de la curva 1D: puntos iniciales y máximo tras refinar
+PUNTOS_CURVA = 200
+MAXIMO_PUNTOS_CURVA = 4_000
+# Resolución de la superficie 2D: líneas por eje iniciales y máximo tras refinar
+LINEAS_MALLA = 60
+MAXIMO_LINEAS_MALLA = 200
+# Rondas de refinamiento y desviación (relativa al rango de f) a partir de la cual se subdivide
+RONDAS_REFINAMIENTO = 6
+TOLERANCIA_CURVATURA = 2e-3
+
+
+def compilar_para_grafico(func_str: str, variables: Sequence[str] = ("x",)) -> Callable[..., np.ndarray]:
+    """Versión vectorizada de la función para dibujarla; si no compila, se dibuja como 0"""
+    try:
+        return compilar_funcion(func_str, variables)
+    except Exception:
+        return lambda *valores: np.zeros(np.broadcast(*valores).shape)
+
+
+def curva_adaptativa(f, a: float, b: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Puntos de la curva y = f(x), más densos donde la curvatura es mayor"""
+    x = np.linspace(a, b, PUNTOS_CURVA)
+    y = f(x)
+    for _ in range(RONDAS_REFINAMIENTO):
+        nuevos = _puntos_medios(x, _desviaciones(x, y), np.ptp(y), MAXIMO_PUNTOS_CURVA - len(x))
+        if len(nuevos) == 0:
+            break
+        x = np.concatenate([x, nuevos])
+        orden = np.argsort(x, kind="stable")
+        x, y = x[orden], np.concatenate([y, f(nuevos)])[orden]
+    return x, y
+
+
+def malla_adaptativa(f, ax: float, bx: float, cy: float, dy: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Malla (X, Y, Z) de la superficie, con más líneas en los tramos de cada eje donde se curva"""
+    x = np.linspace(ax, bx, LINEAS_MALLA)
+    y = np.linspace(cy, dy, LINEAS_MALLA)
+    X, Y = np.meshgrid(x, y)
+    Z = f(X, Y)
+    for _ in range(RONDAS_REFINAMIENTO):
+        rango = np.ptp(Z)
+        # Para cada intervalo de un eje se toma la peor desviación a lo largo del otro
+        nuevos_x = _puntos_medios(x, _desviaciones(x, Z, eje=1).max(axis=0), rango, MAXIMO_LINEAS_MALLA - len(x))
+        nuevos_y = _puntos_medios(y, _desviaciones(y, Z, eje=0).max(axis=1), rango, MAXIMO_LINEAS_MALLA - len(y))
+        if len(nuevos_x) == 0 and len(nuevos_y) == 0:
+            break
+        x = np.sort(np.concatenate([x, nuevos_x]))
+        y = np.sort(np.concatenate([y, nuevos_y]))
+        # Evaluar la malla completa vectorizada cuesta menos que insertar filas y columnas
+        X, Y = np.meshgrid(x, y)
+        Z = f(X, Y)
+    return X, Y, Z
+
+
+def _desviaciones(x: np.ndarray, y: np.ndarray, eje: int = -1) -> np.ndarray:
+    """Distancia de cada punto interior a la cuerda entre sus vecinos, asignada a los intervalos adyacentes"""
+    y = np.moveaxis(y, eje, -1)
+    peso = (x[1:-1] - x[:-2]) / (x[2:] - x[:-2])
+    interpolado = y[..., :-2] + (y[..., 2:] - y[..., :-2]) * peso
+    desviacion = np.abs(y[..., 1:-1] - interpolado)
+    # Cada intervalo hereda la mayor desviación de sus dos extremos interiores
+    por_intervalo = np.zeros(y.shape[:-1] + (len(x) - 1,))
+    por_intervalo[..., :-1] = desviacion
+    por_intervalo[..., 1:] = np.maximum(por_intervalo[..., 1:], desviacion)
+    return np.moveaxis(por_intervalo, -1, eje)
+
+
+def _puntos_medios(x: np.ndarray, desviacion: np.ndarray, rango: float, disponibles: int) -> np.ndarray:
+    """Puntos medios de los intervalos que superan la tolerancia, los más curvos primero"""
+    if disponibles <= 0 or rango == 0:
+        return np.empty(0)
+    marcados = np.flatnonzero(desviacion > TOLERANCIA_CURVATURA * rango)
+    if len(marcados) > disponibles:
+        marcados = marcados[np.argsort(desviacion[marcados])[::-1][:disponibles]]
+    return 0.5 * (x[marcados] + x[marcados + 1])
+
+
+def diezmar(n: int, presupuesto: int = PRESUPUESTO_PUNTOS, rng: Optional[np.random.Generator] = None):
+    """Índices de una submuestra aleatoria uniforme de tamaño presupuesto (o todo si n no lo supera)"""
+    if n <= presupuesto:
+        return slice(None)
+    rng = rng if rng is not None else np.random.default_rng(0)
+    return np.sort(rng.choice(n, presupuesto, replace=False))
+
+
+def _etiqueta(dibujados: int, n_total: Optional[int]) -> str:
+    """Texto de la leyenda indicando cuántos puntos se muestran del total evaluado"""
+    if n_total is None or n_total <= dibujados:
+        return "Puntos aleatorios"
+    return f"Puntos aleatorios ({dibujados:,} de {n_total:,})"
+
+
+def _tamano_marcador(dibujados: int) -> float:
+    """Marcadores más pequeños cuantos más puntos hay, para que la nube siga siendo legible"""
+    return 20 if dibujados <= 1_000 else 5
+
+
+class GraficoMuestras1D:
+    """Nube de muestras (x, f(x)) en unos ejes 2D; los artistas se reutilizan entre cálculos.
+
+    Hasta el presupuesto se actualizan los desplazamientos de una única dispersión; por encima se
+    dibuja la densidad hexagonal de todas las muestras, con coste independiente de N.
+    """
+
+    def __init__(self, ax, presupuesto: int = PRESUPUESTO_PUNTOS):
+        self.ax = ax
+        self.presupuesto = presupuesto
+        self.dispersion = ax.scatter([], [], color='red', alpha=0.6)
+        self.densidad = None
+        # La leyenda no refleja el mapa de colores: se usa un marcador de referencia vacío
+        self.referencia_densidad, = ax.plot([], [], 'h', color='firebrick')
+        self.limpiar()
+
+    def limpiar(self):
+        """Vacía la nube sin destruir la dispersión"""
+        self.dispersion.set_offsets(np.empty((0, 2)))
+        self.dispersion.set_label('_nolegend_')
+        self.referencia_densidad.set_label('_nolegend_')
+        if self.densidad is not None:
+            self.densidad.remove()
+            self.densidad = None
+
+    def actualizar(self, x: np.ndarray, fx: np.ndarray, n_total: Optional[int] = None):
+        """Muestra las nuevas muestras en lugar de las anteriores"""
+        self.limpiar()
+        m = len(x)
+        if m == 0:
+            return
+        if m <= self.presupuesto:
+            self.dispersion.set_offsets(np.column_stack([x, fx]))
+            self.dispersion.set_sizes([_tamano_marcador(m)])
+            self.dispersion.set_label(_etiqueta(m, n_total))
+        else:
+            self.densidad = self.ax.hexbin(x, fx, gridsize=CELDAS_DENSIDAD, mincnt=1, bins='log', cmap='Reds')
+            self.referencia_densidad.set_label(f"Densidad de muestras ({n_total or m:,})")
+
+
+class GraficoMuestras2D:
+    """Nube de muestras (x, y, f) en ejes 3D, reemplazada en cada cálculo sin crear ejes nuevos.
+
+    Se dibuja como mucho `presupuesto` puntos elegidos al azar; si hay más, la densidad de todas las
+    muestras se muestra además como mapa de calor en el plano inferior.
+    """
+
+    def __init__(self, ax, presupuesto: int = PRESUPUESTO_PUNTOS):
+        self.ax = ax
+        self.presupuesto = presupuesto
+        self.nube = None
+        self.mapa = None
+
+    def limpiar(self):
+        """Quita la nube y el mapa de densidad anteriores"""
+        if self.nube is not None:
+            self.nube.remove()
+            self.nube = None
+        if self.mapa is not None:
+            _quitar_contornos(self.mapa)
+            self.mapa = None
+
+    def actualizar(self, x: np.ndarray, y: np.ndarray, z: np.ndarray, n_total: Optional[int] = None):
+        """Muestra las nuevas muestras en lugar de las anteriores"""
+        self.limpiar()
+        m = len(x)
+        if m == 0:
+            return
+        indices = diezmar(m, self.presupuesto)
+        dibujados = min(m, self.presupuesto)
+        self.nube = self.ax.scatter(x[indices], y[indices], z[indices], color='red', s=_tamano_marcador(dibujados),
+                                    alpha=0.8, label=_etiqueta(dibujados, n_total or m))
+
+        if m > self.presupuesto:
+            cuentas, bordes_x, bordes_y = np.histogram2d(x, y, bins=CELDAS_DENSIDAD)
+            centros_x = 0.5 * (bordes_x[:-1] + bordes_x[1:])
+            centros_y = 0.5 * (bordes_y[:-1] + bordes_y[1:])
+            X, Y = np.meshgrid(centros_x, centros_y)
+            z_min, z_max = self.ax.get_zlim()
+            self.mapa = self.ax.contourf(X, Y, cuentas.T, zdir='z', offset=z_min, cmap='Reds', alpha=0.6)
+            self.ax.set_zlim(z_min, z_max)
+
+
+def _quitar_contornos(contornos):
+    """Elimina un conjunto de contornos (API distinta según la versión de matplotlib)"""
+    try:
+        contornos.remove()
+    except (AttributeError, NotImplementedError):
+        for coleccion in contornos.collections:
+            coleccion.remove()
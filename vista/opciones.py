@@ -0,0 +1,193 @@
+import tkinter as tk
+from tkinter import ttk
+
+# Criterios de parada: texto mostrado -> clave usada por el controlador
+CRITERIOS = {
+    "N fijo": "n_fijo",
+    "Tolerancia absoluta": "absoluta",
+    "Tolerancia relativa": "relativa",
+}
+
+# Integradores: texto mostrado -> clave usada por el controlador
+INTEGRADORES = {
+    "Monte Carlo estándar": "estandar",
+    "Adaptativo (MISER)": "miser",
+}
+
+# Tipos de muestreo: texto mostrado -> nombre del muestreador en el modelo
+MUESTREOS = {
+    "Pseudoaleatorio": "pseudo",
+    "Sobol (QMC)": "sobol",
+    "Halton (QMC)": "halton",
+    "Retícula (QMC)": "reticula",
+}
+
+# Técnicas de reducción de varianza: texto mostrado -> clave usada por el controlador
+REDUCCIONES = {
+    "Ninguna": "ninguna",
+    "Variables antitéticas": "antiteticas",
+    "Muestreo estratificado": "estratificado",
+    "Variable de control": "control",
+    "Muestreo por importancia": "importancia",
+}
+
+# Motores de evaluación: texto mostrado -> nombre del motor en el modelo
+MOTORES = {
+    "NumPy": "numpy",
+    "JIT (Numba, si está instalado)": "jit",
+}
+
+# Familias de densidades de propuesta: texto mostrado -> nombre de la propuesta en el modelo
+PROPUESTAS = {
+    "Normal truncada (μ, σ)": "normal",
+    "Exponencial (λ)": "exponencial",
+    "Beta (α, β)": "beta",
+    "Potencia (α)": "potencia",
+    "Uniforme": "uniforme",
+    "Personalizada (p ; F⁻¹(u))": "personalizada",
+}
+
+# Parámetros iniciales de cada familia al elegirla (None: la familia no tiene parámetros)
+PARAMETROS_PROPUESTA = {
+    "Normal truncada (μ, σ)": "0.5, 0.2",
+    "Exponencial (λ)": "1",
+    "Beta (α, β)": "2, 2",
+    "Potencia (α)": "0.5",
+    "Uniforme": None,
+    "Personalizada (p ; F⁻¹(u))": "",
+}
+
+
+class PanelOpciones:
+    """Panel plegable de opciones avanzadas, compartido por las pestañas 1D y 2D"""
+
+    def __init__(self, parent_frame, font_label=("Arial", 11), font_entry=("Arial", 11), ejes=("x",)):
+        self.ejes = ejes
+        self.font_label = font_label
+        self.font_entry = font_entry
+        self._visible = False
+
+        # Botón para mostrar/ocultar el panel
+        self.btn_alternar = ttk.Button(parent_frame, text="▸ Opciones avanzadas",
+                                       command=self._alternar)
+        self.btn_alternar.pack(pady=(5, 0), padx=5, fill=tk.X)
+
+        # Contenido (se empaqueta al desplegar)
+        self.frame = ttk.Frame(parent_frame)
+        self.frame.columnconfigure(1, weight=1)
+        self._fila = 0
+
+        # Integrador
+        self.integrador = self._crear_combobox("Integrador:", list(INTEGRADORES), "Monte Carlo estándar")
+
+        # Muestreo
+        self.muestreo = self._crear_combobox("Muestreo:", list(MUESTREOS), "Pseudoaleatorio")
+
+        # Reducción de varianza
+        self.reduccion = self._crear_combobox("Reducción de varianza:", list(REDUCCIONES), "Ninguna")
+        self.estratos = self._crear_entrada("Estratos por eje (k):", "10")
+        self.func_control = self._crear_entrada("Función de control g:", "x")
+        self.integral_control = self._crear_entrada("∫g exacta:", "")
+
+        # Propuesta de muestreo por importancia, una por eje
+        self.propuestas = {}
+        for eje in ejes:
+            familia = self._crear_combobox(f"Propuesta en {eje}:", list(PROPUESTAS), "Normal truncada (μ, σ)")
+            parametros = self._crear_entrada(f"Parámetros en {eje}:", "0.5, 0.2")
+            familia.bind("<<ComboboxSelected>>",
+                         lambda _evento, f=familia, p=parametros: self._cambiar_familia(f, p))
+            self.propuestas[eje] = (familia, parametros)
+
+        # Criterio de parada
+        self.criterio = self._crear_combobox("Criterio de parada:", list(CRITERIOS), "N fijo")
+        self.tolerancia = self._crear_entrada("Tolerancia:", "1e-3")
+        self.confianza = self._crear_entrada("Nivel de confianza (%):", "95")
+
+        # Ejecución
+        self.trabajadores = self._crear_entrada("Procesos en paralelo:", "1")
+        self.motor = self._crear_combobox("Motor de evaluación:", list(MOTORES), "NumPy")
+        self.convergencia = self._crear_casilla("Convergencia en vivo:", False)
+
+        # Barrido de parámetros: vacío para una integral normal
+        self.barrido = self._crear_entrada("Barrido de parámetros:", "")
+        ttk.Label(self.frame, text="Ej.: k = 0.1 : 10 : 100 ; c = 1, 2, 5", font=("Arial", 9)).grid(
+            row=self._fila, column=0, columnspan=2, sticky=tk.W)
+        self._fila += 1
+
+        # Instrumentación: el desglose de tiempos se muestra siempre; memoria, perfil y registro son opcionales
+        self.medir_memoria = self._crear_casilla("Medir memoria (tracemalloc):", False)
+        self.perfil = self._crear_casilla("Perfil con cProfile:", False)
+        self.registro = self._crear_entrada("Registro de métricas (.json/.csv):", "")
+
+    def _cambiar_familia(self, familia, parametros):
+        """Pone los parámetros iniciales de la familia elegida; sin parámetros, el campo queda vacío y bloqueado"""
+        inicial = PARAMETROS_PROPUESTA[familia.get()]
+        parametros.config(state="normal")
+        parametros.delete(0, tk.END)
+        if inicial is None:
+            parametros.config(state="disabled")
+        else:
+            parametros.insert(0, inicial)
+
+    def _crear_combobox(self, etiqueta, valores, inicial):
+        """Agrega una fila con una lista desplegable"""
+        ttk.Label(self.frame, text=etiqueta, font=self.font_label).grid(
+            row=self._fila, column=0, sticky=tk.W, pady=2)
+        combo = ttk.Combobox(self.frame, values=valores, state="readonly", width=18,
+                             font=self.font_entry)
+        combo.set(inicial)
+        combo.grid(row=self._fila, column=1, sticky=tk.EW, padx=5, pady=2)
+        self._fila += 1
+        return combo
+
+    def _crear_entrada(self, etiqueta, inicial):
+        """Agrega una fila con un campo de texto"""
+        ttk.Label(self.frame, text=etiqueta, font=self.font_label).grid(
+            row=self._fila, column=0, sticky=tk.W, pady=2)
+        entrada = ttk.Entry(self.frame, width=18, font=self.font_entry)
+        entrada.insert(0, inicial)
+        entrada.grid(row=self._fila, column=1, sticky=tk.EW, padx=5, pady=2)
+        self._fila += 1
+        return entrada
+
+    def _crear_casilla(self, etiqueta, inicial):
+        """Agrega una fila con una casilla de verificación"""
+        ttk.Label(self.frame, text=etiqueta, font=self.font_label).grid(
+            row=self._fila, column=0, sticky=tk.W, pady=2)
+        variable = tk.BooleanVar(master=self.frame, value=inicial)
+        ttk.Checkbutton(self.frame, variable=variable).grid(row=self._fila, column=1, sticky=tk.W, padx=5, pady=2)
+        self._fila += 1
+        return variable
+
+    def _alternar(self):
+        """Muestra u oculta las opciones"""
+        if self._visible:
+            self.frame.pack_forget()
+            self.btn_alternar.configure(text="▸ Opciones avanzadas")
+        else:
+            self.frame.pack(after=self.btn_alternar, pady=5, padx=5, fill=tk.X)
+            self.btn_alternar.configure(text="▾ Opciones avanzadas")
+        self._visible = not self._visible
+
+    def obtener_valores(self):
+        """Obtiene los valores de las opciones avanzadas"""
+        return {
+            'integrador': INTEGRADORES[self.integrador.get()],
+            'muestreo': MUESTREOS[self.muestreo.get()],
+            'reduccion': REDUCCIONES[self.reduccion.get()],
+            'estratos': self.estratos.get(),
+            'func_control': self.func_control.get(),
+            'integral_control': self.integral_control.get(),
+            'propuestas': {eje: (PROPUESTAS[familia.get()], parametros.get())
+                           for eje, (familia, parametros) in self.propuestas.items()},
+            'criterio': CRITERIOS[self.criterio.get()],
+            'tolerancia': self.tolerancia.get(),
+            'confianza': self.confianza.get(),
+            'trabajadores': self.trabajadores.get(),
+            'motor': MOTORES[self.motor.get()],
+            'convergencia': self.convergencia.get(),
+            'barrido': self.barrido.get(),
+            'medir_memoria': self.medir_memoria.get(),
+            'perfil': self.perfil.get(),
+            'registro': self.registro.get(),
+        }
@@ -59,7 +59,7 @@ class VistaMonteCarlo:
         # 3. Operamos normalmente
         texto_widget.delete(1.0, tk.END)
         texto_widget.insert(1.0, mensaje)
-        self.root.update()
+        self.root.update_idletasks()
     
     def establecer_controlador(self, controlador):
         """Establece el controlador después de la creación"""
@@ -1,8 +1,11 @@
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import numpy as np
+from vista.barrido import PanelBarrido
+from vista.convergencia import PanelConvergencia
+from vista.graficos import GraficoMuestras1D, compilar_para_grafico, curva_adaptativa
+from vista.opciones import PanelOpciones
 import math
 
 class Vista1D:
@@ -24,8 +27,13 @@ class Vista1D:
         # Área de resultados (se creará en _crear_interfaz_1d)
         self.texto_resultados_1d = None
 
-        # Contenedor del gráfico (se creará en _crear_interfaz_1d)
+        # Contenedor, figura y artistas del gráfico (se crearán en _crear_interfaz_1d)
         self.graph_container_1d = None
+        self.fig_1d = None
+        self.ax_1d = None
+        self.canvas_1d = None
+        self.linea_1d = None
+        self.muestras_1d = None
 
         # Entradas de datos
         self.func_1d = None
@@ -33,9 +41,16 @@ class Vista1D:
         self.b_1d = None
         self.n_1d = None
 
+        # Opciones avanzadas (se crearán en _crear_interfaz_1d)
+        self.opciones_1d = None
+
         # Botón calcular
         self.btn_calcular_1d = None
 
+        # Botón cancelar y barra de progreso
+        self.btn_cancelar_1d = None
+        self.barra_progreso_1d = None
+
         # Botones de ejemplo
         self.btn_ej1_1d = None
         self.btn_ej2_1d = None
@@ -84,10 +99,20 @@ class Vista1D:
         self.n_1d.pack(pady=5, padx=5, fill=tk.X)
         self.n_1d.insert(0, "10000")
         
+        # Opciones avanzadas
+        self.opciones_1d = PanelOpciones(left_frame)
+        
         # Botón calcular
         self.btn_calcular_1d = ttk.Button(left_frame, text="Calcular", style="BotonFunc.TButton",
                                         command=self._calcular_1d)
-        self.btn_calcular_1d.pack(pady=20, padx=5, fill=tk.X)
+        self.btn_calcular_1d.pack(pady=(20, 2), padx=5, fill=tk.X)
+        
+        # Botón cancelar y barra de progreso (activos solo durante el cálculo)
+        self.btn_cancelar_1d = ttk.Button(left_frame, text="Cancelar", style="BotonFunc.TButton",
+                                          command=self._cancelar_1d, state=tk.DISABLED)
+        self.btn_cancelar_1d.pack(pady=2, padx=5, fill=tk.X)
+        self.barra_progreso_1d = ttk.Progressbar(left_frame, maximum=1.0)
+        self.barra_progreso_1d.pack(pady=(2, 10), padx=5, fill=tk.X)
         
         # Botones de ejemplo
         ttk.Label(left_frame, text="Ejemplos:", font=("Arial", 12, "bold")).pack(pady=(20,5))
@@ -122,9 +147,20 @@ class Vista1D:
                                                             font=("Courier", 12))
         self.texto_resultados_1d.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         
-        # Frame para el gráfico (se creará cuando se calcule)
-        self.graph_container_1d = ttk.Frame(graph_frame)
-        self.graph_container_1d.pack(fill=tk.BOTH, expand=True)
+        # Pestañas del gráfico: función con los puntos y convergencia de la estimación
+        self.notebook_grafico_1d = ttk.Notebook(graph_frame)
+        self.notebook_grafico_1d.pack(fill=tk.BOTH, expand=True)
+        
+        # Frame para el gráfico (la figura se crea una sola vez)
+        self.graph_container_1d = ttk.Frame(self.notebook_grafico_1d)
+        self.notebook_grafico_1d.add(self.graph_container_1d, text="Función")
+        self._crear_grafico_1d()
+        
+        self.convergencia_1d = PanelConvergencia(self.notebook_grafico_1d)
+        self.notebook_grafico_1d.add(self.convergencia_1d.frame, text="Convergencia")
+        
+        self.barrido_1d = PanelBarrido(self.notebook_grafico_1d)
+        self.notebook_grafico_1d.add(self.barrido_1d.frame, text="Barrido")
 
     def obtener_valores_1d(self):
         """Obtiene los valores de los campos 1D"""
@@ -132,51 +168,44 @@ class Vista1D:
             'func': self.func_1d.get(),
             'a': self.a_1d.get(),
             'b': self.b_1d.get(),
-            'n': self.n_1d.get()
+            'n': self.n_1d.get(),
+            **self.opciones_1d.obtener_valores()
         }
     
-    def actualizar_grafico_1d(self, func, a, b, puntos):
-        """Actualiza el gráfico 1D"""
-        # Limpiar gráfico anterior
-        for widget in self.graph_container_1d.winfo_children():
-            widget.destroy()
-        
-        # Crear nuevo gráfico
-        self.fig_1d, ax = plt.subplots(figsize=(2, 3))
-        
-        # Generar puntos para la función
-        x_vals = np.linspace(a, b, 200)
-        y_vals = []
-        for x in x_vals:
-            try:
-                y = eval(func, {"x": x, "math": math, "np": np, "__builtins__": {}})
-                y_vals.append(y)
-            except:
-                try:
-                    y = eval(func, {"x": x, "math": math, "np": np})
-                    y_vals.append(y)
-                except:
-                    y_vals.append(0)
-        
-        # Graficar función
-        ax.plot(x_vals, y_vals, 'b-', linewidth=2, label=f'f(x) = {func}')
-        
-        # Graficar puntos aleatorios
-        if puntos:
-            x_puntos = [p['x'] for p in puntos]
-            y_puntos = [p['y'] for p in puntos]
-            ax.scatter(x_puntos, y_puntos, color='red', s=20, alpha=0.6, label='Puntos aleatorios')
-        
-        ax.set_xlabel('x')
-        ax.set_ylabel('f(x)')
-        ax.set_title(f'Integral de f(x) = {func} en [{a}, {b}]')
-        ax.grid(True, alpha=0.3)
-        ax.legend()
+    def _crear_grafico_1d(self):
+        """Crea una única figura y su canvas; los cálculos posteriores solo actualizan los datos"""
+        self.fig_1d = Figure(figsize=(2, 3))
+        self.ax_1d = self.fig_1d.add_subplot(111)
+        self.linea_1d, = self.ax_1d.plot([], [], 'b-', linewidth=2)
+        self.muestras_1d = GraficoMuestras1D(self.ax_1d)
+        self.ax_1d.set_xlabel('x')
+        self.ax_1d.set_ylabel('f(x)')
+        self.ax_1d.grid(True, alpha=0.3)
         
         # Integrar en tkinter
         self.canvas_1d = FigureCanvasTkAgg(self.fig_1d, self.graph_container_1d)
-        self.canvas_1d.draw()
         self.canvas_1d.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+    
+    def actualizar_grafico_1d(self, func, a, b, resultado):
+        """Actualiza el gráfico 1D"""
+        # Curva evaluada de forma vectorizada, más densa donde se curva
+        x_vals, y_vals = curva_adaptativa(compilar_para_grafico(func, ("x",)), a, b)
+        
+        # Actualizar función
+        self.linea_1d.set_data(x_vals, y_vals)
+        self.linea_1d.set_label(f'f(x) = {func}')
+        
+        # Actualizar puntos aleatorios
+        if resultado is not None:
+            self.muestras_1d.actualizar(resultado.x, resultado.fx, resultado.n)
+        else:
+            self.muestras_1d.limpiar()
+        
+        self.ax_1d.set_title(f'Integral de f(x) = {func} en [{a}, {b}]')
+        self.ax_1d.relim()
+        self.ax_1d.autoscale_view()
+        self.ax_1d.legend()
+        self.canvas_1d.draw_idle()
 
     def _calcular_1d(self):
         """Método auxiliar para calcular 1D"""
@@ -185,6 +214,36 @@ class Vista1D:
         else:
             self.mostrar_error("Controlador no inicializado")
 
+    def mostrar_convergencia(self, historial, nivel_confianza=0.95, exacto=None):
+        """Redibuja el gráfico de convergencia con las instantáneas recibidas"""
+        self.convergencia_1d.actualizar(historial, nivel_confianza, exacto)
+
+    def preparar_convergencia(self):
+        """Limpia el gráfico de convergencia y lo pone al frente para seguir el cálculo"""
+        self.convergencia_1d.limpiar()
+        self.notebook_grafico_1d.select(self.convergencia_1d.frame)
+
+    def mostrar_barrido(self, resultado):
+        """Dibuja la integral frente a los parámetros y pone el gráfico al frente"""
+        self.barrido_1d.actualizar(resultado)
+        self.notebook_grafico_1d.select(self.barrido_1d.frame)
+
+    def _cancelar_1d(self):
+        """Método auxiliar para cancelar el cálculo en curso"""
+        if self.controlador:
+            self.controlador.cancelar_calculo()
+
+    def establecer_calculando(self, activo):
+        """Habilita Cancelar y deshabilita Calcular mientras hay un cálculo en curso"""
+        self.btn_calcular_1d.configure(state=tk.DISABLED if activo else tk.NORMAL)
+        self.btn_cancelar_1d.configure(state=tk.NORMAL if activo else tk.DISABLED)
+        if not activo:
+            self.barra_progreso_1d['value'] = 0
+
+    def actualizar_progreso(self, fraccion):
+        """Actualiza la barra de progreso (fracción entre 0 y 1)"""
+        self.barra_progreso_1d['value'] = fraccion
+
     def _cargar_ejemplo_1d(self, func, a, b, n):
         """Método auxiliar para cargar ejemplo 1D"""
         if self.controlador:
@@ -194,4 +253,8 @@ class Vista1D:
 
     def mostrar_resultados(self, texto):
         self.texto_resultados_1d.delete(1.0, tk.END)
-        self.texto_resultados_1d.insert(tk.END, texto)
\ No newline at end of file
+        self.texto_resultados_1d.insert(tk.END, texto)
+
+    def agregar_resultados(self, texto):
+        """Añade texto al final de los resultados mostrados"""
+        self.texto_resultados_1d.insert(tk.END, texto)
@@ -1,8 +1,11 @@
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from mpl_toolkits.mplot3d import Axes3D
+from vista.barrido import PanelBarrido
+from vista.convergencia import PanelConvergencia
+from vista.graficos import GraficoMuestras2D, compilar_para_grafico, malla_adaptativa
+from vista.opciones import PanelOpciones
 import numpy as np
 import math
 
@@ -27,8 +30,14 @@ class Vista2D:
         # Área de resultados (se creará en _crear_interfaz_2d)
         self.texto_resultados_2d = None
 
-        # Contenedor del gráfico (se creará en _crear_interfaz_2d)
+        # Contenedor, figura y artistas del gráfico (se crearán en _crear_interfaz_2d;
+        # los ejes 3D, al mostrarse la pestaña por primera vez)
         self.graph_container_2d = None
+        self.fig_2d = None
+        self.ejes_2d = None
+        self.canvas_2d = None
+        self.superficie_2d = None
+        self.muestras_2d = None
 
         # Entradas de datos
         self.func_2d = None
@@ -38,9 +47,16 @@ class Vista2D:
         self.dy_2d = None
         self.n_2d = None
 
+        # Opciones avanzadas (se crearán en _crear_interfaz_2d)
+        self.opciones_2d = None
+
         # Botón calcular
         self.btn_calcular_2d = None
 
+        # Botón cancelar y barra de progreso
+        self.btn_cancelar_2d = None
+        self.barra_progreso_2d = None
+
         # Botones de ejemplo
         self.btn_ej1_2d = None
         self.btn_ej2_2d = None
@@ -104,11 +120,21 @@ class Vista2D:
         self.n_2d.pack(pady=5, padx=5, fill=tk.X)
         self.n_2d.insert(0, "10000")
         
+        # Opciones avanzadas
+        self.opciones_2d = PanelOpciones(left_frame, self.font_label2, self.font_entry2, ejes=("x", "y"))
+        
         # Botón calcular
         self.btn_calcular_2d = ttk.Button(left_frame, text="Calcular", style="BotonFunc.TButton", 
                                         command=self._calcular_2d)
         self.btn_calcular_2d.pack(pady=2, padx=5, fill=tk.X)
         
+        # Botón cancelar y barra de progreso (activos solo durante el cálculo)
+        self.btn_cancelar_2d = ttk.Button(left_frame, text="Cancelar", style="BotonFunc.TButton",
+                                          command=self._cancelar_2d, state=tk.DISABLED)
+        self.btn_cancelar_2d.pack(pady=2, padx=5, fill=tk.X)
+        self.barra_progreso_2d = ttk.Progressbar(left_frame, maximum=1.0)
+        self.barra_progreso_2d.pack(pady=(2, 10), padx=5, fill=tk.X)
+        
         # Botones de ejemplo
         ttk.Label(left_frame, text="Ejemplos:", font=("Arial", 12, "bold")).pack(pady=(5))
         
@@ -138,9 +164,20 @@ class Vista2D:
                                                             font=("Courier", 12))
         self.texto_resultados_2d.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         
-        # Frame para el gráfico (se creará cuando se calcule)
-        self.graph_container_2d = ttk.Frame(graph_frame)
-        self.graph_container_2d.pack(fill=tk.BOTH, expand=True)
+        # Pestañas del gráfico: función con los puntos y convergencia de la estimación
+        self.notebook_grafico_2d = ttk.Notebook(graph_frame)
+        self.notebook_grafico_2d.pack(fill=tk.BOTH, expand=True)
+        
+        # Frame para el gráfico (la figura se crea una sola vez)
+        self.graph_container_2d = ttk.Frame(self.notebook_grafico_2d)
+        self.notebook_grafico_2d.add(self.graph_container_2d, text="Función")
+        self._crear_grafico_2d()
+        
+        self.convergencia_2d = PanelConvergencia(self.notebook_grafico_2d)
+        self.notebook_grafico_2d.add(self.convergencia_2d.frame, text="Convergencia")
+        
+        self.barrido_2d = PanelBarrido(self.notebook_grafico_2d)
+        self.notebook_grafico_2d.add(self.barrido_2d.frame, text="Barrido")
 
     def obtener_valores_2d(self):
         """Obtiene los valores de los campos 2D"""
@@ -150,56 +187,64 @@ class Vista2D:
             'bx': self.bx_2d.get(),
             'cy': self.cy_2d.get(),
             'dy': self.dy_2d.get(),
-            'n': self.n_2d.get()
+            'n': self.n_2d.get(),
+            **self.opciones_2d.obtener_valores()
         }
     
-    def actualizar_grafico_2d(self, func, ax_val, bx_val, cy_val, dy_val, puntos):
-        """Actualiza el gráfico 2D"""
-        # Limpiar gráfico anterior
-        for widget in self.graph_container_2d.winfo_children():
-            widget.destroy()
-        
-        # Crear nuevo gráfico
-        self.fig_2d = plt.figure(figsize=(4, 4))
-        ax = self.fig_2d.add_subplot(111, projection='3d')
-        
-        # Generar malla para la superficie
-        x_vals = np.linspace(ax_val, bx_val, 30)
-        y_vals = np.linspace(cy_val, dy_val, 30)
-        X, Y = np.meshgrid(x_vals, y_vals)
-        Z = np.zeros_like(X)
-        
-        for i in range(X.shape[0]):
-            for j in range(X.shape[1]):
-                try:
-                    z = eval(func, {"x": X[i,j], "y": Y[i,j], "math": math, "np": np, "__builtins__": {}})
-                    Z[i,j] = z
-                except:
-                    try:
-                        z = eval(func, {"x": X[i,j], "y": Y[i,j], "math": math, "np": np})
-                        Z[i,j] = z
-                    except:
-                        Z[i,j] = 0
-        
-        # Graficar superficie
-        ax.plot_surface(X, Y, Z, alpha=0.7, cmap='viridis')
-        
-        # Graficar puntos aleatorios
-        if puntos:
-            x_puntos = [p['x'] for p in puntos]
-            y_puntos = [p['y'] for p in puntos]
-            z_puntos = [p['z'] for p in puntos]
-            ax.scatter(x_puntos, y_puntos, z_puntos, color='red', s=20, alpha=0.8)
-        
-        ax.set_xlabel('x')
-        ax.set_ylabel('y')
-        ax.set_zlabel('f(x,y)')
-        ax.set_title(f'Integral de f(x,y) = {func}')
+    def _crear_grafico_2d(self):
+        """Crea una única figura y su canvas; los cálculos posteriores solo cambian los artistas"""
+        self.fig_2d = Figure(figsize=(4, 4))
+        self.superficie_2d = None
         
         # Integrar en tkinter
         self.canvas_2d = FigureCanvasTkAgg(self.fig_2d, self.graph_container_2d)
-        self.canvas_2d.draw()
         self.canvas_2d.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        # Los ejes 3D son caros de crear y dibujar: se esperan a que la pestaña se vea
+        self.graph_container_2d.bind("<Map>", lambda evento: self._asegurar_ejes_2d(), add="+")
+    
+    def _asegurar_ejes_2d(self):
+        """Crea los ejes 3D la primera vez que se necesitan"""
+        if self.ejes_2d is not None:
+            return
+        # La proyección '3d' ya la registra matplotlib.figure desde matplotlib 3.2 (la pestaña 1D la
+        # importa al arrancar), así que aquí solo se difiere la creación de los ejes
+        self.ejes_2d = self.fig_2d.add_subplot(111, projection='3d')
+        self.muestras_2d = GraficoMuestras2D(self.ejes_2d)
+        self.ejes_2d.set_xlabel('x')
+        self.ejes_2d.set_ylabel('y')
+        self.ejes_2d.set_zlabel('f(x,y)')
+        self.canvas_2d.draw_idle()
+    
+    def actualizar_grafico_2d(self, func, ax_val, bx_val, cy_val, dy_val, resultado):
+        """Actualiza el gráfico 2D"""
+        self._asegurar_ejes_2d()
+        ax = self.ejes_2d
+        
+        # Malla evaluada de forma vectorizada, con más líneas donde la superficie se curva
+        X, Y, Z = malla_adaptativa(compilar_para_grafico(func, ("x", "y")), ax_val, bx_val, cy_val, dy_val)
+        
+        # La superficie no admite cambiar sus datos: se reemplaza dentro de los mismos ejes
+        if self.superficie_2d is not None:
+            self.superficie_2d.remove()
+        # rcount/ccount evitan que plot_surface reduzca la malla a 50×50
+        self.superficie_2d = ax.plot_surface(X, Y, Z, alpha=0.7, cmap='viridis',
+                                             rcount=Z.shape[0], ccount=Z.shape[1])
+        ax.set_xlim(ax_val, bx_val)
+        ax.set_ylim(cy_val, dy_val)
+        z_min, z_max = float(np.min(Z)), float(np.max(Z))
+        if resultado is not None and len(resultado):
+            z_min, z_max = min(z_min, float(resultado.z.min())), max(z_max, float(resultado.z.max()))
+        ax.set_zlim(z_min, z_max if z_max > z_min else z_min + 1)
+        
+        # Actualizar puntos aleatorios
+        if resultado is not None and len(resultado):
+            self.muestras_2d.actualizar(resultado.x, resultado.y, resultado.z, resultado.n)
+            ax.legend(loc='upper left', fontsize=8)
+        else:
+            self.muestras_2d.limpiar()
+        
+        ax.set_title(f'Integral de f(x,y) = {func}')
+        self.canvas_2d.draw_idle()
 
     def _calcular_2d(self):
         """Método auxiliar para calcular 2D"""
@@ -208,6 +253,36 @@ class Vista2D:
         else:
             self.mostrar_error("Controlador no inicializado")
 
+    def mostrar_convergencia(self, historial, nivel_confianza=0.95, exacto=None):
+        """Redibuja el gráfico de convergencia con las instantáneas recibidas"""
+        self.convergencia_2d.actualizar(historial, nivel_confianza, exacto)
+
+    def preparar_convergencia(self):
+        """Limpia el gráfico de convergencia y lo pone al frente para seguir el cálculo"""
+        self.convergencia_2d.limpiar()
+        self.notebook_grafico_2d.select(self.convergencia_2d.frame)
+
+    def mostrar_barrido(self, resultado):
+        """Dibuja la integral frente a los parámetros y pone el gráfico al frente"""
+        self.barrido_2d.actualizar(resultado)
+        self.notebook_grafico_2d.select(self.barrido_2d.frame)
+
+    def _cancelar_2d(self):
+        """Método auxiliar para cancelar el cálculo en curso"""
+        if self.controlador:
+            self.controlador.cancelar_calculo()
+
+    def establecer_calculando(self, activo):
+        """Habilita Cancelar y deshabilita Calcular mientras hay un cálculo en curso"""
+        self.btn_calcular_2d.configure(state=tk.DISABLED if activo else tk.NORMAL)
+        self.btn_cancelar_2d.configure(state=tk.NORMAL if activo else tk.DISABLED)
+        if not activo:
+            self.barra_progreso_2d['value'] = 0
+
+    def actualizar_progreso(self, fraccion):
+        """Actualiza la barra de progreso (fracción entre 0 y 1)"""
+        self.barra_progreso_2d['value'] = fraccion
+
     def _cargar_ejemplo_2d(self, func, ax, bx, cy, dy, n):
         """Método auxiliar para cargar ejemplo 2D"""
         if self.controlador:
@@ -217,4 +292,8 @@ class Vista2D:
 
     def mostrar_resultados(self, texto):
         self.texto_resultados_2d.delete(1.0, tk.END)
-        self.texto_resultados_2d.insert(tk.END, texto)
\ No newline at end of file
+        self.texto_resultados_2d.insert(tk.END, texto)
+
+    def agregar_resultados(self, texto):
+        """Añade texto al final de los resultados mostrados"""
+        self.texto_resultados_2d.insert(tk.END, texto)